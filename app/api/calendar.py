@@ -1,12 +1,60 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
 from sqlalchemy.orm import Session
-from datetime import datetime
-from app.database import get_db
+from datetime import datetime, timedelta
+from typing import Optional
+from app.api.recurring import validate_window
+from app.database import get_read_db, get_async_read_db, with_async_session
 from app.models.task import Task
 from app.models.calendar import Calendar
+from app.schemas.calendar import GRANULARITY_DAY, GRANULARITY_HOUR, GRANULARITY_PATTERN, HeatmapResponse
+from app.services.agenda_service import agenda_heatmap
+from app.services.export_service import EXPORT_FORMAT_PATTERN, stream_export
+from app.services.serialization import json_response
+from app.services.user_version_service import conditional_get
+
+MAX_HOURLY_WINDOW_DAYS = 31
 
 router = APIRouter()
 
 @router.get("/get_calendar")
-def get_tasks(db: Session = Depends(get_db)):
-    return db.query(Calendar).all()
\ No newline at end of file
+def get_tasks(db: Session = Depends(get_read_db)):
+    return db.query(Calendar).all()
+
+@router.get("/export")
+def export_calendar(
+    Year: Optional[int] = None,
+    Month: Optional[int] = Query(None, ge=1, le=12),
+    export_format: str = Query("ndjson", alias="format", pattern=EXPORT_FORMAT_PATTERN)
+):
+    filters = []
+    if Year is not None:
+        filters.append(Calendar.Year == Year)
+    if Month is not None:
+        filters.append(Calendar.Month == Month)
+
+    columns = [
+        Calendar.CalendarID, Calendar.Date, Calendar.Year, Calendar.Month,
+        Calendar.Day, Calendar.DayName, Calendar.Hour, Calendar.Minute
+    ]
+    return stream_export(columns, filters, export_format, "calendar")
+
+@router.get("/heatmap/{user_id}", response_model=HeatmapResponse)
+@with_async_session
+def agenda_heatmap_view(
+    user_id: int,
+    request: Request,
+    response: Response,
+    from_date: datetime = Query(..., alias="from"),
+    to_date: datetime = Query(..., alias="to"),
+    granularity: str = Query(GRANULARITY_DAY, pattern=GRANULARITY_PATTERN),
+    db: Session = Depends(get_async_read_db)
+):
+    from_date, to_date = validate_window(from_date, to_date)
+    if granularity == GRANULARITY_HOUR and to_date - from_date > timedelta(days=MAX_HOURLY_WINDOW_DAYS):
+        raise HTTPException(status_code=400, detail=f"Por hora el rango no puede superar {MAX_HOURLY_WINDOW_DAYS} días")
+
+    not_modified = conditional_get(db, request, response, user_id)
+    if not_modified:
+        return not_modified
+
+    return json_response(agenda_heatmap(db, user_id, from_date, to_date, granularity), response)
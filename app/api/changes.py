@@ -0,0 +1,58 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.database import get_async_db, with_async_session
+from app.models.change_log import ChangeLog
+from app.schemas.changes import ChangePageResponse
+from app.services.change_feed import COMMIT_SEQUENCE, PRUNED_SEQUENCE, sequence_value
+from app.services.pagination import encode_cursor, decode_cursor
+from app.services.serialization import json_response
+
+MAX_CHANGES_PAGE = 1000
+CHANGE_COLUMNS = (ChangeLog.ChangeID, ChangeLog.Entity, ChangeLog.EntityID, ChangeLog.Operation, ChangeLog.Date)
+
+router = APIRouter()
+
+@router.get("/{user_id}", response_model=ChangePageResponse)
+@with_async_session
+def list_changes(
+    user_id: int,
+    since: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=MAX_CHANGES_PAGE),
+    db: Session = Depends(get_async_db)
+):
+    # El cursor es (Sequence, ChangeID): las secuencias se hacen visibles en orden de confirmación, así que
+    # ningún cambio que se confirme más tarde puede quedar detrás de un cursor ya entregado
+    if since is None:
+        # Sin cursor, el cliente hace una carga completa y empieza a sincronizar desde el último cambio
+        latest = db.query(ChangeLog.Sequence, ChangeLog.ChangeID).filter(ChangeLog.UserID == user_id).order_by(
+            ChangeLog.Sequence.desc(), ChangeLog.ChangeID.desc()
+        ).first()
+        if latest is None:
+            # Sin cambios conservados, el cursor apunta a la próxima confirmación
+            latest = (sequence_value(db, COMMIT_SEQUENCE) + 1, 0)
+        return json_response({"changes": [], "next_cursor": encode_cursor(*latest), "has_more": False})
+
+    last_sequence, last_change_id = decode_cursor(since, int, int)
+    pruned_sequence = sequence_value(db, PRUNED_SEQUENCE)
+    if pruned_sequence and last_sequence <= pruned_sequence:
+        raise HTTPException(
+            status_code=410,
+            detail="El cursor es anterior al historial conservado: vuelve a cargar las tareas y pide un cursor nuevo"
+        )
+    rows = db.query(ChangeLog.Sequence, *CHANGE_COLUMNS).filter(
+        ChangeLog.UserID == user_id,
+        or_(
+            ChangeLog.Sequence > last_sequence,
+            and_(ChangeLog.Sequence == last_sequence, ChangeLog.ChangeID > last_change_id)
+        )
+    ).order_by(ChangeLog.Sequence, ChangeLog.ChangeID).limit(limit + 1).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return json_response({
+        "changes": [{column.key: value for column, value in zip(CHANGE_COLUMNS, row[1:])} for row in rows],
+        "next_cursor": encode_cursor(*(rows[-1][:2] if rows else (last_sequence, last_change_id))),
+        "has_more": has_more
+    })
@@ -0,0 +1,58 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+from typing import List
+from app.api.recurring import validate_window
+from app.database import get_async_read_db, with_async_session
+from app.schemas.freebusy import BusyInterval, UserBusyResponse
+from app.services.freebusy_service import build_busy_index
+
+MAX_FREEBUSY_USERS = 500
+
+router = APIRouter()
+
+def validate_users(user_ids: List[int]):
+    if len(set(user_ids)) > MAX_FREEBUSY_USERS:
+        raise HTTPException(status_code=400, detail=f"No se pueden consultar más de {MAX_FREEBUSY_USERS} usuarios")
+
+@router.get("/conflicts", response_model=List[UserBusyResponse])
+@with_async_session
+def list_conflicts(
+    user_ids: List[int] = Query(..., alias="user_id"),
+    from_date: datetime = Query(..., alias="from"),
+    to_date: datetime = Query(..., alias="to"),
+    db: Session = Depends(get_async_read_db)
+):
+    from_date, to_date = validate_window(from_date, to_date)
+    validate_users(user_ids)
+
+    index = build_busy_index(db, user_ids, from_date, to_date)
+    return [
+        {
+            "UserID": user_id,
+            "Busy": [
+                {"StartTimestamp": start, "EndTimestamp": end}
+                for start, end in index.conflicts(user_id, from_date, to_date)
+            ]
+        }
+        for user_id in sorted(set(user_ids))
+    ]
+
+@router.get("/free_slot", response_model=BusyInterval)
+@with_async_session
+def first_free_slot(
+    user_ids: List[int] = Query(..., alias="user_id"),
+    from_date: datetime = Query(..., alias="from"),
+    to_date: datetime = Query(..., alias="to"),
+    duration: int = Query(..., ge=1, description="Duración del hueco en minutos"),
+    db: Session = Depends(get_async_read_db)
+):
+    from_date, to_date = validate_window(from_date, to_date)
+    validate_users(user_ids)
+
+    index = build_busy_index(db, user_ids, from_date, to_date)
+    slot = index.first_free_slot(user_ids, from_date, to_date, timedelta(minutes=duration))
+    if not slot:
+        raise HTTPException(status_code=404, detail="No hay un hueco libre común en el rango indicado")
+
+    return {"StartTimestamp": slot[0], "EndTimestamp": slot[1]}
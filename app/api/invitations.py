@@ -1,19 +1,37 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_async_db, get_async_read_db, with_async_session
 from app.models.task import Task
 from app.models.calendar import Calendar
 from app.models.recurring import Recurring
 from app.models.invitation import Invitation
 from app.models.user import User
-from app.schemas.invitations import InvitationCreateRequest, InvitationResponse, InvitationUpdateRequest
+from app.schemas.invitations import (
+    InvitationCreateRequest, InvitationResponse, InvitationUpdateRequest, InvitationBatchCreateRequest, InvitationBatchUpdateRequest,
+    InvitationPageResponse, InvitationCountsResponse
+)
 from datetime import datetime
-from typing import List
+from typing import List, Optional
+from app.services.task_view_service import task_audience
+from app.services.invitation_service import send_invitations, respond_invitations
+from app.services.change_feed import INSERT, UPDATE, DELETE, record_changes, record_invitation_changes
+from app.services.visibility_service import refresh_visibility
+from app.services.user_version_service import touch_users, conditional_get
+from app.services.serialization import json_response
+from app.services.pagination import MAX_PAGE_SIZE, encode_cursor, decode_cursor
+
+STATUS_PATTERN = "^(Pendiente|Aceptada|Rechazada)$"
+INVITATION_COLUMNS = (
+    Invitation.InvitationID, Invitation.CreatorID, Invitation.GuestID, Invitation.TaskID,
+    Invitation.RecurringID, Invitation.Status, Invitation.Date
+)
 
 router = APIRouter()
 
 @router.post("/invitation/send", response_model=InvitationResponse)
-async def send_invitation(invite_data: InvitationCreateRequest, db: Session = Depends(get_db)):
+@with_async_session
+def send_invitation(invite_data: InvitationCreateRequest, db: Session = Depends(get_async_db)):
     if not db.query(User).filter(User.UserID == invite_data.CreatorID).first():
         raise HTTPException(status_code=404, detail="Usuario no encontrado")
     if not db.query(User).filter(User.UserID == invite_data.GuestID).first():
@@ -36,30 +54,150 @@ async def send_invitation(invite_data: InvitationCreateRequest, db: Session = De
         Date=datetime.utcnow()
     )
     db.add(new_invitation)
+    db.flush()
+    touch_users(db, [invite_data.CreatorID, invite_data.GuestID])
+    record_invitation_changes(db, [(new_invitation.InvitationID, invite_data.CreatorID, invite_data.GuestID)], INSERT)
     db.commit()
     db.refresh(new_invitation)
 
     return new_invitation
 
 
+@router.post("/invitation/send_batch", response_model=dict)
+@with_async_session
+def send_invitation_batch(invite_data: InvitationBatchCreateRequest, db: Session = Depends(get_async_db)):
+    if not invite_data.TaskID and not invite_data.RecurringID:
+        raise HTTPException(status_code=400, detail="Ingresar TaskID o RecurringID")
+
+    return send_invitations(db, invite_data.CreatorID, invite_data.GuestIDs, invite_data.TaskID, invite_data.RecurringID)
+
+def invitation_rows(db: Session, *criteria, order_by=Invitation.InvitationID, limit=None):
+    """Invitaciones como diccionarios con la forma de InvitationResponse, leídas como tuplas de columnas."""
+    query = db.query(*INVITATION_COLUMNS).filter(*criteria).order_by(order_by)
+    if limit is not None:
+        query = query.limit(limit)
+    return [{column.key: value for column, value in zip(INVITATION_COLUMNS, row)} for row in query.all()]
+
 @router.get("/invitation/list/{user_id}", response_model=List[InvitationResponse])
-async def list_invitations(user_id: int, db: Session = Depends(get_db)):
-    invitations = db.query(Invitation).filter(Invitation.GuestID == user_id).all()
-    return invitations
+@with_async_session
+def list_invitations(user_id: int, request: Request, response: Response, db: Session = Depends(get_async_read_db)):
+    not_modified = conditional_get(db, request, response, user_id)
+    if not_modified:
+        return not_modified
+
+    return json_response(invitation_rows(db, Invitation.GuestID == user_id), response)
 
 @router.get("/invitation/list_prop/{user_id}", response_model=List[InvitationResponse])
-async def list_invitations_prop(user_id: int, db: Session = Depends(get_db)):
-    invitations = db.query(Invitation).filter(Invitation.CreatorID == user_id).all()
-    return invitations
+@with_async_session
+def list_invitations_prop(user_id: int, request: Request, response: Response, db: Session = Depends(get_async_read_db)):
+    not_modified = conditional_get(db, request, response, user_id)
+    if not_modified:
+        return not_modified
+
+    return json_response(invitation_rows(db, Invitation.CreatorID == user_id), response)
+
+
+def invitation_counts(db: Session, user_column, user_id: int):
+    """Cuenta por Status las invitaciones del usuario; se resuelve solo con el índice (usuario, Status)."""
+    return dict(db.query(Invitation.Status, func.count()).filter(user_column == user_id).group_by(Invitation.Status).all())
+
+def invitation_page(db: Session, user_column, user_id: int, status: Optional[str], cursor: Optional[str], limit: int):
+    """Página de invitaciones del usuario, de la más reciente a la más antigua, paginada por InvitationID."""
+    criteria = [user_column == user_id]
+    if status:
+        criteria.append(Invitation.Status == status)
+    if cursor:
+        (last_invitation_id,) = decode_cursor(cursor, int)
+        criteria.append(Invitation.InvitationID < last_invitation_id)
+
+    invitations = invitation_rows(db, *criteria, order_by=Invitation.InvitationID.desc(), limit=limit + 1)
+
+    next_cursor = None
+    if len(invitations) > limit:
+        invitations = invitations[:limit]
+        next_cursor = encode_cursor(invitations[-1]["InvitationID"])
+
+    return {"items": invitations, "next_cursor": next_cursor}
+
+@router.get("/invitation/counts/{user_id}", response_model=InvitationCountsResponse)
+@with_async_session
+def count_invitations(user_id: int, request: Request, response: Response, db: Session = Depends(get_async_read_db)):
+    not_modified = conditional_get(db, request, response, user_id)
+    if not_modified:
+        return not_modified
+
+    return invitation_counts(db, Invitation.GuestID, user_id)
+
+@router.get("/invitation/counts_prop/{user_id}", response_model=InvitationCountsResponse)
+@with_async_session
+def count_invitations_prop(user_id: int, request: Request, response: Response, db: Session = Depends(get_async_read_db)):
+    not_modified = conditional_get(db, request, response, user_id)
+    if not_modified:
+        return not_modified
+
+    return invitation_counts(db, Invitation.CreatorID, user_id)
+
+@router.get("/invitation/list_page/{user_id}", response_model=InvitationPageResponse)
+@with_async_session
+def list_invitations_page(
+    user_id: int,
+    request: Request,
+    response: Response,
+    status: Optional[str] = Query(None, pattern=STATUS_PATTERN),
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_async_read_db)
+):
+    not_modified = conditional_get(db, request, response, user_id)
+    if not_modified:
+        return not_modified
+
+    return json_response(invitation_page(db, Invitation.GuestID, user_id, status, cursor, limit), response)
+
+@router.get("/invitation/list_prop_page/{user_id}", response_model=InvitationPageResponse)
+@with_async_session
+def list_invitations_prop_page(
+    user_id: int,
+    request: Request,
+    response: Response,
+    status: Optional[str] = Query(None, pattern=STATUS_PATTERN),
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_async_read_db)
+):
+    not_modified = conditional_get(db, request, response, user_id)
+    if not_modified:
+        return not_modified
+
+    return json_response(invitation_page(db, Invitation.CreatorID, user_id, status, cursor, limit), response)
+
+
+def invitation_targets(invitation: Invitation):
+    task_ids = [invitation.TaskID] if invitation.TaskID else []
+    recurring_ids = [invitation.RecurringID] if invitation.RecurringID else []
+    return task_ids, recurring_ids
+
+
+def invitation_audience(db: Session, invitation: Invitation):
+    return task_audience(db, *invitation_targets(invitation)) | {invitation.GuestID, invitation.CreatorID}
 
 
 @router.put("/invitation/respond/{invitation_id}", response_model=dict)
-async def respond_invitation(invitation_id: int, response_data: InvitationUpdateRequest, db: Session = Depends(get_db)):
+@with_async_session
+def respond_invitation(invitation_id: int, response_data: InvitationUpdateRequest, db: Session = Depends(get_async_db)):
     invitation = db.query(Invitation).filter(Invitation.InvitationID == invitation_id).first()
     if not invitation:
         raise HTTPException(status_code=404, detail="Invitación no encontrada")
 
     invitation.Status = response_data.Status
+    touch_users(db, invitation_audience(db, invitation))
+    record_invitation_changes(db, [(invitation.InvitationID, invitation.CreatorID, invitation.GuestID)], UPDATE)
+    db.flush()
+    refresh_visibility(db, [invitation.GuestID], *invitation_targets(invitation))
+    record_changes(db, [
+        (invitation.GuestID, entity, entity_id, UPDATE)
+        for entity, entity_id in (("Task", invitation.TaskID), ("Recurring", invitation.RecurringID)) if entity_id
+    ])
     db.commit()
 
     return {
@@ -68,13 +206,23 @@ async def respond_invitation(invitation_id: int, response_data: InvitationUpdate
     }
 
 
+@router.put("/invitation/respond_batch", response_model=dict)
+@with_async_session
+def respond_invitation_batch(response_data: InvitationBatchUpdateRequest, db: Session = Depends(get_async_db)):
+    return respond_invitations(db, response_data)
+
 @router.delete("/invitation/delete/{invitation_id}", response_model=dict)
-async def delete_invitation(invitation_id: int, db: Session = Depends(get_db)):
+@with_async_session
+def delete_invitation(invitation_id: int, db: Session = Depends(get_async_db)):
     invitation = db.query(Invitation).filter(Invitation.InvitationID == invitation_id).first()
     if not invitation:
         raise HTTPException(status_code=404, detail="Invitación no encontrada")
 
+    touch_users(db, invitation_audience(db, invitation))
+    record_invitation_changes(db, [(invitation.InvitationID, invitation.CreatorID, invitation.GuestID)], DELETE)
     db.delete(invitation)
+    db.flush()
+    refresh_visibility(db, [invitation.GuestID], *invitation_targets(invitation))
     db.commit()
 
     return {"message": "Invitation eliminada satisfactoriamente"}
\ No newline at end of file
@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from app.database import get_async_db, with_async_session
+from app.schemas.jobs import JobResponse
+from app.services.job_queue import job_queue
+
+router = APIRouter()
+
+@router.get("/{job_id}", response_model=JobResponse)
+@with_async_session
+def get_job(job_id: int, db: Session = Depends(get_async_db)):
+    job = job_queue.get(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Trabajo no encontrado")
+
+    return job
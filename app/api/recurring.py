@@ -1,18 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
-from app.database import get_db
+from datetime import datetime, timedelta
+from typing import List
+from app.database import get_async_db, get_async_read_db, with_async_session
 from app.models.task import Task
-from app.models.calendar import Calendar
 from app.models.recurring import Recurring
-from app.schemas.recurring import RecurringCreateRequest, RecurringUpdateRequest
+from app.models.recurring_exception import RecurringException
+from app.models.invitation import Invitation
+from app.schemas.recurring import RecurringCreateRequest, RecurringUpdateRequest, RecurringExceptionRequest, OccurrenceResponse
+from app.services.bulk_write_service import delete_series
+from app.services.dates import naive_utc
+from app.services.job_queue import JOB_INLINE_ROWS, job_queue, job_accepted
+from app.services.change_feed import INSERT, UPDATE, record_changes, record_series_changes
+from app.services.recurrence_service import expand_occurrences, is_series_occurrence
+from app.services.series_edit_service import update_series
+from app.services.search_service import mark_search_dirty
+from app.services.task_view_service import task_audience
+from app.services.user_version_service import touch_users
+
+MAX_WINDOW_DAYS = 366
 
 router = APIRouter()
 
 @router.post("/set_recurring/{creator_id}", response_model=dict)
-async def set_recurring(
+@with_async_session
+def set_recurring(
     creator_id: int,
     recurring_data: RecurringCreateRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_async_db)
 ):
     new_recurring = Recurring(
         Title=recurring_data.Title,
@@ -25,6 +41,8 @@ async def set_recurring(
     )
 
     db.add(new_recurring)
+    db.flush()
+    record_changes(db, [(creator_id, "Recurring", new_recurring.RecurringID, INSERT)])
     db.commit()
     db.refresh(new_recurring)
 
@@ -34,51 +52,145 @@ async def set_recurring(
     }
 
 @router.put("/recurring/update/{recurring_id}", response_model=dict)
-async def update_recurring(recurring_id: int, update_data: RecurringUpdateRequest, db: Session = Depends(get_db)):
+@with_async_session
+def update_recurring(recurring_id: int, update_data: RecurringUpdateRequest, db: Session = Depends(get_async_db)):
     recurring = db.query(Recurring).filter(Recurring.RecurringID == recurring_id).first()
     if not recurring:
         raise HTTPException(status_code=404, detail="Recurrencia no encontrada")
 
-    if update_data.Title:
-        recurring.Title = update_data.Title
-    if update_data.Description:
-        recurring.Description = update_data.Description
-    if update_data.Priority is not None:
-        recurring.Priority = update_data.Priority
-
-    db.commit()
-
-    tasks = db.query(Task).filter(Task.RecurringID == recurring_id).all()
-    for task in tasks:
-        if update_data.Title:
-            task.Title = update_data.Title
-        if update_data.Description:
-            task.Description = update_data.Description
-        if update_data.Priority is not None:
-            task.Priority = update_data.Priority
+    updated = update_series(db, recurring, update_data)
 
+    touch_users(db, task_audience(db, recurring_ids=[recurring_id]))
+    record_series_changes(db, recurring_id, UPDATE)
+    mark_search_dirty(db, recurring_ids=[recurring_id])
     db.commit()
 
     return {
         "message": "Recurrencia y tareas actualizadas",
         "RecurringID": recurring_id,
-        "Tareas actualizadas": len(tasks)
+        "Scope": update_data.Scope,
+        "Tareas actualizadas": updated
     }
 
 @router.delete("/recurring/delete/{recurring_id}", response_model=dict)
-async def delete_recurring(recurring_id: int, db: Session = Depends(get_db)):
+@with_async_session
+def delete_recurring(recurring_id: int, db: Session = Depends(get_async_db)):
     recurring = db.query(Recurring).filter(Recurring.RecurringID == recurring_id).first()
     if not recurring:
         raise HTTPException(status_code=404, detail="Recurrencia no encontrada")
 
-    tasks = db.query(Task).filter(Task.RecurringID == recurring_id).all()
-    calendar_ids = [task.StartTimestampID for task in tasks] + [task.EndTimeStampID for task in tasks]
-    db.query(Task).filter(Task.RecurringID == recurring_id).delete()
-    db.query(Calendar).filter(Calendar.CalendarID.in_(calendar_ids)).delete()
-    db.query(Recurring).filter(Recurring.RecurringID == recurring_id).delete()
+    if db.query(Task).filter(Task.RecurringID == recurring_id).count() > JOB_INLINE_ROWS:
+        job_id = job_queue.submit(db, "delete_series", {"RecurringID": recurring_id})
+        db.commit()
+        return job_accepted(job_id, "Eliminación de la recurrencia en cola", RecurringID=recurring_id)
+
+    delete_series(db, recurring_id)
     db.commit()
 
     return {
         "message": "Recurrencia y tareas actualizadas",
         "RecurringID": recurring_id
-    }
\ No newline at end of file
+    }
+
+def validate_window(from_date: datetime, to_date: datetime):
+    """Valida el rango [from, to) y lo devuelve normalizado con naive_utc."""
+    from_date, to_date = naive_utc(from_date), naive_utc(to_date)
+    if to_date <= from_date:
+        raise HTTPException(status_code=400, detail="La fecha 'to' debe ser posterior a 'from'")
+    if to_date - from_date > timedelta(days=MAX_WINDOW_DAYS):
+        raise HTTPException(status_code=400, detail=f"El rango no puede superar {MAX_WINDOW_DAYS} días")
+    return from_date, to_date
+
+def expand_series(db: Session, series: List[Recurring], from_date: datetime, to_date: datetime):
+    exceptions_by_series = {}
+    if series:
+        exceptions = db.query(RecurringException).filter(
+            RecurringException.RecurringID.in_([recurring.RecurringID for recurring in series])
+        ).all()
+        for exception in exceptions:
+            exceptions_by_series.setdefault(exception.RecurringID, []).append(exception)
+
+    result = []
+    for recurring in series:
+        for occurrence in expand_occurrences(recurring, exceptions_by_series.get(recurring.RecurringID, []), from_date, to_date):
+            result.append({
+                "RecurringID": recurring.RecurringID,
+                "Title": recurring.Title,
+                "Description": recurring.Description,
+                "Priority": recurring.Priority,
+                **occurrence
+            })
+
+    result.sort(key=lambda occurrence: occurrence["StartTimestamp"])
+    return result
+
+@router.get("/recurring/occurrences/{recurring_id}", response_model=List[OccurrenceResponse])
+@with_async_session
+def list_occurrences(
+    recurring_id: int,
+    from_date: datetime = Query(..., alias="from"),
+    to_date: datetime = Query(..., alias="to"),
+    db: Session = Depends(get_async_read_db)
+):
+    from_date, to_date = validate_window(from_date, to_date)
+
+    recurring = db.query(Recurring).filter(Recurring.RecurringID == recurring_id, Recurring.ExpandOnRead.is_(True)).first()
+    if not recurring:
+        raise HTTPException(status_code=404, detail="Recurrencia no encontrada")
+
+    return expand_series(db, [recurring], from_date, to_date)
+
+@router.get("/recurring/occurrences/user/{user_id}", response_model=List[OccurrenceResponse])
+@with_async_session
+def list_user_occurrences(
+    user_id: int,
+    from_date: datetime = Query(..., alias="from"),
+    to_date: datetime = Query(..., alias="to"),
+    db: Session = Depends(get_async_read_db)
+):
+    from_date, to_date = validate_window(from_date, to_date)
+
+    accepted_recurring_ids = db.query(Invitation.RecurringID).filter(
+        Invitation.GuestID == user_id,
+        Invitation.Status == "Aceptada",
+        Invitation.RecurringID.isnot(None)
+    )
+
+    series = db.query(Recurring).filter(
+        Recurring.ExpandOnRead.is_(True),
+        Recurring.StartTimestamp < to_date,
+        or_(Recurring.CreatorID == user_id, Recurring.RecurringID.in_(accepted_recurring_ids.scalar_subquery()))
+    ).all()
+
+    return expand_series(db, series, from_date, to_date)
+
+@router.put("/recurring/exception/{recurring_id}", response_model=dict)
+@with_async_session
+def set_recurring_exception(recurring_id: int, exception_data: RecurringExceptionRequest, db: Session = Depends(get_async_db)):
+    recurring = db.query(Recurring).filter(Recurring.RecurringID == recurring_id, Recurring.ExpandOnRead.is_(True)).first()
+    if not recurring:
+        raise HTTPException(status_code=404, detail="Recurrencia no encontrada")
+
+    if not is_series_occurrence(recurring, exception_data.OccurrenceDate):
+        raise HTTPException(status_code=400, detail="OccurrenceDate no corresponde a una ocurrencia de la serie")
+
+    exception = db.query(RecurringException).filter(
+        RecurringException.RecurringID == recurring_id,
+        RecurringException.OccurrenceDate == exception_data.OccurrenceDate
+    ).first()
+    if not exception:
+        exception = RecurringException(RecurringID=recurring_id, OccurrenceDate=exception_data.OccurrenceDate)
+        db.add(exception)
+
+    exception.Cancelled = exception_data.Cancelled
+    exception.NewStartTimestamp = None if exception_data.Cancelled else exception_data.NewStartTimestamp
+    exception.NewEndTimestamp = None if exception_data.Cancelled else exception_data.NewEndTimestamp
+    touch_users(db, task_audience(db, recurring_ids=[recurring_id]))
+    record_series_changes(db, recurring_id, UPDATE)
+    db.commit()
+
+    return {
+        "message": "Excepción de recurrencia guardada",
+        "RecurringID": recurring_id,
+        "ExceptionID": exception.ExceptionID
+    }
@@ -1,408 +1,252 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
-import calendar as cal
-from app.database import get_db
+from datetime import datetime
+from typing import Optional, List
+from app.database import get_read_db, get_async_db, get_async_read_db, with_async_session
 from app.models.task import Task
 from app.models.calendar import Calendar
-from app.models.recurring import Recurring
-from app.models.user import User
-from app.models.invitation import Invitation
-from app.schemas.task import RecurringResponse, TaskSearchResponse, TaskUpdateRequest, TaskCreateRequest, Attendee
+from app.schemas.task import TaskSearchResponse, TaskUpdateRequest, TaskCreateRequest, TaskPageResponse, TaskBulkDeleteRequest
+from app.services.task_view_service import build_task_views, load_task_views, visible_tasks_filter, task_audience
+from app.services.serialization import json_response
+from app.services.view_cache import view_cache
+from app.services.user_version_service import touch_users, conditional_get, user_version
+from app.services.bulk_write_service import bulk_create_tasks, delete_tasks, estimated_rows, validate_payloads
+from app.services.invitation_service import sync_task_guests
+from app.services.job_queue import JOB_INLINE_ROWS, job_queue, job_accepted
+from app.services.change_feed import UPDATE, record_task_changes
+from app.services.visibility_service import refresh_visibility
+from app.services.search_service import SearchIndex, fresh_search_index, mark_search_dirty, search_task_ids
+from app.services.calendar_service import get_or_create_calendar_ids, mark_orphan_calendars
+from app.services.dates import naive_utc
+from app.services.export_service import EXPORT_FORMAT_PATTERN, stream_export
+from app.services.pagination import MAX_PAGE_SIZE, encode_cursor, decode_cursor
 
 router = APIRouter()
 
-@router.post("/task/create_task", response_model=dict)
-async def create_task(task_data: TaskCreateRequest, db: Session = Depends(get_db)):
-    def create_calendar_entry(date: datetime):
-        return Calendar(
-            Date=date,
-            Year=date.year,
-            Month=date.month,
-            Day=date.day,
-            DayName=date.strftime('%A'),
-            Hour=date.hour,
-            Minute=date.minute
-        )
-
-    duration_minutes = int((task_data.EndTimestamp - task_data.StartTimestamp).total_seconds() / 60)
-    recurring_id = None
-
-    guest_ids = task_data.GuestIDs or []
-    if guest_ids:
-        existing_users = {user.UserID for user in db.query(User).filter(User.UserID.in_(guest_ids)).all()}
-        invalid_users = set(guest_ids) - existing_users
-        if invalid_users:
-            raise HTTPException(status_code=400, detail=f"Usuarios no encontrados: {', '.join(map(str, invalid_users))}")
-
-
-    def generate_recurrence_dates(start_date: datetime, occurrences: int):
-        if task_data.Frequency == "diaria":
-            return [start_date + timedelta(days=i) for i in range(occurrences)]
-        elif task_data.Frequency == "semanal":
-            return [start_date + timedelta(weeks=i) for i in range(occurrences)]
-        elif task_data.Frequency == "mensual":
-            dates, current_date = [], start_date
-            for _ in range(occurrences):
-                dates.append(current_date)
-                month = current_date.month % 12 + 1
-                year = current_date.year + (1 if current_date.month == 12 else 0)
-                day = min(current_date.day, cal.monthrange(year, month)[1])
-                current_date = datetime(year, month, day, current_date.hour, current_date.minute)
-            return dates
-        elif task_data.DayNameFrequency:
-            weekdays = {"Lu": 0, "Ma": 1, "Mi": 2, "Ju": 3, "Vi": 4, "Sa": 5, "Do": 6}
-            target_days = {weekdays[day.strip()] for day in task_data.DayNameFrequency.split(",")}
-            dates, current_date = [], start_date
-            while len(dates) < occurrences:
-                if current_date.weekday() in target_days:
-                    dates.append(current_date)
-                current_date += timedelta(days=1)
-            return dates
-        elif task_data.DayFrequency:
-            target_days = {int(day.strip()) for day in task_data.DayFrequency.split(",")}
-            dates, current_date = [], start_date
-            while len(dates) < occurrences:
-                if current_date.day in target_days:
-                    dates.append(current_date)
-                current_date += timedelta(days=1)
-            return dates
-        return []
-
-    if task_data.RecurringStart and any([task_data.Frequency, task_data.DayNameFrequency, task_data.DayFrequency]):
-        new_recurring = Recurring(
-            Title=task_data.Title,
-            Description=task_data.Description,
-            Priority=task_data.Priority,
-            CreatorID=task_data.CreatorID,
-            Frequency=task_data.Frequency,
-            DayNameFrequency=task_data.DayNameFrequency,
-            DayFrequency=task_data.DayFrequency
-        )
-        db.add(new_recurring)
-        db.flush() 
-        recurring_id = new_recurring.RecurringID
-
-        recurrence_dates = generate_recurrence_dates(task_data.StartTimestamp, task_data.Occurrences)
-
-        calendars = []
-        for date in recurrence_dates:
-            start_date = date
-            end_date = date + (task_data.EndTimestamp - task_data.StartTimestamp)
-            calendars.extend([create_calendar_entry(start_date), create_calendar_entry(end_date)])
-
-        db.add_all(calendars)
-        db.flush()
-
-        calendar_ids = [calendar.CalendarID for calendar in calendars]
-        paired_calendar_ids = [(calendar_ids[i], calendar_ids[i + 1]) for i in range(0, len(calendar_ids), 2)]
-
-        tasks = [
-            Task(
-                CreatorID=task_data.CreatorID,
-                Title=task_data.Title,
-                Description=task_data.Description,
-                Priority=task_data.Priority,
-                StartTimestampID=start_id,
-                EndTimeStampID=end_id,
-                MinutesDuration=duration_minutes,
-                RecurringStart=True,
-                RecurringID=recurring_id,
-                CreationDate=datetime.utcnow()
-            )
-            for start_id, end_id in paired_calendar_ids
-        ]
-
-        db.add_all(tasks)
-        db.commit()
-
-        invitations = [
-            Invitation(
-                CreatorID=task_data.CreatorID,
-                GuestID=guest_id,
-                RecurringID=recurring_id,
-                Status="Pendiente",
-                Date=datetime.utcnow()
-            )
-            for guest_id in guest_ids
-        ]
-
-        db.add_all(invitations)
-        db.commit()
-
-        return {
-            "message": "Tareas recurrentes creadas con éxito",
-            "RecurringID": recurring_id,
-            "Tareas_creadas": len(tasks),
-            "Invitaciones_creadas": len(invitations)
-        }
-
-    else:
-        start_calendar = create_calendar_entry(task_data.StartTimestamp)
-        end_calendar = create_calendar_entry(task_data.EndTimestamp)
-        db.add_all([start_calendar, end_calendar])
-        db.flush()
-
-        new_task = Task(
-            CreatorID=task_data.CreatorID,
-            Title=task_data.Title,
-            Description=task_data.Description,
-            Priority=task_data.Priority,
-            StartTimestampID=start_calendar.CalendarID,
-            EndTimeStampID=end_calendar.CalendarID,
-            MinutesDuration=duration_minutes,
-            RecurringStart=False,
-            CreationDate=datetime.utcnow()
-        )
-
-        db.add(new_task)
-        db.commit()
-
-        invitations = [
-            Invitation(
-                CreatorID=task_data.CreatorID,
-                GuestID=guest_id,
-                TaskID=new_task.TaskID,
-                Status="Pendiente",
-                Date=datetime.utcnow()
-            )
-            for guest_id in guest_ids
-        ]
-
-        db.add_all(invitations)
-        db.commit()
+MAX_BULK_TASKS = 500
+MAX_SEARCH_RESULTS = 50
 
-        return {
-            "message": "Tarea única creada con éxito",
-            "TaskID": new_task.TaskID,
-            "Invitaciones_creadas": len(invitations)
-        }
+@router.post("/task/create_task", response_model=dict)
+@with_async_session
+def create_task(task_data: TaskCreateRequest, db: Session = Depends(get_async_db)):
+    if estimated_rows(task_data) > JOB_INLINE_ROWS:
+        return submit_create_tasks(db, [task_data])
+
+    return bulk_create_tasks(db, [task_data])[0]
+
+@router.post("/bulk_create", response_model=list[dict])
+@with_async_session
+def bulk_create(tasks_data: List[TaskCreateRequest], db: Session = Depends(get_async_db)):
+    if not tasks_data:
+        raise HTTPException(status_code=400, detail="Debe enviarse al menos una tarea")
+    if len(tasks_data) > MAX_BULK_TASKS:
+        raise HTTPException(status_code=400, detail=f"No se pueden crear más de {MAX_BULK_TASKS} tareas por solicitud")
+    if sum(estimated_rows(task_data) for task_data in tasks_data) > JOB_INLINE_ROWS:
+        return submit_create_tasks(db, tasks_data)
+
+    return bulk_create_tasks(db, tasks_data)
+
+def submit_create_tasks(db: Session, tasks_data: List[TaskCreateRequest]):
+    """Encola la creación cuando escribiría demasiadas filas para hacerla dentro de la solicitud."""
+    validate_payloads(db, tasks_data)
+    job_id = job_queue.submit(db, "create_tasks", {"tasks": [task_data.model_dump(mode="json") for task_data in tasks_data]})
+    db.commit()
+    return job_accepted(job_id, "Creación de tareas en cola")
 
 @router.get("/get_tasks")
-def get_tasks(db: Session = Depends(get_db)):
+def get_tasks(db: Session = Depends(get_read_db)):
     return db.query(Task).all()
 
-@router.get("/search_task/", response_model=TaskSearchResponse)
-def search_task(task_id: int, user_id: int, db: Session = Depends(get_db)):
-
-    task = db.query(Task).filter(Task.TaskID == task_id, Task.CreatorID == user_id).first()
+@router.get("/export")
+def export_tasks(
+    CreatorID: Optional[int] = None,
+    Year: Optional[int] = None,
+    Month: Optional[int] = Query(None, ge=1, le=12),
+    export_format: str = Query("ndjson", alias="format", pattern=EXPORT_FORMAT_PATTERN)
+):
+    filters, joins = [], []
+    if CreatorID is not None:
+        filters.append(Task.CreatorID == CreatorID)
+    if Year is not None or Month is not None:
+        joins.append((Calendar, Calendar.CalendarID == Task.StartTimestampID))
+    if Year is not None:
+        filters.append(Calendar.Year == Year)
+    if Month is not None:
+        filters.append(Calendar.Month == Month)
+
+    columns = [
+        Task.TaskID, Task.CreatorID, Task.Title, Task.Description, Task.Priority,
+        Task.StartTimestampID, Task.EndTimeStampID, Task.MinutesDuration,
+        Task.RecurringStart, Task.RecurringID, Task.CreationDate
+    ]
+    return stream_export(columns, filters, export_format, "tasks", joins)
 
-    if not task:
-        task = db.query(Task).join(Invitation, Task.TaskID == Invitation.TaskID).filter(
-            Invitation.GuestID == user_id,
-            Invitation.TaskID == task_id,
-            Invitation.Status == "Aceptada"
-        ).first()
-
-    if not task:
-        raise HTTPException(status_code=404, detail="Tarea no encontrada")
-
-    creator = db.query(User).filter(User.UserID == task.CreatorID).first()
-    attendees = [{"UserID": creator.UserID, "Username": creator.UserName}] if creator else []
-
-    accepted_guests = db.query(User).join(Invitation, User.UserID == Invitation.GuestID).filter(
-        Invitation.TaskID == task.TaskID,
-        Invitation.Status == "Aceptada"
-    ).all()
-
-    attendees += [{"UserID": guest.UserID, "Username": guest.UserName} for guest in accepted_guests]
-
-    recurring_data = None
-    if task.RecurringID:
-        recurring = db.query(Recurring).filter(Recurring.RecurringID == task.RecurringID).first()
-        if recurring:
-            recurring_data = {
-                "RecurringID": recurring.RecurringID,
-                "Title": recurring.Title,
-                "Description": recurring.Description,
-                "Priority": recurring.Priority,
-                "CreatorID": recurring.CreatorID,
-                "Frequency": recurring.Frequency,
-                "DayNameFrequency": recurring.DayNameFrequency,
-                "DayFrequency": recurring.DayFrequency
-            }
-
-    return {
-        "TaskID": task.TaskID,
-        "CreatorID": task.CreatorID,
-        "Title": task.Title,
-        "Description": task.Description,
-        "Priority": task.Priority,
-        "StartTimestampID": task.StartTimestampID,
-        "EndTimeStampID": task.EndTimeStampID,
-        "RecurringStart": task.RecurringStart,
-        "Recurring": recurring_data,
-        "attendees": attendees
-    }
+@router.get("/search_task/", response_model=TaskSearchResponse)
+def search_task(task_id: int, user_id: int, request: Request, response: Response, db: Session = Depends(get_read_db)):
+    version = user_version(db, user_id)
+    not_modified = conditional_get(db, request, response, user_id, version)
+    if not_modified:
+        return not_modified
+
+    def build():
+        views = load_task_views(db, Task.TaskID == task_id, visible_tasks_filter(user_id))
+
+        if not views:
+            raise HTTPException(status_code=404, detail="Tarea no encontrada")
+
+        return views[0]
+
+    return json_response(body=view_cache.get_or_build(user_id, version, f"task:{task_id}", build), response=response)
+
+@router.get("/search_tasks/{user_id}", response_model=list[TaskSearchResponse])
+@with_async_session
+def search_tasks(
+    user_id: int,
+    q: str = Query(min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=MAX_SEARCH_RESULTS),
+    index: SearchIndex = Depends(fresh_search_index),
+    db: Session = Depends(get_async_read_db)
+):
+    task_ids = search_task_ids(db, user_id, q, limit, index)
+    if not task_ids:
+        return json_response([])
+
+    # La relevancia la decide el buscador: se conserva su orden al construir las vistas
+    views = {view["TaskID"]: view for view in load_task_views(db, Task.TaskID.in_(task_ids))}
+    return json_response([views[task_id] for task_id in task_ids if task_id in views])
 
 @router.get("/list_user_tasks/{user_id}", response_model=list[TaskSearchResponse])
-async def list_user_tasks(user_id: int, db: Session = Depends(get_db)):
-    
-    created_tasks = db.query(Task).filter(Task.CreatorID == user_id).all()
-
-    accepted_invitations = db.query(Invitation).filter(
-        Invitation.GuestID == user_id,
-        Invitation.Status == "Aceptada"
-    ).all()
-
-    accepted_tasks = db.query(Task).filter(Task.TaskID.in_(
-        [inv.TaskID for inv in accepted_invitations if inv.TaskID]
-    )).all()
-
-    accepted_recurring_tasks = db.query(Task).filter(Task.RecurringID.in_(
-        [inv.RecurringID for inv in accepted_invitations if inv.RecurringID]
-    )).all()
-
-    all_tasks = created_tasks + accepted_tasks + accepted_recurring_tasks
-    unique_tasks = {task.TaskID: task for task in all_tasks}.values()
-
-    result = []
-    for task in unique_tasks:
-        creator = db.query(User).filter(User.UserID == task.CreatorID).first()
-        attendees = [{"UserID": creator.UserID, "Username": creator.UserName}] if creator else []
-
-        accepted_guests = db.query(User).join(Invitation, User.UserID == Invitation.GuestID).filter(
-            Invitation.TaskID == task.TaskID,
-            Invitation.Status == "Aceptada"
-        ).all()
-
-        attendees += [{"UserID": guest.UserID, "Username": guest.UserName} for guest in accepted_guests]
-
-        recurring_data = None
-        if task.RecurringID:
-            recurring = db.query(Recurring).filter(Recurring.RecurringID == task.RecurringID).first()
-            if recurring:
-                recurring_data = {
-                    "RecurringID": recurring.RecurringID,
-                    "Title": recurring.Title,
-                    "Description": recurring.Description,
-                    "Priority": recurring.Priority,
-                    "CreatorID": recurring.CreatorID,
-                    "Frequency": recurring.Frequency,
-                    "DayNameFrequency": recurring.DayNameFrequency,
-                    "DayFrequency": recurring.DayFrequency
-                }
-
-        result.append({
-            "TaskID": task.TaskID,
-            "CreatorID": task.CreatorID,
-            "Title": task.Title,
-            "Description": task.Description,
-            "Priority": task.Priority,
-            "StartTimestampID": task.StartTimestampID,
-            "EndTimeStampID": task.EndTimeStampID,
-            "RecurringStart": task.RecurringStart,
-            "Recurring": recurring_data,
-            "attendees": attendees
-        })
-
-    return result
+@with_async_session
+def list_user_tasks(user_id: int, request: Request, response: Response, db: Session = Depends(get_async_read_db)):
+    version = user_version(db, user_id)
+    not_modified = conditional_get(db, request, response, user_id, version)
+    if not_modified:
+        return not_modified
+
+    def build():
+        return load_task_views(db, visible_tasks_filter(user_id), order_by=Task.TaskID)
+
+    return json_response(body=view_cache.get_or_build(user_id, version, "tasks", build), response=response)
+
+@router.get("/cache/stats", response_model=dict)
+def cache_stats():
+    return view_cache.stats()
+
+@router.get("/list_user_tasks_page/{user_id}", response_model=TaskPageResponse)
+@with_async_session
+def list_user_tasks_page(
+    user_id: int,
+    request: Request,
+    response: Response,
+    from_date: Optional[datetime] = Query(None, alias="from"),
+    to_date: Optional[datetime] = Query(None, alias="to"),
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_async_read_db)
+):
+    not_modified = conditional_get(db, request, response, user_id)
+    if not_modified:
+        return not_modified
+
+    query = db.query(Task, Calendar.Date).join(
+        Calendar, Calendar.CalendarID == Task.StartTimestampID
+    ).filter(visible_tasks_filter(user_id))
+
+    if from_date:
+        query = query.filter(Calendar.Date >= naive_utc(from_date))
+    if to_date:
+        query = query.filter(Calendar.Date < naive_utc(to_date))
+    if cursor:
+        last_date, last_task_id = decode_cursor(cursor, datetime, int)
+        query = query.filter(or_(
+            Calendar.Date > last_date,
+            and_(Calendar.Date == last_date, Task.TaskID > last_task_id)
+        ))
+
+    rows = query.order_by(Calendar.Date, Task.TaskID).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_task, last_date = rows[-1]
+        next_cursor = encode_cursor(last_date, last_task.TaskID)
+
+    return json_response({
+        "items": build_task_views(db, [task for task, _ in rows]),
+        "next_cursor": next_cursor
+    }, response)
 
 @router.put("/update", response_model=dict)
-async def update_task(task: TaskUpdateRequest, db: Session = Depends(get_db)):
+@with_async_session
+def update_task(task: TaskUpdateRequest, db: Session = Depends(get_async_db)):
 
     db_task = db.query(Task).filter(Task.TaskID == task.TaskID).first()
     
     if not db_task:
         raise HTTPException(status_code=404, detail="Tarea no ecntontrada")
-    
-    start_datetime = task.StartTimestamp
-    end_datetime = task.EndTimestamp
-
-    new_start_calendar = Calendar(
-        Date=start_datetime,
-        Year=start_datetime.year,
-        Month=start_datetime.month,
-        Day=start_datetime.day,
-        DayName=start_datetime.strftime('%A'),
-        Hour=start_datetime.hour,
-        Minute=start_datetime.minute
-    )
-
-    new_end_calendar = Calendar(
-        Date=end_datetime,
-        Year=end_datetime.year,
-        Month=end_datetime.month,
-        Day=end_datetime.day,
-        DayName=end_datetime.strftime('%A'),
-        Hour=end_datetime.hour,
-        Minute=end_datetime.minute
-    )
-
-    db.add(new_start_calendar)
-    db.add(new_end_calendar)
-    db.commit()
 
-    new_start_calendar_id = new_start_calendar.CalendarID
-    new_end_calendar_id = new_end_calendar.CalendarID
+    audience = task_audience(db, [task.TaskID])
+    
+    calendar_ids = get_or_create_calendar_ids(db, [task.StartTimestamp, task.EndTimestamp])
+    previous_calendar_ids = {db_task.StartTimestampID, db_task.EndTimeStampID}
 
     db_task.Title = task.Title
     db_task.Description = task.Description
     db_task.Priority = task.Priority
     db_task.RecurringStart = task.RecurringStart
-    db_task.StartTimestampID = new_start_calendar_id
-    db_task.EndTimeStampID = new_end_calendar_id
+    db_task.StartTimestampID = calendar_ids[task.StartTimestamp]
+    db_task.EndTimeStampID = calendar_ids[task.EndTimestamp]
     db_task.RecurringID = task.RecurringID
-    
-    db.commit()
-    db.refresh(db_task)
+    db.flush()
+    mark_orphan_calendars(db, previous_calendar_ids)
 
+    job_id = None
     if task.GuestIDs is not None:
-        existing_invitations = db.query(Invitation).filter(Invitation.TaskID == task.TaskID).all()
-        current_guest_ids = {inv.GuestID for inv in existing_invitations} 
-        new_guest_ids = set(task.GuestIDs)
-
-        to_remove = current_guest_ids - new_guest_ids
-        to_add = new_guest_ids - current_guest_ids
-
-        if to_remove:
-            db.query(Invitation).filter(Invitation.TaskID == task.TaskID, Invitation.GuestID.in_(to_remove)).delete(synchronize_session=False)
-
-        new_invitations = [
-            Invitation(
-                CreatorID=db_task.CreatorID,
-                GuestID=guest_id,
-                TaskID=task.TaskID,
-                Status="Pendiente",
-                Date=datetime.utcnow()
-            )
-            for guest_id in to_add
-        ]
+        if len(task.GuestIDs) > JOB_INLINE_ROWS:
+            job_id = job_queue.submit(db, "sync_task_guests", {"TaskID": task.TaskID, "GuestIDs": task.GuestIDs})
+        else:
+            sync_task_guests(db, task.TaskID, task.GuestIDs)
+
+    touch_users(db, audience | task_audience(db, [task.TaskID]))
+    record_task_changes(db, [task.TaskID], UPDATE)
+    refresh_visibility(db, task_ids=[task.TaskID])
+    mark_search_dirty(db, [task.TaskID])
+    db.commit()
 
-        db.add_all(new_invitations)
+    if job_id is not None:
+        return job_accepted(job_id, "Tarea actualizada; la actualización de invitados está en cola")
 
-    db.commit()
-    
     return {"message": "Tarea actualizada satisfactoriamente"}
 
 @router.delete("/delete/{task_id}", response_model=dict)
-async def delete_task(task_id: int, db: Session = Depends(get_db)):
+@with_async_session
+def delete_task(task_id: int, db: Session = Depends(get_async_db)):
 
-    db_task = db.query(Task).filter(Task.TaskID == task_id).first()
+    deleted = delete_tasks(db, [task_id])
 
-    if not db_task:
+    if not deleted["Tareas_eliminadas"]:
         raise HTTPException(status_code=404, detail="Tarea no encontrada")
-    
-    start_calendar_id = db_task.StartTimestampID
-    end_calendar_id = db_task.EndTimeStampID
-
-    db.query(Invitation).filter(Invitation.TaskID == task_id).delete(synchronize_session=False)
 
-    db.delete(db_task)
-
-    start_calendar = db.query(Calendar).filter(Calendar.CalendarID == start_calendar_id).first()
-    end_calendar = db.query(Calendar).filter(Calendar.CalendarID == end_calendar_id).first()
+    db.commit()
 
-    if start_calendar:
-        linked_tasks = db.query(Task).filter(Task.StartTimestampID == start_calendar_id).count()
-        if linked_tasks == 0:
-            db.delete(start_calendar)
+    return {"message": "Tarea e invitaciones eliminadas satisfactoriamente"}
 
-    if end_calendar:
-        linked_tasks = db.query(Task).filter(Task.EndTimeStampID == end_calendar_id).count()
-        if linked_tasks == 0:
-            db.delete(end_calendar)
+@router.post("/bulk_delete", response_model=dict)
+@with_async_session
+def bulk_delete(delete_data: TaskBulkDeleteRequest, db: Session = Depends(get_async_db)):
+    if delete_data.TaskIDs:
+        task_ids = delete_data.TaskIDs
+    else:
+        query = db.query(Task.TaskID).filter(Task.CreatorID == delete_data.CreatorID)
+        if delete_data.FromDate:
+            query = query.join(Calendar, Calendar.CalendarID == Task.StartTimestampID).filter(
+                Calendar.Date >= delete_data.FromDate,
+                Calendar.Date < delete_data.ToDate
+            )
+        task_ids = [task_id for (task_id,) in query.all()]
 
+    deleted = delete_tasks(db, task_ids)
     db.commit()
 
-    return {"message": "Tarea e invitaciones eliminadas satisfactoriamente"}
\ No newline at end of file
+    return {"message": "Tareas eliminadas satisfactoriamente", **deleted}
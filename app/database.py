@@ -1,14 +1,87 @@
 import os
+import random
+from functools import wraps
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.sql import Select
 from dotenv import load_dotenv
+from app.services.metrics import METRICS_ENABLED, TimedQueuePool, TimedAsyncAdaptedQueuePool
 
 load_dotenv()
 
-DB_URL = f"mysql+pymysql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
+DB_URL = os.getenv("DB_URL") or f"mysql+pymysql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
+DB_ASYNC_URL = os.getenv("DB_ASYNC_URL") or f"mysql+aiomysql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
+DB_REPLICA_URLS = [url.strip() for url in os.getenv("DB_REPLICA_URLS", "").split(",") if url.strip()]
+DB_ASYNC_REPLICA_URLS = [url.strip() for url in os.getenv("DB_ASYNC_REPLICA_URLS", "").split(",") if url.strip()]
+
+def env_int(name: str, default: int):
+    value = os.getenv(name)
+    return int(value) if value else default
+
+def env_flag(name: str, default: bool = False):
+    value = os.getenv(name)
+    return value.lower() in ("1", "true", "yes") if value else default
+
+def engine_options(url: str):
+    options = {
+        "echo": env_flag("DB_ECHO"),
+        "pool_pre_ping": env_flag("DB_POOL_PRE_PING", True),
+        "pool_recycle": env_int("DB_POOL_RECYCLE", 3600)
+    }
+    if not url.startswith("sqlite"):
+        options["pool_size"] = env_int("DB_POOL_SIZE", 10)
+        options["max_overflow"] = env_int("DB_MAX_OVERFLOW", 20)
+        options["pool_timeout"] = env_int("DB_POOL_TIMEOUT", 30)
+    return options
+
+def build_engine(url: str):
+    options = engine_options(url)
+    if METRICS_ENABLED and "pool_size" in options:
+        options["poolclass"] = TimedQueuePool
+    return create_engine(url, **options)
+
+def build_async_engine(url: str):
+    options = engine_options(url)
+    if METRICS_ENABLED and "pool_size" in options:
+        options["poolclass"] = TimedAsyncAdaptedQueuePool
+    return create_async_engine(url, **options)
+
+class RoutingSession(Session):
+    """Session que envía las lecturas de las sesiones de solo lectura a una réplica y el resto al primario."""
+
+    def __init__(self, primary=None, replicas=None, read_only=False, **kwargs):
+        super().__init__(**kwargs)
+        self.primary = primary
+        self.replica = random.choice(replicas) if read_only and replicas else None
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.replica is not None and not self._flushing and isinstance(clause, Select):
+            return self.replica
+        return self.primary
+
+engine = build_engine(DB_URL)
+replica_engines = [build_engine(url) for url in DB_REPLICA_URLS]
+SessionLocal = sessionmaker(class_=RoutingSession, primary=engine, autocommit=False, autoflush=False)
+ReadSessionLocal = sessionmaker(class_=RoutingSession, primary=engine, replicas=replica_engines, read_only=True, autocommit=False, autoflush=False)
+
+async_engine = build_async_engine(DB_ASYNC_URL)
+async_replica_engines = [build_async_engine(url) for url in DB_ASYNC_REPLICA_URLS]
+AsyncSessionLocal = async_sessionmaker(
+    sync_session_class=RoutingSession,
+    primary=async_engine.sync_engine,
+    autoflush=False,
+    expire_on_commit=False
+)
+AsyncReadSessionLocal = async_sessionmaker(
+    sync_session_class=RoutingSession,
+    primary=async_engine.sync_engine,
+    replicas=[replica.sync_engine for replica in async_replica_engines],
+    read_only=True,
+    autoflush=False,
+    expire_on_commit=False
+)
 
-engine = create_engine(DB_URL, echo=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 def get_db():
@@ -17,3 +90,27 @@ def get_db():
         yield db
     finally:
         db.close()
+
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_async_read_db():
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+def with_async_session(func):
+    """Ejecuta una ruta escrita con la API síncrona de Session sobre la AsyncSession inyectada en `db`,
+    de modo que la E/S con la base de datos se espera con el driver asíncrono sin bloquear el event loop."""
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        db = kwargs.pop("db")
+        return await db.run_sync(lambda session: func(*args, db=session, **kwargs))
+    return wrapper
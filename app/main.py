@@ -1,12 +1,64 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from app.api import calendar
+from app.api import changes
+from app.api import freebusy
 from app.api import invitations
+from app.api import jobs
 from app.api import recurring
 from app.api import task
+from app.database import SessionLocal, engine
+from app.services.bulk_write_service import consecutive_insert_ids
+from app.services.calendar_service import CALENDAR_SWEEP_INTERVAL, run_calendar_sweeper
+from app.services.change_feed import CHANGE_LOG_PRUNE_INTERVAL, CHANGE_LOG_RETENTION_DAYS, run_change_log_pruner
+from app.services.search_service import search_index, uses_fulltext
+from app.services.job_queue import JOB_WORKERS, job_queue
+from app.services.metrics import MetricsMiddleware, route_metrics, route_table
 
-app = FastAPI()
+def check_insert_ids():
+    """Comprueba al arrancar, y no en la primera escritura, cómo asigna MySQL los ids de los INSERT multi-fila."""
+    if engine.dialect.name == "mysql":
+        with SessionLocal() as db:
+            consecutive_insert_ids(db)
 
-app.include_router(calendar.router, prefix="/calendar", tags=["calendar"])
-app.include_router(invitations.router, prefix="/invitations", tags=["invitations"])
-app.include_router(recurring.router, prefix="/recurring", tags=["recurring"])
-app.include_router(task.router, prefix="/task", tags=["task"])
\ No newline at end of file
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await asyncio.to_thread(check_insert_ids)
+    background_tasks = []
+    if not uses_fulltext(engine):
+        # El índice de búsqueda en memoria se construye en segundo plano; las búsquedas que lleguen antes lo esperan
+        background_tasks.append(asyncio.create_task(search_index.refresh_async()))
+    if CALENDAR_SWEEP_INTERVAL > 0:
+        background_tasks.append(asyncio.create_task(run_calendar_sweeper()))
+    if CHANGE_LOG_PRUNE_INTERVAL > 0 and CHANGE_LOG_RETENTION_DAYS > 0:
+        background_tasks.append(asyncio.create_task(run_change_log_pruner()))
+    if JOB_WORKERS > 0:
+        job_queue.start()
+    yield
+    for background_task in background_tasks:
+        background_task.cancel()
+    await asyncio.to_thread(job_queue.stop)
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(MetricsMiddleware)
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics():
+    return PlainTextResponse(route_metrics.render(), media_type="text/plain; version=0.0.4")
+
+ROUTERS = (
+    (calendar.router, "/calendar", "calendar"),
+    (changes.router, "/changes", "changes"),
+    (freebusy.router, "/freebusy", "freebusy"),
+    (invitations.router, "/invitations", "invitations"),
+    (jobs.router, "/jobs", "jobs"),
+    (recurring.router, "/recurring", "recurring"),
+    (task.router, "/task", "task"),
+)
+
+for router, prefix, tag in ROUTERS:
+    app.include_router(router, prefix=prefix, tags=[tag])
+    route_table.add_router(router, prefix)
+route_table.add_router(app.router)
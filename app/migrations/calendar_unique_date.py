@@ -0,0 +1,80 @@
+"""Migración única para bases creadas antes de que Calendar.Date fuera única.
+
+Por cada minuto con varias filas conserva la de menor CalendarID, reapunta a ella las tareas que usaban las
+demás, elimina los duplicados y crea el índice único si la tabla aún no lo tiene. Es idempotente.
+
+Las cachés de Calendar de los procesos en marcha pueden conservar ids eliminados hasta CALENDAR_CACHE_TTL
+segundos: ejecutarla con el servicio detenido o esperar ese tiempo sin escrituras de tareas.
+
+Uso: python -m app.migrations.calendar_unique_date
+"""
+import logging
+from sqlalchemy import Index, bindparam, func, inspect, update
+from sqlalchemy.orm import Session
+from app.database import SessionLocal, engine
+from app.models.task import Task
+from app.models.calendar import Calendar
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1000
+
+
+def duplicate_calendar_ids(db: Session):
+    """{CalendarID duplicado: CalendarID conservado} para los minutos con más de una fila."""
+    duplicated_dates = db.query(Calendar.Date).group_by(Calendar.Date).having(func.count() > 1).subquery()
+    keep_ids = {}
+    replaced = {}
+    for calendar_id, date in db.query(Calendar.CalendarID, Calendar.Date).filter(
+        Calendar.Date.in_(duplicated_dates.select())
+    ).order_by(Calendar.Date, Calendar.CalendarID):
+        keep_id = keep_ids.setdefault(date, calendar_id)
+        if keep_id != calendar_id:
+            replaced[calendar_id] = keep_id
+    return replaced
+
+
+def merge_duplicate_calendars(db: Session):
+    """Reapunta las tareas a la fila conservada de cada minuto y elimina las demás. No confirma la transacción."""
+    replaced = duplicate_calendar_ids(db)
+    if not replaced:
+        return {"duplicados": 0}
+
+    params = [{"old_id": old_id, "new_id": new_id} for old_id, new_id in replaced.items()]
+    for column in (Task.__table__.c.StartTimestampID, Task.__table__.c.EndTimeStampID):
+        db.execute(
+            update(Task.__table__).where(column == bindparam("old_id")).values({column: bindparam("new_id")}),
+            params
+        )
+
+    old_ids = sorted(replaced)
+    for i in range(0, len(old_ids), CHUNK_SIZE):
+        db.query(Calendar).filter(Calendar.CalendarID.in_(old_ids[i:i + CHUNK_SIZE])).delete(synchronize_session=False)
+
+    return {"duplicados": len(replaced)}
+
+
+def has_unique_date(bind):
+    inspector = inspect(bind)
+    unique_columns = [constraint["column_names"] for constraint in inspector.get_unique_constraints(Calendar.__tablename__)]
+    unique_columns += [index["column_names"] for index in inspector.get_indexes(Calendar.__tablename__) if index["unique"]]
+    return ["Date"] in unique_columns
+
+
+def migrate():
+    db = SessionLocal()
+    try:
+        result = merge_duplicate_calendars(db)
+        db.commit()
+    finally:
+        db.close()
+
+    if not has_unique_date(engine):
+        Index("uq_calendar_date", Calendar.Date, unique=True).create(engine)
+        result["indice_creado"] = True
+    return result
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    logger.info("Migración de Calendar.Date única: %s", migrate())
@@ -1,19 +1,24 @@
-from sqlalchemy import Column, Integer, String, TIMESTAMP, Text, ForeignKey, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, TIMESTAMP, Text, ForeignKey, DateTime, Boolean, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 import datetime
 
 class Calendar(Base):
     __tablename__ = "Calendar"
+    __table_args__ = (
+        # Cubre el filtro por rango de fechas y el GROUP BY del mapa de calor sin leer la tabla
+        Index("ix_calendar_date_parts", "Date", "Year", "Month", "Day", "Hour"),
+    )
 
     CalendarID = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    Date = Column(TIMESTAMP, nullable=False)
+    Date = Column(TIMESTAMP, nullable=False, unique=True)
     Year = Column(Integer, nullable=False)
     Month = Column(Integer, nullable=False)
     Day = Column(Integer, nullable=False)
     DayName = Column(String(10), nullable=False)
     Hour = Column(Integer, nullable=True)
     Minute = Column(Integer, nullable=True)
+    OrphanedAt = Column(TIMESTAMP, nullable=True)
 
     tasks_start = relationship("Task", foreign_keys="[Task.StartTimestampID]", back_populates="start_calendar")
     tasks_end = relationship("Task", foreign_keys="[Task.EndTimeStampID]", back_populates="end_calendar")
\ No newline at end of file
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, TIMESTAMP, ForeignKey, Index
+from app.database import Base
+
+class ChangeLog(Base):
+    __tablename__ = "ChangeLog"
+    __table_args__ = (
+        Index("ix_change_log_user_sequence", "UserID", "Sequence", "ChangeID"),
+        # Localiza el límite de la retención sin recorrer la tabla
+        Index("ix_change_log_date", "Date"),
+    )
+
+    ChangeID = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    UserID = Column(Integer, ForeignKey("User.UserID"), nullable=False)
+    Entity = Column(String(20), nullable=False)
+    EntityID = Column(Integer, nullable=False)
+    Operation = Column(String(10), nullable=False)
+    Date = Column(TIMESTAMP, nullable=False)
+    Sequence = Column(Integer, nullable=False)
@@ -0,0 +1,8 @@
+from sqlalchemy import Column, Integer
+from app.database import Base
+
+class ChangeSequence(Base):
+    __tablename__ = "ChangeSequence"
+
+    SequenceID = Column(Integer, primary_key=True)
+    Value = Column(Integer, nullable=False, default=0)
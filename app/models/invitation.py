@@ -1,9 +1,13 @@
-from sqlalchemy import Column, Integer, ForeignKey, String, TIMESTAMP
+from sqlalchemy import Column, Integer, ForeignKey, String, TIMESTAMP, Index
 from app.database import Base
 from sqlalchemy.orm import relationship
 
 class Invitation(Base):
     __tablename__ = "Invitation"
+    __table_args__ = (
+        Index("ix_invitation_guest_status", "GuestID", "Status"),
+        Index("ix_invitation_creator_status", "CreatorID", "Status"),
+    )
 
     InvitationID = Column(Integer, primary_key=True, index=True, autoincrement=True)
     CreatorID = Column(Integer, ForeignKey("User.UserID"), nullable=False)
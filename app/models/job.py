@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, Index
+from app.database import Base
+
+class Job(Base):
+    __tablename__ = "Job"
+    __table_args__ = (
+        Index("ix_job_status_run_after", "Status", "RunAfter"),
+    )
+
+    JobID = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    Kind = Column(String(50), nullable=False)
+    Payload = Column(Text, nullable=False)
+    Status = Column(String(20), nullable=False)
+    Attempts = Column(Integer, nullable=False, default=0)
+    MaxAttempts = Column(Integer, nullable=False)
+    RunAfter = Column(TIMESTAMP, nullable=False)
+    LeaseUntil = Column(TIMESTAMP, nullable=True)
+    Result = Column(Text, nullable=True)
+    Error = Column(Text, nullable=True)
+    CreatedAt = Column(TIMESTAMP, nullable=False)
+    UpdatedAt = Column(TIMESTAMP, nullable=False)
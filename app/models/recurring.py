@@ -1,9 +1,13 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Boolean, TIMESTAMP, Index
 from app.database import Base
 from sqlalchemy.orm import relationship
+from app.models import recurring_exception
 
 class Recurring(Base):
     __tablename__ = "Recurring"
+    __table_args__ = (
+        Index("ft_recurring_title", "Title", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
 
     RecurringID = Column(Integer, primary_key=True, index=True, autoincrement=True)
     Title = Column(String(225), nullable=False)
@@ -13,7 +17,12 @@ class Recurring(Base):
     Frequency = Column(String(20), nullable=True)
     DayNameFrequency = Column(String(20), nullable=True)
     DayFrequency = Column(String(20), nullable=True)
+    StartTimestamp = Column(TIMESTAMP, nullable=True)
+    MinutesDuration = Column(Integer, nullable=True)
+    Occurrences = Column(Integer, nullable=True)
+    ExpandOnRead = Column(Boolean, default=False)
 
     creator = relationship("User", back_populates="recurring_tasks")
     tasks = relationship("Task", back_populates="recurring")
     invitations = relationship("Invitation", back_populates="recurring")
+    exceptions = relationship("RecurringException", back_populates="recurring")
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, ForeignKey, Boolean, TIMESTAMP, UniqueConstraint
+from app.database import Base
+from sqlalchemy.orm import relationship
+
+class RecurringException(Base):
+    __tablename__ = "RecurringException"
+    __table_args__ = (
+        UniqueConstraint("RecurringID", "OccurrenceDate", name="uq_recurring_exception_occurrence"),
+    )
+
+    ExceptionID = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    RecurringID = Column(Integer, ForeignKey("Recurring.RecurringID"), nullable=False)
+    OccurrenceDate = Column(TIMESTAMP, nullable=False)
+    Cancelled = Column(Boolean, default=False, nullable=False)
+    NewStartTimestamp = Column(TIMESTAMP, nullable=True)
+    NewEndTimestamp = Column(TIMESTAMP, nullable=True)
+
+    recurring = relationship("Recurring", back_populates="exceptions")
@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Boolean, TIMESTAMP
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Boolean, TIMESTAMP, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 from app.models import recurring, calendar, invitation, user
 
 class Task(Base):
     __tablename__ = "Task"
+    __table_args__ = (
+        Index("ix_task_creator_start", "CreatorID", "StartTimestampID"),
+        Index("ft_task_title_description", "Title", "Description", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
 
     TaskID = Column(Integer, primary_key=True, index=True, autoincrement=True)
     CreatorID = Column(Integer, ForeignKey("User.UserID"), nullable=False)
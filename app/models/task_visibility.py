@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
+from app.database import Base
+
+class TaskVisibility(Base):
+    __tablename__ = "TaskVisibility"
+    __table_args__ = (
+        Index("ix_task_visibility_task", "TaskID"),
+    )
+
+    UserID = Column(Integer, ForeignKey("User.UserID"), primary_key=True)
+    TaskID = Column(Integer, ForeignKey("Task.TaskID"), primary_key=True)
+    Role = Column(String(10), nullable=False)
@@ -0,0 +1,8 @@
+from sqlalchemy import Column, Integer, ForeignKey
+from app.database import Base
+
+class UserVersion(Base):
+    __tablename__ = "UserVersion"
+
+    UserID = Column(Integer, ForeignKey("User.UserID"), primary_key=True)
+    Version = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from typing import List
+
+GRANULARITY_DAY = "dia"
+GRANULARITY_HOUR = "hora"
+GRANULARITY_PATTERN = f"^({GRANULARITY_DAY}|{GRANULARITY_HOUR})$"
+
+class HeatmapBucket(BaseModel):
+    Date: str
+    Tasks: int
+    Minutes: int
+
+class HeatmapResponse(BaseModel):
+    Granularity: str
+    Buckets: List[HeatmapBucket]
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from typing import List
+from datetime import datetime
+
+class ChangeResponse(BaseModel):
+    ChangeID: int
+    Entity: str
+    EntityID: int
+    Operation: str
+    Date: datetime
+
+class ChangePageResponse(BaseModel):
+    changes: List[ChangeResponse]
+    next_cursor: str
+    has_more: bool
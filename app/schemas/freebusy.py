@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+from typing import List
+from datetime import datetime
+
+class BusyInterval(BaseModel):
+    StartTimestamp: datetime
+    EndTimestamp: datetime
+
+class UserBusyResponse(BaseModel):
+    UserID: int
+    Busy: List[BusyInterval]
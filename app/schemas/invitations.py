@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, model_validator
+from typing import Optional, List
 from datetime import datetime
 
 class InvitationCreateRequest(BaseModel):
@@ -9,6 +9,12 @@ class InvitationCreateRequest(BaseModel):
     RecurringID: Optional[int] = None
     Status: str = Field(default="Pendiente", pattern="^(Pendiente|Aceptada|Rechazada)$")
 
+class InvitationBatchCreateRequest(BaseModel):
+    CreatorID: int
+    GuestIDs: List[int] = Field(min_length=1, max_length=500)
+    TaskID: Optional[int] = None
+    RecurringID: Optional[int] = None
+
 class InvitationResponse(BaseModel):
     InvitationID: int
     CreatorID: int
@@ -18,5 +24,29 @@ class InvitationResponse(BaseModel):
     Status: str
     Date: datetime
 
+class InvitationPageResponse(BaseModel):
+    items: List[InvitationResponse]
+    next_cursor: Optional[str]
+
+class InvitationCountsResponse(BaseModel):
+    Pendiente: int = 0
+    Aceptada: int = 0
+    Rechazada: int = 0
+
 class InvitationUpdateRequest(BaseModel):
-    Status: str = Field(pattern="^(Aceptada|Rechazada)$")
\ No newline at end of file
+    Status: str = Field(pattern="^(Aceptada|Rechazada)$")
+
+class InvitationBatchUpdateRequest(BaseModel):
+    GuestID: int
+    Status: str = Field(pattern="^(Aceptada|Rechazada)$")
+    InvitationIDs: Optional[List[int]] = Field(default=None, min_length=1)
+    CreatorID: Optional[int] = None
+    RecurringID: Optional[int] = None
+
+    @model_validator(mode="after")
+    def validate_selection(self):
+        """Las invitaciones se eligen por lista de ids, por creador (solo pendientes) o por serie."""
+        selectors = [self.InvitationIDs is not None, self.CreatorID is not None, self.RecurringID is not None]
+        if sum(selectors) != 1:
+            raise ValueError("Debe indicarse exactamente uno de: InvitationIDs, CreatorID o RecurringID.")
+        return self
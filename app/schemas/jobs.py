@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from typing import Optional, Any
+from datetime import datetime
+
+class JobResponse(BaseModel):
+    JobID: int
+    Kind: str
+    Status: str
+    Attempts: int
+    MaxAttempts: int
+    Result: Optional[Any]
+    Error: Optional[str]
+    CreatedAt: datetime
+    UpdatedAt: datetime
@@ -1,6 +1,41 @@
-from pydantic import BaseModel, field_validator, model_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 from typing import Optional
+from datetime import datetime
 import re
+from app.services.dates import naive_utc
+
+SCOPE_ALL = "todas"
+SCOPE_THIS = "esta"
+SCOPE_FOLLOWING = "siguientes"
+
+def check_frequency(value):
+    """Valida que Frequency sea 'diaria', 'semanal' o 'mensual' y la deja en minúsculas, como la compara la regla."""
+    allowed = ["diaria", "semanal", "mensual"]
+    if value and value.lower() not in allowed:
+        raise ValueError(f"Frequency debe ser uno de: {', '.join(allowed)}.")
+    return value.lower() if value else value
+
+def check_day_name_frequency(value):
+    """Valida que DayNameFrequency solo contenga días válidos: Lu, Ma, Mi, Ju, Vi, Sa, Do."""
+    if value:
+        valid_days = ["Lu", "Ma", "Mi", "Ju", "Vi", "Sa", "Do"]
+        days = {day.strip() for day in value.split(",")}
+        invalid_days = days - set(valid_days)
+        if invalid_days:
+            raise ValueError(f"DayNameFrequency contiene días inválidos: {', '.join(sorted(invalid_days))}. "
+                             f"Usa combinaciones de: {', '.join(valid_days)}.")
+    return value
+
+def check_day_frequency(value):
+    """Valida que DayFrequency sea una combinación de números del 1 al 31 separados por comas."""
+    if value:
+        if not re.match(r'^(\d{1,2})(,\d{1,2})*$', value.strip()):
+            raise ValueError("DayFrequency debe ser una combinación de números separados por comas. Ej: '1,15,30'.")
+        days = [int(day.strip()) for day in value.split(",")]
+        invalid_days = [str(day) for day in days if not (1 <= day <= 31)]
+        if invalid_days:
+            raise ValueError(f"DayFrequency contiene valores inválidos: {', '.join(invalid_days)}. Deben estar entre 1 y 31.")
+    return value
 
 class RecurringCreateRequest(BaseModel):
     Title: str
@@ -24,37 +59,60 @@ class RecurringCreateRequest(BaseModel):
 
     @field_validator('Frequency')
     def validate_frequency(cls, value):
-        """Valida que Frequency sea 'diaria', 'semanal' o 'mensual'."""
-        allowed = ["diaria", "semanal", "mensual"]
-        if value and value.lower() not in allowed:
-            raise ValueError(f"Frequency debe ser uno de: {', '.join(allowed)}.")
-        return value
+        return check_frequency(value)
 
     @field_validator('DayNameFrequency')
     def validate_daynamefrequency(cls, value):
-        """Valida que DayNameFrequency solo contenga días válidos: Lu, Ma, Mi, Ju, Vi, Sa, Do."""
-        if value:
-            valid_days = {"Lu", "Ma", "Mi", "Ju", "Vi", "Sa", "Do"}
-            days = {day.strip() for day in value.split(",")}
-            invalid_days = days - valid_days
-            if invalid_days:
-                raise ValueError(f"DayNameFrequency contiene días inválidos: {', '.join(invalid_days)}. "
-                                 f"Usa combinaciones de: {', '.join(valid_days)}.")
-        return value
+        return check_day_name_frequency(value)
 
     @field_validator('DayFrequency')
     def validate_dayfrequency(cls, value):
-        """Valida que DayFrequency sea una combinación de números del 1 al 31 separados por comas."""
-        if value:
-            if not re.match(r'^(\d{1,2})(,\d{1,2})*$', value.strip()):
-                raise ValueError("DayFrequency debe ser una combinación de números separados por comas. Ej: '1,15,30'.")
-            days = [int(day.strip()) for day in value.split(",")]
-            invalid_days = [str(day) for day in days if not (1 <= day <= 31)]
-            if invalid_days:
-                raise ValueError(f"DayFrequency contiene valores inválidos: {', '.join(invalid_days)}. Deben estar entre 1 y 31.")
-        return value
+        return check_day_frequency(value)
     
 class RecurringUpdateRequest(BaseModel):
     Title: Optional[str] = None
     Description: Optional[str] = None
-    Priority: Optional[int] = None
\ No newline at end of file
+    Priority: Optional[int] = None
+    Scope: str = Field(default=SCOPE_ALL, pattern=f"^({SCOPE_ALL}|{SCOPE_THIS}|{SCOPE_FOLLOWING})$")
+    OccurrenceDate: Optional[datetime] = None
+    ShiftMinutes: Optional[int] = None
+    MinutesDuration: Optional[int] = Field(default=None, gt=0)
+
+    @model_validator(mode="after")
+    def validate_scope(self):
+        """Las ediciones de una ocurrencia o de esa y las siguientes necesitan la fecha de inicio de la ocurrencia."""
+        if self.Scope != SCOPE_ALL and not self.OccurrenceDate:
+            raise ValueError("OccurrenceDate es obligatorio si Scope no es 'todas'.")
+        return self
+
+class RecurringExceptionRequest(BaseModel):
+    OccurrenceDate: datetime
+    Cancelled: bool = False
+    NewStartTimestamp: Optional[datetime] = None
+    NewEndTimestamp: Optional[datetime] = None
+
+    @field_validator('OccurrenceDate', 'NewStartTimestamp', 'NewEndTimestamp')
+    def normalize_dates(cls, value):
+        """Las fechas de la serie y de sus excepciones se comparan y se guardan en UTC sin zona horaria."""
+        return naive_utc(value) if value else value
+
+    @model_validator(mode="after")
+    def validate_exception(self):
+        """Una excepción cancela la ocurrencia o la mueve a un nuevo horario válido."""
+        if self.Cancelled:
+            return self
+        if not self.NewStartTimestamp or not self.NewEndTimestamp:
+            raise ValueError("Debe indicarse Cancelled o NewStartTimestamp y NewEndTimestamp.")
+        if self.NewEndTimestamp <= self.NewStartTimestamp:
+            raise ValueError("NewEndTimestamp debe ser posterior a NewStartTimestamp.")
+        return self
+
+class OccurrenceResponse(BaseModel):
+    RecurringID: int
+    Title: str
+    Description: Optional[str]
+    Priority: Optional[int]
+    OccurrenceDate: datetime
+    StartTimestamp: datetime
+    EndTimestamp: datetime
+    Modified: bool
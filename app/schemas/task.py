@@ -1,6 +1,10 @@
 from pydantic import BaseModel, field_validator, Field, model_validator
 from datetime import datetime
 from typing import Optional, List
+from app.schemas.recurring import check_frequency, check_day_name_frequency, check_day_frequency
+
+# Unos 27 años de una serie diaria; las series más largas o sin fin usan ExpandOnRead con Occurrences nulo
+MAX_OCCURRENCES = 10000
 
 class TaskCreateRequest(BaseModel):
     Title: str
@@ -13,7 +17,8 @@ class TaskCreateRequest(BaseModel):
     Frequency: Optional[str] = None
     DayNameFrequency: Optional[str] = None
     DayFrequency: Optional[str] = None
-    Occurrences: Optional[int] = 30
+    Occurrences: Optional[int] = Field(default=30, ge=1, le=MAX_OCCURRENCES)
+    ExpandOnRead: bool = False
     GuestIDs: Optional[List[int]] = None
 
     @model_validator(mode='after')
@@ -22,6 +27,25 @@ class TaskCreateRequest(BaseModel):
             raise ValueError("EndTimestamp debe ser posterior a StartTimestamp.")
         return self
 
+    @model_validator(mode='after')
+    def validate_exclusive_fields(self):
+        """Una tarea recurrente sigue una sola regla: Frequency, DayNameFrequency o DayFrequency."""
+        if sum(bool(field) for field in [self.Frequency, self.DayNameFrequency, self.DayFrequency]) > 1:
+            raise ValueError("Solo uno de los campos Frequency, DayNameFrequency o DayFrequency puede estar completo.")
+        return self
+
+    @field_validator('Frequency')
+    def validate_frequency(cls, value):
+        return check_frequency(value)
+
+    @field_validator('DayNameFrequency')
+    def validate_daynamefrequency(cls, value):
+        return check_day_name_frequency(value)
+
+    @field_validator('DayFrequency')
+    def validate_dayfrequency(cls, value):
+        return check_day_frequency(value)
+
 class TaskResponse(BaseModel):
     message: str
     TaskID: int
@@ -53,6 +77,10 @@ class TaskSearchResponse(BaseModel):
     Recurring: Optional[RecurringResponse]
     attendees: List[Attendee]
 
+class TaskPageResponse(BaseModel):
+    items: List[TaskSearchResponse]
+    next_cursor: Optional[str]
+
 class TaskUpdateRequest(BaseModel):
     TaskID: int
     Title: str
@@ -62,4 +90,21 @@ class TaskUpdateRequest(BaseModel):
     StartTimestamp: datetime
     EndTimestamp: datetime
     RecurringID: Optional[int] = None
-    GuestIDs: Optional[List[int]] = None
\ No newline at end of file
+    GuestIDs: Optional[List[int]] = None
+
+class TaskBulkDeleteRequest(BaseModel):
+    TaskIDs: Optional[List[int]] = None
+    CreatorID: Optional[int] = None
+    FromDate: Optional[datetime] = None
+    ToDate: Optional[datetime] = None
+
+    @model_validator(mode='after')
+    def validate_selection(self):
+        """Se eliminan las tareas indicadas por TaskIDs o las del creador cuyo inicio cae en [FromDate, ToDate)."""
+        if bool(self.TaskIDs) == (self.CreatorID is not None):
+            raise ValueError("Debe indicarse TaskIDs o CreatorID, pero no ambos.")
+        if self.TaskIDs is None and (self.FromDate is None) != (self.ToDate is None):
+            raise ValueError("FromDate y ToDate deben indicarse juntos.")
+        if self.FromDate and self.ToDate and self.ToDate <= self.FromDate:
+            raise ValueError("ToDate debe ser posterior a FromDate.")
+        return self
@@ -0,0 +1,54 @@
+from datetime import datetime
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.models.task import Task
+from app.models.calendar import Calendar
+from app.schemas.calendar import GRANULARITY_HOUR
+from app.services.task_view_service import visible_tasks_filter
+from app.services.freebusy_service import series_occurrence_rows
+
+
+def bucket_key(year: int, month: int, day: int, hour=None):
+    key = f"{year:04d}-{month:02d}-{day:02d}"
+    return key if hour is None else f"{key}T{hour:02d}"
+
+
+def agenda_heatmap(db: Session, user_id: int, from_date: datetime, to_date: datetime, granularity: str):
+    """Número de tareas visibles y minutos ocupados por día (u hora) de inicio dentro del rango.
+
+    Las tareas materializadas se agregan con GROUP BY sobre las columnas de Calendar; las ocurrencias de
+    series expandidas en lectura se suman después en memoria. Una tarea cuenta entera en su franja de inicio.
+    Solo se devuelven las franjas con tareas, ordenadas."""
+    group_columns = [Calendar.Year, Calendar.Month, Calendar.Day]
+    if granularity == GRANULARITY_HOUR:
+        group_columns.append(Calendar.Hour)
+
+    rows = db.query(
+        *group_columns, func.count(Task.TaskID), func.coalesce(func.sum(Task.MinutesDuration), 0)
+    ).join(
+        Calendar, Calendar.CalendarID == Task.StartTimestampID
+    ).filter(
+        visible_tasks_filter(user_id),
+        Calendar.Date >= from_date,
+        Calendar.Date < to_date
+    ).group_by(*group_columns).all()
+
+    buckets = {}
+    for *parts, tasks, minutes in rows:
+        buckets[bucket_key(*parts)] = [tasks, minutes]
+
+    for _, start, end in series_occurrence_rows(db, [user_id], from_date, to_date):
+        if start < from_date:
+            continue
+        key = bucket_key(start.year, start.month, start.day, start.hour if granularity == GRANULARITY_HOUR else None)
+        bucket = buckets.setdefault(key, [0, 0])
+        bucket[0] += 1
+        bucket[1] += int((end - start).total_seconds() // 60)
+
+    return {
+        "Granularity": granularity,
+        "Buckets": [
+            {"Date": key, "Tasks": tasks, "Minutes": minutes}
+            for key, (tasks, minutes) in sorted(buckets.items())
+        ]
+    }
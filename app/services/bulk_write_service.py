@@ -0,0 +1,299 @@
+import logging
+from datetime import datetime
+from fastapi import HTTPException
+from sqlalchemy import insert, select, text, update
+from sqlalchemy.orm import Session
+from app.models.task import Task
+from app.models.recurring import Recurring
+from app.models.user import User
+from app.models.invitation import Invitation
+from app.models.recurring_exception import RecurringException
+from app.schemas.task import TaskCreateRequest
+from app.services.recurrence_service import generate_recurrence_dates
+from app.services.calendar_service import get_or_create_calendar_ids, mark_orphan_calendars
+from app.services.dates import naive_utc
+from app.services.task_view_service import task_audience
+from app.services.user_version_service import touch_users
+from app.services.job_queue import job_handler
+from app.services.visibility_service import add_creator_rows, remove_tasks
+from app.services.search_service import mark_search_dirty
+from app.services.change_feed import INSERT, DELETE, record_changes, record_task_changes, record_series_changes, record_invitation_changes, invitation_keys
+
+logger = logging.getLogger(__name__)
+
+MYSQL_CHUNK_SIZE = 1000
+
+consecutive_id_engines = {}
+
+
+def consecutive_insert_ids(db: Session):
+    """Indica si un INSERT multi-fila de MySQL recibe ids consecutivos desde LAST_INSERT_ID(). Solo se garantiza
+    con auto_increment_increment=1 e innodb_autoinc_lock_mode 0 o 1; con el modo 2 (el de MySQL 8) otras
+    inserciones concurrentes pueden intercalar sus ids. Se consulta una vez por engine."""
+    bind = db.get_bind()
+    if bind not in consecutive_id_engines:
+        increment, lock_mode = db.execute(text("SELECT @@auto_increment_increment, @@innodb_autoinc_lock_mode")).one()
+        consecutive_id_engines[bind] = int(increment) == 1 and int(lock_mode) in (0, 1)
+        if not consecutive_id_engines[bind]:
+            logger.warning(
+                "auto_increment_increment=%s, innodb_autoinc_lock_mode=%s: las inserciones por lotes se harán fila "
+                "a fila. Configura innodb_autoinc_lock_mode=1 para recuperar los INSERT multi-fila.", increment, lock_mode
+            )
+    return consecutive_id_engines[bind]
+
+
+def insert_returning_ids(db: Session, table, rows: list[dict]):
+    """Inserta filas con sentencias multi-fila y devuelve sus claves primarias en el mismo orden."""
+    if not rows:
+        return []
+
+    dialect = db.get_bind().dialect
+    pk_column = list(table.primary_key.columns)[0]
+
+    if getattr(dialect, "insert_executemany_returning_sort_by_parameter_order", False):
+        result = db.execute(insert(table).returning(pk_column, sort_by_parameter_order=True), rows)
+        return list(result.scalars())
+
+    # MySQL no soporta RETURNING: si no hay garantía de ids consecutivos, cada fila se inserta por separado
+    if not consecutive_insert_ids(db):
+        return [db.execute(insert(table).values(row)).lastrowid for row in rows]
+
+    # Con ids consecutivos, un INSERT multi-fila los reserva desde LAST_INSERT_ID()
+    ids = []
+    for i in range(0, len(rows), MYSQL_CHUNK_SIZE):
+        chunk = rows[i:i + MYSQL_CHUNK_SIZE]
+        first_id = db.execute(insert(table).values(chunk)).lastrowid
+        ids.extend(range(first_id, first_id + len(chunk)))
+    return ids
+
+
+def update_returning(db: Session, table, conditions: list, values: dict, columns: list):
+    """Actualiza con un único UPDATE por conjuntos las filas que cumplen `conditions` y devuelve `columns`
+    de cada una. `columns[0]` debe ser la clave primaria."""
+    dialect = db.get_bind().dialect
+    if getattr(dialect, "update_returning", False):
+        return db.execute(update(table).where(*conditions).values(values).returning(*columns)).all()
+
+    # MySQL no soporta RETURNING: se bloquean y leen las filas antes de actualizarlas por clave primaria
+    rows = db.execute(select(*columns).where(*conditions).with_for_update()).all()
+    if rows:
+        db.execute(update(table).where(columns[0].in_([row[0] for row in rows])).values(values))
+    return rows
+
+
+def insert_rows(db: Session, table, rows: list[dict]):
+    if rows:
+        db.execute(insert(table), rows)
+
+
+def validate_guests(db: Session, payloads: list[TaskCreateRequest]):
+    guest_ids = {guest_id for payload in payloads for guest_id in (payload.GuestIDs or [])}
+    if not guest_ids:
+        return
+
+    existing_users = {user_id for (user_id,) in db.query(User.UserID).filter(User.UserID.in_(guest_ids)).all()}
+    invalid_users = guest_ids - existing_users
+    if invalid_users:
+        raise HTTPException(status_code=400, detail=f"Usuarios no encontrados: {', '.join(map(str, sorted(invalid_users)))}")
+
+
+def is_recurring_payload(payload: TaskCreateRequest):
+    return payload.RecurringStart and any([payload.Frequency, payload.DayNameFrequency, payload.DayFrequency])
+
+
+def estimated_rows(payload: TaskCreateRequest):
+    """Filas que escribirá la creación: una tarea por ocurrencia materializada más una invitación por invitado."""
+    tasks = (payload.Occurrences or 0) if is_recurring_payload(payload) and not payload.ExpandOnRead else 1
+    return tasks + len(payload.GuestIDs or [])
+
+
+def validate_payloads(db: Session, payloads: list[TaskCreateRequest]):
+    """Comprobaciones que necesitan la base; las rutas las hacen antes de encolar, para responder 400 en lugar
+    de dejar un trabajo fallido."""
+    for payload in payloads:
+        if is_recurring_payload(payload) and payload.Occurrences is None and not payload.ExpandOnRead:
+            raise HTTPException(status_code=400, detail="Occurrences es obligatorio si la serie no se expande en lectura")
+
+    validate_guests(db, payloads)
+
+
+def bulk_create_tasks(db: Session, payloads: list[TaskCreateRequest], commit: bool = True):
+    """Crea tareas únicas y recurrentes con inserciones Core por lotes en una sola transacción.
+    Con `commit=False` deja la transacción abierta para quien la llama."""
+    validate_payloads(db, payloads)
+    now = datetime.utcnow()
+
+    durations = [
+        int((payload.EndTimestamp - payload.StartTimestamp).total_seconds() / 60)
+        for payload in payloads
+    ]
+
+    # Las reglas se anclan en UTC sin zona, como Calendar.Date: así las ocurrencias expandidas coinciden con las materializadas
+    starts = [naive_utc(payload.StartTimestamp) for payload in payloads]
+
+    recurring_payloads = [i for i, payload in enumerate(payloads) if is_recurring_payload(payload)]
+    recurring_ids = dict(zip(recurring_payloads, insert_returning_ids(db, Recurring.__table__, [
+        {
+            "Title": payloads[i].Title,
+            "Description": payloads[i].Description,
+            "Priority": payloads[i].Priority,
+            "CreatorID": payloads[i].CreatorID,
+            "Frequency": payloads[i].Frequency,
+            "DayNameFrequency": payloads[i].DayNameFrequency,
+            "DayFrequency": payloads[i].DayFrequency,
+            "StartTimestamp": starts[i],
+            "MinutesDuration": durations[i],
+            "Occurrences": payloads[i].Occurrences,
+            "ExpandOnRead": payloads[i].ExpandOnRead
+        }
+        for i in recurring_payloads
+    ])))
+
+    occurrences = []
+    for i, payload in enumerate(payloads):
+        if i in recurring_ids and payload.ExpandOnRead:
+            continue
+        if i in recurring_ids:
+            dates = generate_recurrence_dates(
+                starts[i],
+                payload.Occurrences,
+                payload.Frequency,
+                payload.DayNameFrequency,
+                payload.DayFrequency
+            )
+        else:
+            dates = [starts[i]]
+        duration = payload.EndTimestamp - payload.StartTimestamp
+        occurrences.extend((i, date, date + duration) for date in dates)
+
+    calendar_ids = get_or_create_calendar_ids(
+        db, [date for _, start_date, end_date in occurrences for date in (start_date, end_date)]
+    )
+
+    task_rows = []
+    for i, start_date, end_date in occurrences:
+        payload = payloads[i]
+        task_rows.append({
+            "CreatorID": payload.CreatorID,
+            "Title": payload.Title,
+            "Description": payload.Description,
+            "Priority": payload.Priority,
+            "StartTimestampID": calendar_ids[start_date],
+            "EndTimeStampID": calendar_ids[end_date],
+            "MinutesDuration": durations[i],
+            "RecurringStart": i in recurring_ids,
+            "RecurringID": recurring_ids.get(i),
+            "CreationDate": now
+        })
+    task_ids = insert_returning_ids(db, Task.__table__, task_rows)
+    add_creator_rows(db, [(row["CreatorID"], task_id) for row, task_id in zip(task_rows, task_ids)])
+    mark_search_dirty(db, task_ids)
+
+    tasks_by_payload = {}
+    for (i, _, _), task_id in zip(occurrences, task_ids):
+        tasks_by_payload.setdefault(i, []).append(task_id)
+
+    invitation_rows = []
+    for i, payload in enumerate(payloads):
+        for guest_id in payload.GuestIDs or []:
+            invitation_rows.append({
+                "CreatorID": payload.CreatorID,
+                "GuestID": guest_id,
+                "TaskID": None if i in recurring_ids else tasks_by_payload[i][0],
+                "RecurringID": recurring_ids.get(i),
+                "Status": "Pendiente",
+                "Date": now
+            })
+    invitation_ids = insert_returning_ids(db, Invitation.__table__, invitation_rows)
+
+    touch_users(db, {payload.CreatorID for payload in payloads} | {
+        guest_id for payload in payloads for guest_id in (payload.GuestIDs or [])
+    })
+    # Las tareas de una serie se anuncian con el cambio de la serie, no una a una
+    record_changes(db, [
+        (payload.CreatorID, "Recurring", recurring_ids[i], INSERT) if i in recurring_ids
+        else (payload.CreatorID, "Task", tasks_by_payload[i][0], INSERT)
+        for i, payload in enumerate(payloads)
+    ])
+    record_invitation_changes(db, [
+        (invitation_id, row["CreatorID"], row["GuestID"]) for invitation_id, row in zip(invitation_ids, invitation_rows)
+    ], INSERT)
+    if commit:
+        db.commit()
+
+    results = []
+    for i, payload in enumerate(payloads):
+        invitations_created = len(payload.GuestIDs or [])
+        if i in recurring_ids:
+            results.append({
+                "message": "Serie recurrente creada con éxito" if payload.ExpandOnRead else "Tareas recurrentes creadas con éxito",
+                "RecurringID": recurring_ids[i],
+                "Tareas_creadas": len(tasks_by_payload.get(i, [])),
+                "Invitaciones_creadas": invitations_created
+            })
+        else:
+            results.append({
+                "message": "Tarea única creada con éxito",
+                "TaskID": tasks_by_payload[i][0],
+                "Invitaciones_creadas": invitations_created
+            })
+
+    return results
+
+
+def delete_tasks(db: Session, task_ids, record_tasks: bool = True):
+    """Elimina tareas con sus invitaciones y marca los Calendar que quedan sin uso, con un número fijo
+    de sentencias por conjuntos. No confirma la transacción; devuelve lo eliminado.
+
+    Con `record_tasks=False` no se anuncia el borrado de cada tarea: lo hace quien llama, p. ej. con el de la serie."""
+    task_ids = sorted(set(task_ids))
+    if not task_ids:
+        return {"Tareas_eliminadas": 0, "Invitaciones_eliminadas": 0, "Calendarios_huerfanos": 0}
+
+    calendar_ids = set()
+    for start_id, end_id in db.query(Task.StartTimestampID, Task.EndTimeStampID).filter(Task.TaskID.in_(task_ids)):
+        calendar_ids.update((start_id, end_id))
+
+    touch_users(db, task_audience(db, task_ids))
+    if record_tasks:
+        record_task_changes(db, task_ids, DELETE)
+    record_invitation_changes(db, invitation_keys(db, Invitation.TaskID.in_(task_ids)), DELETE)
+
+    remove_tasks(db, task_ids)
+    mark_search_dirty(db, task_ids)
+    invitations_deleted = db.query(Invitation).filter(Invitation.TaskID.in_(task_ids)).delete(synchronize_session=False)
+    tasks_deleted = db.query(Task).filter(Task.TaskID.in_(task_ids)).delete(synchronize_session=False)
+    calendars_orphaned = mark_orphan_calendars(db, calendar_ids)
+
+    return {
+        "Tareas_eliminadas": tasks_deleted,
+        "Invitaciones_eliminadas": invitations_deleted,
+        "Calendarios_huerfanos": calendars_orphaned
+    }
+
+
+def delete_series(db: Session, recurring_id: int):
+    """Elimina una serie con sus tareas, excepciones e invitaciones. No confirma la transacción.
+
+    Como al crearla, el borrado se anuncia con un único cambio de la serie por usuario, no uno por tarea."""
+    touch_users(db, task_audience(db, recurring_ids=[recurring_id]))
+    record_series_changes(db, recurring_id, DELETE)
+    record_invitation_changes(db, invitation_keys(db, Invitation.RecurringID == recurring_id), DELETE)
+
+    deleted = delete_tasks(
+        db, [task_id for (task_id,) in db.query(Task.TaskID).filter(Task.RecurringID == recurring_id)], record_tasks=False
+    )
+    deleted["Invitaciones_eliminadas"] += db.query(Invitation).filter(Invitation.RecurringID == recurring_id).delete(synchronize_session=False)
+    db.query(RecurringException).filter(RecurringException.RecurringID == recurring_id).delete(synchronize_session=False)
+    db.query(Recurring).filter(Recurring.RecurringID == recurring_id).delete(synchronize_session=False)
+    return deleted
+
+
+@job_handler("create_tasks")
+def run_create_tasks(db: Session, payload: dict):
+    return bulk_create_tasks(db, [TaskCreateRequest(**task) for task in payload["tasks"]], commit=False)
+
+
+@job_handler("delete_series")
+def run_delete_series(db: Session, payload: dict):
+    return delete_series(db, payload["RecurringID"])
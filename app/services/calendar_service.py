@@ -0,0 +1,196 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from sqlalchemy import event, exists, insert, or_
+from sqlalchemy.orm import Session
+from app.database import SessionLocal, env_int
+from app.models.task import Task
+from app.models.calendar import Calendar
+from app.services.dates import naive_utc
+
+logger = logging.getLogger(__name__)
+
+CALENDAR_CACHE_SIZE = env_int("CALENDAR_CACHE_SIZE", 20000)
+CALENDAR_CACHE_TTL = env_int("CALENDAR_CACHE_TTL", 300)
+CALENDAR_SWEEP_INTERVAL = env_int("CALENDAR_SWEEP_INTERVAL", 3600)
+CALENDAR_SWEEP_GRACE = max(env_int("CALENDAR_SWEEP_GRACE", 900), CALENDAR_CACHE_TTL)
+LOOKUP_CHUNK_SIZE = 1000
+
+
+class CalendarCache:
+    """LRU acotado de fecha (al minuto) a CalendarID. Las entradas caducan a los `ttl` segundos de
+    insertadas, para que un proceso nunca reutilice un id que el barrido de huérfanos pudo eliminar."""
+
+    def __init__(self, max_size: int, ttl: int):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: datetime):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            calendar_id, expires_at = entry
+            if expires_at < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return calendar_id
+
+    def put_many(self, items: dict):
+        expires_at = time.monotonic() + self.ttl
+        with self.lock:
+            for key, calendar_id in items.items():
+                self.entries[key] = (calendar_id, expires_at)
+                self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+calendar_cache = CalendarCache(CALENDAR_CACHE_SIZE, CALENDAR_CACHE_TTL)
+
+
+def calendar_key(date: datetime):
+    return naive_utc(date).replace(second=0, microsecond=0)
+
+
+def calendar_row(date: datetime):
+    return {
+        "Date": date,
+        "Year": date.year,
+        "Month": date.month,
+        "Day": date.day,
+        "DayName": date.strftime('%A'),
+        "Hour": date.hour,
+        "Minute": date.minute
+    }
+
+
+def lookup_calendar_ids(db: Session, keys: list):
+    """Busca las filas de estas fechas. Las que estaban marcadas como huérfanas se desmarcan: van a reutilizarse
+    y el barrido no debe borrarlas mientras alguna caché las conserve."""
+    found, orphaned = {}, []
+    for i in range(0, len(keys), LOOKUP_CHUNK_SIZE):
+        chunk = keys[i:i + LOOKUP_CHUNK_SIZE]
+        for calendar_id, date, orphaned_at in db.query(
+            Calendar.CalendarID, Calendar.Date, Calendar.OrphanedAt
+        ).filter(Calendar.Date.in_(chunk)).all():
+            found[date] = calendar_id
+            if orphaned_at is not None:
+                orphaned.append(calendar_id)
+    if orphaned:
+        db.query(Calendar).filter(Calendar.CalendarID.in_(orphaned)).update(
+            {Calendar.OrphanedAt: None}, synchronize_session=False
+        )
+    return found
+
+
+def get_or_create_calendar_ids(db: Session, dates):
+    """Devuelve {fecha: CalendarID} reutilizando las filas existentes del minuto e insertando en lote las que falten.
+
+    Los ids resueltos se publican en la caché solo cuando la transacción confirma."""
+    keys = {date: calendar_key(date) for date in dates}
+    resolved = {}
+    missing = []
+    for key in set(keys.values()):
+        calendar_id = calendar_cache.get(key)
+        if calendar_id is None:
+            missing.append(key)
+        else:
+            resolved[key] = calendar_id
+
+    if missing:
+        found = lookup_calendar_ids(db, missing)
+        to_insert = [key for key in missing if key not in found]
+        if to_insert:
+            db.execute(
+                insert(Calendar.__table__).prefix_with("IGNORE", dialect="mysql").prefix_with("OR IGNORE", dialect="sqlite"),
+                [calendar_row(key) for key in sorted(to_insert)]
+            )
+            found.update(lookup_calendar_ids(db, to_insert))
+        resolved.update(found)
+        db.info.setdefault("pending_calendar_ids", {}).update(found)
+
+    return {date: resolved[key] for date, key in keys.items()}
+
+
+@event.listens_for(Session, "after_commit")
+def publish_calendar_ids(session):
+    pending = session.info.pop("pending_calendar_ids", None)
+    if pending:
+        calendar_cache.put_many(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def discard_calendar_ids(session):
+    session.info.pop("pending_calendar_ids", None)
+
+
+def calendar_referenced():
+    return or_(
+        exists().where(Task.StartTimestampID == Calendar.CalendarID).correlate(Calendar),
+        exists().where(Task.EndTimeStampID == Calendar.CalendarID).correlate(Calendar)
+    )
+
+
+def mark_orphan_calendars(db: Session, calendar_ids):
+    """Marca como huérfanas, en una sola sentencia, las filas de `calendar_ids` que ya no usa ninguna tarea.
+
+    No se eliminan aquí: el barrido las borra tras el periodo de gracia, cuando ninguna caché puede seguir usándolas.
+    Una marca anterior se renueva, porque la fila pudo reutilizarse desde cachés después de ella."""
+    calendar_ids = set(calendar_ids)
+    if not calendar_ids:
+        return 0
+    return db.query(Calendar).filter(
+        Calendar.CalendarID.in_(calendar_ids),
+        ~calendar_referenced()
+    ).update({Calendar.OrphanedAt: datetime.utcnow()}, synchronize_session=False)
+
+
+def sweep_orphan_calendars(db: Session, grace: timedelta = timedelta(seconds=CALENDAR_SWEEP_GRACE)):
+    """Marca las filas de Calendar sin tareas y elimina las que siguen huérfanas tras el periodo de gracia."""
+    now = datetime.utcnow()
+    referenced = calendar_referenced()
+
+    db.query(Calendar).filter(Calendar.OrphanedAt.isnot(None), referenced).update(
+        {Calendar.OrphanedAt: None}, synchronize_session=False
+    )
+    marked = db.query(Calendar).filter(Calendar.OrphanedAt.is_(None), ~referenced).update(
+        {Calendar.OrphanedAt: now}, synchronize_session=False
+    )
+    deleted = db.query(Calendar).filter(Calendar.OrphanedAt < now - grace, ~referenced).delete(
+        synchronize_session=False
+    )
+    db.commit()
+
+    if deleted:
+        calendar_cache.clear()
+
+    return {"marked": marked, "deleted": deleted}
+
+
+def run_sweep():
+    db = SessionLocal()
+    try:
+        return sweep_orphan_calendars(db)
+    finally:
+        db.close()
+
+
+async def run_calendar_sweeper(interval: int = CALENDAR_SWEEP_INTERVAL):
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            result = await asyncio.to_thread(run_sweep)
+            logger.info("Barrido de Calendar: %s", result)
+        except Exception:
+            logger.exception("Falló el barrido de filas huérfanas de Calendar")
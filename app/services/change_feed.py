@@ -0,0 +1,153 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy import event, insert, select, union, update
+from sqlalchemy.orm import Session
+from app.database import SessionLocal, env_int
+from app.models.change_log import ChangeLog
+from app.models.change_sequence import ChangeSequence
+from app.models.task import Task
+from app.models.invitation import Invitation
+from app.services.task_view_service import task_audience
+
+logger = logging.getLogger(__name__)
+
+INSERT, UPDATE, DELETE = "insert", "update", "delete"
+
+# Con 0 días el historial se conserva indefinidamente
+CHANGE_LOG_RETENTION_DAYS = env_int("CHANGE_LOG_RETENTION_DAYS", 30)
+CHANGE_LOG_PRUNE_INTERVAL = env_int("CHANGE_LOG_PRUNE_INTERVAL", 3600)
+PRUNE_CHUNK_SIZE = 5000
+
+# Filas de ChangeSequence: la secuencia de las confirmaciones y la última secuencia eliminada por la retención
+COMMIT_SEQUENCE, PRUNED_SEQUENCE = 1, 2
+
+
+def record_changes(db: Session, changes):
+    """Anota en la transacción actual los cambios (UserID, Entity, EntityID, Operation). Se escriben en
+    ChangeLog justo antes de confirmar, con el número de secuencia de esa confirmación."""
+    now = datetime.utcnow()
+    rows = [
+        {"UserID": user_id, "Entity": entity, "EntityID": entity_id, "Operation": operation, "Date": now}
+        for user_id, entity, entity_id, operation in dict.fromkeys(changes) if user_id is not None
+    ]
+    if rows:
+        db.info.setdefault("pending_changes", []).extend(rows)
+
+
+def ensure_sequence(db: Session, sequence_id: int):
+    db.execute(
+        insert(ChangeSequence.__table__).prefix_with("IGNORE", dialect="mysql").prefix_with("OR IGNORE", dialect="sqlite"),
+        [{"SequenceID": sequence_id, "Value": 0}]
+    )
+
+
+def sequence_value(db: Session, sequence_id: int):
+    return db.execute(select(ChangeSequence.Value).where(ChangeSequence.SequenceID == sequence_id)).scalar() or 0
+
+
+def next_sequence(db: Session):
+    """Incrementa la secuencia de cambios y devuelve su valor. La fila queda bloqueada hasta el fin de la
+    transacción, así que las transacciones con cambios confirman en el orden de su secuencia (y de ChangeID)."""
+    bump = update(ChangeSequence).where(ChangeSequence.SequenceID == COMMIT_SEQUENCE).values(Value=ChangeSequence.Value + 1)
+    if not db.execute(bump).rowcount:
+        ensure_sequence(db, COMMIT_SEQUENCE)
+        db.execute(bump)
+    return sequence_value(db, COMMIT_SEQUENCE)
+
+
+@event.listens_for(Session, "before_commit")
+def write_pending_changes(session):
+    rows = session.info.pop("pending_changes", None)
+    if rows:
+        sequence = next_sequence(session)
+        session.execute(insert(ChangeLog.__table__), [{**row, "Sequence": sequence} for row in rows])
+
+
+@event.listens_for(Session, "after_rollback")
+def discard_pending_changes(session):
+    session.info.pop("pending_changes", None)
+
+
+def record_task_changes(db: Session, task_ids, operation: str):
+    """Registra el cambio de cada tarea para su creador y sus invitados (directos o de la serie).
+    En los borrados debe llamarse antes de eliminar las filas."""
+    task_ids = set(task_ids)
+    if not task_ids:
+        return
+    pairs = db.execute(union(
+        select(Task.TaskID, Task.CreatorID).where(Task.TaskID.in_(task_ids)),
+        select(Invitation.TaskID, Invitation.GuestID).where(Invitation.TaskID.in_(task_ids)),
+        select(Task.TaskID, Invitation.GuestID).join(
+            Invitation, Invitation.RecurringID == Task.RecurringID
+        ).where(Task.TaskID.in_(task_ids))
+    )).all()
+    record_changes(db, [(user_id, "Task", task_id, operation) for task_id, user_id in pairs])
+
+
+def record_series_changes(db: Session, recurring_id: int, operation: str, extra_user_ids=()):
+    users = task_audience(db, recurring_ids=[recurring_id]) | set(extra_user_ids)
+    record_changes(db, [(user_id, "Recurring", recurring_id, operation) for user_id in users])
+
+
+def record_invitation_changes(db: Session, invitations, operation: str):
+    """`invitations` son tuplas (InvitationID, CreatorID, GuestID); el cambio se registra para ambos."""
+    record_changes(db, [
+        (user_id, "Invitation", invitation_id, operation)
+        for invitation_id, creator_id, guest_id in invitations
+        for user_id in (creator_id, guest_id)
+    ])
+
+
+def invitation_keys(db: Session, *criteria):
+    """(InvitationID, CreatorID, GuestID) de las invitaciones que cumplen `criteria`, p. ej. antes de borrarlas."""
+    return db.query(Invitation.InvitationID, Invitation.CreatorID, Invitation.GuestID).filter(*criteria).all()
+
+
+def prune_change_log(db: Session, retention: timedelta = timedelta(days=CHANGE_LOG_RETENTION_DAYS)):
+    """Elimina los cambios de las confirmaciones anteriores a la retención.
+
+    Antes de borrar se publica la última secuencia eliminada: los cursores que no la superan reciben 410 y el
+    cliente vuelve a cargar todo, en lugar de sincronizar con un historial incompleto. Como ChangeID crece en
+    el orden de la secuencia, se borra por lotes en orden de clave primaria, confirmando cada lote."""
+    pruned = db.query(ChangeLog.Sequence).filter(ChangeLog.Date < datetime.utcnow() - retention).order_by(
+        ChangeLog.Date.desc()
+    ).limit(1).scalar()
+    if pruned is None:
+        return {"pruned_sequence": sequence_value(db, PRUNED_SEQUENCE), "deleted": 0}
+
+    ensure_sequence(db, PRUNED_SEQUENCE)
+    db.execute(update(ChangeSequence).where(
+        ChangeSequence.SequenceID == PRUNED_SEQUENCE, ChangeSequence.Value < pruned
+    ).values(Value=pruned))
+    db.commit()
+
+    deleted = 0
+    while True:
+        change_ids = [change_id for (change_id,) in db.query(ChangeLog.ChangeID).filter(
+            ChangeLog.Sequence <= pruned
+        ).order_by(ChangeLog.ChangeID).limit(PRUNE_CHUNK_SIZE)]
+        if not change_ids:
+            break
+        deleted += db.query(ChangeLog).filter(ChangeLog.ChangeID.in_(change_ids)).delete(synchronize_session=False)
+        db.commit()
+
+    return {"pruned_sequence": pruned, "deleted": deleted}
+
+
+def run_prune():
+    db = SessionLocal()
+    try:
+        return prune_change_log(db)
+    finally:
+        db.close()
+
+
+async def run_change_log_pruner(interval: int = CHANGE_LOG_PRUNE_INTERVAL):
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            result = await asyncio.to_thread(run_prune)
+            logger.info("Retención de ChangeLog: %s", result)
+        except Exception:
+            logger.exception("Falló la retención de ChangeLog")
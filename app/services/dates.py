@@ -0,0 +1,6 @@
+from datetime import datetime, timezone
+
+
+def naive_utc(value: datetime):
+    """Las fechas se guardan sin zona horaria, en UTC: las que llegan con zona se convierten a UTC y se les quita."""
+    return value if value.tzinfo is None else value.astimezone(timezone.utc).replace(tzinfo=None)
@@ -0,0 +1,54 @@
+import csv
+import io
+import json
+from datetime import datetime
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from app.database import ReadSessionLocal
+from app.services.serialization import json_default
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_FORMAT_PATTERN = "^(ndjson|csv)$"
+
+
+def csv_lines(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+def stream_export(columns: list, filters: list, export_format: str, filename: str, joins=()):
+    """Responde con las filas de `columns` que cumplen `filters`, leídas con un cursor del servidor
+    en lotes de EXPORT_BATCH_SIZE y emitidas como NDJSON o CSV a medida que llegan."""
+    names = [column.key for column in columns]
+    statement = select(*columns)
+    for target, onclause in joins:
+        statement = statement.join(target, onclause)
+    statement = statement.where(*filters).order_by(columns[0]).execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+    def generate():
+        db = ReadSessionLocal()
+        try:
+            if export_format == "csv":
+                yield csv_lines([names])
+            for partition in db.execute(statement).partitions():
+                if export_format == "csv":
+                    yield csv_lines(
+                        [json_default(value) if isinstance(value, datetime) else value for value in row]
+                        for row in partition
+                    )
+                else:
+                    yield "".join(
+                        json.dumps(dict(zip(names, row)), default=json_default, ensure_ascii=False) + "\n"
+                        for row in partition
+                    )
+        finally:
+            db.close()
+
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        generate(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format}"'}
+    )
@@ -0,0 +1,125 @@
+import heapq
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from sqlalchemy import select, union_all
+from sqlalchemy.orm import Session, aliased
+from app.models.task import Task
+from app.models.calendar import Calendar
+from app.models.recurring import Recurring
+from app.models.recurring_exception import RecurringException
+from app.models.invitation import Invitation
+from app.services.recurrence_service import expand_occurrences
+
+
+def merge_intervals(intervals):
+    """Ordena y fusiona intervalos [inicio, fin) solapados o contiguos. O(n log n)."""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+class BusyIndex:
+    """Intervalos ocupados de cada usuario, fusionados y ordenados por inicio, dentro de una ventana."""
+
+    def __init__(self, intervals_by_user: dict):
+        self.intervals = {user_id: merge_intervals(intervals) for user_id, intervals in intervals_by_user.items()}
+        self.starts = {user_id: [start for start, _ in intervals] for user_id, intervals in self.intervals.items()}
+
+    def conflicts(self, user_id: int, start: datetime, end: datetime):
+        """Intervalos del usuario que se solapan con [start, end), localizados por búsqueda binaria."""
+        intervals = self.intervals.get(user_id, [])
+        starts = self.starts.get(user_id, [])
+        first = bisect_right(starts, start) - 1
+        if first < 0 or intervals[first][1] <= start:
+            first += 1
+        last = bisect_left(starts, end)
+        return intervals[first:last]
+
+    def is_free(self, user_id: int, start: datetime, end: datetime):
+        return not self.conflicts(user_id, start, end)
+
+    def first_free_slot(self, user_ids, window_start: datetime, window_end: datetime, duration: timedelta):
+        """Primer hueco común de longitud `duration` en [window_start, window_end). Mezcla las listas ya
+        ordenadas de cada usuario con un heap, en O(n log k) para k usuarios."""
+        cursor = window_start
+        for start, end in heapq.merge(*(self.intervals.get(user_id, []) for user_id in set(user_ids))):
+            if start - cursor >= duration:
+                break
+            cursor = max(cursor, end)
+        if window_end - cursor >= duration:
+            return cursor, cursor + duration
+        return None
+
+
+def busy_rows_query(user_ids, window_start: datetime, window_end: datetime):
+    """(UserID, inicio, fin) de las tareas materializadas de cada usuario que solapan la ventana:
+    las que creó y las aceptadas como invitado, por tarea o por serie."""
+    start_calendar, end_calendar = aliased(Calendar), aliased(Calendar)
+
+    def task_dates(user_column, source, *joins):
+        statement = select(user_column, start_calendar.Date, end_calendar.Date).select_from(source)
+        for target, onclause in joins:
+            statement = statement.join(target, onclause)
+        return statement.join(
+            start_calendar, start_calendar.CalendarID == Task.StartTimestampID
+        ).join(
+            end_calendar, end_calendar.CalendarID == Task.EndTimeStampID
+        ).where(start_calendar.Date < window_end, end_calendar.Date > window_start)
+
+    accepted = (Invitation.GuestID.in_(user_ids), Invitation.Status == "Aceptada")
+    return union_all(
+        task_dates(Task.CreatorID, Task).where(Task.CreatorID.in_(user_ids)),
+        task_dates(Invitation.GuestID, Invitation, (Task, Task.TaskID == Invitation.TaskID)).where(*accepted),
+        task_dates(Invitation.GuestID, Invitation, (Task, Task.RecurringID == Invitation.RecurringID)).where(*accepted)
+    )
+
+
+def series_occurrence_rows(db: Session, user_ids, window_start: datetime, window_end: datetime):
+    """(UserID, inicio, fin) de las ocurrencias de series expandidas en lectura de cada usuario."""
+    series_users = db.query(Recurring, Recurring.CreatorID).filter(
+        Recurring.ExpandOnRead.is_(True), Recurring.CreatorID.in_(user_ids)
+    ).all() + db.query(Recurring, Invitation.GuestID).join(
+        Invitation, Invitation.RecurringID == Recurring.RecurringID
+    ).filter(
+        Recurring.ExpandOnRead.is_(True), Invitation.GuestID.in_(user_ids), Invitation.Status == "Aceptada"
+    ).all()
+    series_users = [(recurring, user_id) for recurring, user_id in series_users
+                    if recurring.StartTimestamp is not None and recurring.StartTimestamp < window_end]
+    if not series_users:
+        return []
+
+    exceptions_by_series = {}
+    for exception in db.query(RecurringException).filter(
+        RecurringException.RecurringID.in_({recurring.RecurringID for recurring, _ in series_users})
+    ):
+        exceptions_by_series.setdefault(exception.RecurringID, []).append(exception)
+
+    # Una ocurrencia puede empezar antes de la ventana y terminar dentro de ella
+    lookback = max(timedelta(minutes=recurring.MinutesDuration or 0) for recurring, _ in series_users)
+    rows = []
+    for recurring, user_id in series_users:
+        for occurrence in expand_occurrences(
+            recurring, exceptions_by_series.get(recurring.RecurringID, []), window_start - lookback, window_end
+        ):
+            if occurrence["EndTimestamp"] > window_start:
+                rows.append((user_id, occurrence["StartTimestamp"], occurrence["EndTimestamp"]))
+    return rows
+
+
+def build_busy_index(db: Session, user_ids, window_start: datetime, window_end: datetime):
+    """Índice de ocupación de los usuarios en la ventana, recortado a sus límites."""
+    user_ids = sorted(set(user_ids))
+    intervals_by_user = {user_id: [] for user_id in user_ids}
+    if not user_ids:
+        return BusyIndex(intervals_by_user)
+
+    rows = db.execute(busy_rows_query(user_ids, window_start, window_end)).all()
+    rows += series_occurrence_rows(db, user_ids, window_start, window_end)
+    for user_id, start, end in rows:
+        intervals_by_user[user_id].append((max(start, window_start), min(end, window_end)))
+    return BusyIndex(intervals_by_user)
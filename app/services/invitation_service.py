@@ -0,0 +1,150 @@
+from datetime import datetime
+from fastapi import HTTPException
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+from app.models.task import Task
+from app.models.recurring import Recurring
+from app.models.invitation import Invitation
+from app.models.user import User
+from app.schemas.invitations import InvitationBatchUpdateRequest
+from app.services.bulk_write_service import insert_returning_ids, update_returning
+from app.services.change_feed import INSERT, UPDATE, DELETE, record_changes, record_invitation_changes, invitation_keys
+from app.services.job_queue import job_handler
+from app.services.visibility_service import refresh_visibility
+from app.services.task_view_service import task_audience
+from app.services.user_version_service import touch_users
+
+
+def send_invitations(db: Session, creator_id: int, guest_ids, task_id=None, recurring_id=None):
+    """Invita a varios usuarios a una tarea o serie con una consulta por validación y una inserción en lote.
+
+    Los invitados que ya tienen invitación para ese objetivo se omiten. Confirma la transacción."""
+    guest_ids = sorted(set(guest_ids) - {creator_id})
+
+    existing_users = {
+        user_id for (user_id,) in db.query(User.UserID).filter(User.UserID.in_([creator_id, *guest_ids])).all()
+    }
+    if creator_id not in existing_users:
+        raise HTTPException(status_code=404, detail="Usuario no encontrado")
+    missing_guests = [guest_id for guest_id in guest_ids if guest_id not in existing_users]
+    if missing_guests:
+        raise HTTPException(status_code=404, detail=f"Invitados no encontrados: {', '.join(map(str, missing_guests))}")
+
+    if task_id and not db.query(Task.TaskID).filter(Task.TaskID == task_id).first():
+        raise HTTPException(status_code=404, detail="Tarea no encontrada")
+    if recurring_id and not db.query(Recurring.RecurringID).filter(Recurring.RecurringID == recurring_id).first():
+        raise HTTPException(status_code=404, detail="Recurrencia no encontrada")
+
+    targets = []
+    if task_id:
+        targets.append(Invitation.TaskID == task_id)
+    if recurring_id:
+        targets.append(Invitation.RecurringID == recurring_id)
+    already_invited = {
+        guest_id for (guest_id,) in db.query(Invitation.GuestID).filter(
+            Invitation.GuestID.in_(guest_ids), or_(*targets)
+        ).distinct()
+    } if guest_ids else set()
+
+    new_guest_ids = [guest_id for guest_id in guest_ids if guest_id not in already_invited]
+    now = datetime.utcnow()
+    invitation_ids = insert_returning_ids(db, Invitation.__table__, [
+        {
+            "CreatorID": creator_id,
+            "GuestID": guest_id,
+            "TaskID": task_id,
+            "RecurringID": recurring_id,
+            "Status": "Pendiente",
+            "Date": now
+        }
+        for guest_id in new_guest_ids
+    ])
+
+    if new_guest_ids:
+        touch_users(db, [creator_id, *new_guest_ids])
+        record_invitation_changes(db, [
+            (invitation_id, creator_id, guest_id) for invitation_id, guest_id in zip(invitation_ids, new_guest_ids)
+        ], INSERT)
+    db.commit()
+
+    return {
+        "message": "Invitaciones enviadas con éxito",
+        "Invitaciones_creadas": len(invitation_ids),
+        "InvitationIDs": invitation_ids,
+        "Omitidos": sorted(already_invited)
+    }
+
+
+def respond_invitations(db: Session, response_data: InvitationBatchUpdateRequest):
+    """Acepta o rechaza en un solo UPDATE las invitaciones elegidas del invitado y aplica en bloque
+    los efectos sobre versiones y cachés. Confirma la transacción."""
+    conditions = [Invitation.GuestID == response_data.GuestID, Invitation.Status != response_data.Status]
+    if response_data.InvitationIDs is not None:
+        conditions.append(Invitation.InvitationID.in_(response_data.InvitationIDs))
+    elif response_data.CreatorID is not None:
+        conditions += [Invitation.CreatorID == response_data.CreatorID, Invitation.Status == "Pendiente"]
+    else:
+        conditions.append(or_(
+            Invitation.RecurringID == response_data.RecurringID,
+            Invitation.TaskID.in_(select(Task.TaskID).where(Task.RecurringID == response_data.RecurringID))
+        ))
+
+    rows = update_returning(
+        db, Invitation.__table__, conditions, {Invitation.Status: response_data.Status},
+        [Invitation.InvitationID, Invitation.CreatorID, Invitation.TaskID, Invitation.RecurringID]
+    )
+
+    if rows:
+        task_ids = {task_id for _, _, task_id, _ in rows if task_id}
+        recurring_ids = {recurring_id for _, _, _, recurring_id in rows if recurring_id}
+        touch_users(db, task_audience(db, task_ids, recurring_ids) | {creator_id for _, creator_id, _, _ in rows} | {response_data.GuestID})
+        refresh_visibility(db, [response_data.GuestID], task_ids, recurring_ids)
+        record_invitation_changes(db, [(invitation_id, creator_id, response_data.GuestID) for invitation_id, creator_id, _, _ in rows], UPDATE)
+        record_changes(db, [(response_data.GuestID, "Task", task_id, UPDATE) for task_id in task_ids] + [
+            (response_data.GuestID, "Recurring", recurring_id, UPDATE) for recurring_id in recurring_ids
+        ])
+    db.commit()
+
+    return {
+        "message": f"Invitaciones {response_data.Status.lower()}s con éxito",
+        "Invitaciones_actualizadas": len(rows),
+        "Invitaciones": [
+            {"InvitationID": invitation_id, "CreatorID": creator_id, "TaskID": task_id, "RecurringID": recurring_id}
+            for invitation_id, creator_id, task_id, recurring_id in rows
+        ]
+    }
+
+
+def sync_task_guests(db: Session, task_id: int, guest_ids):
+    """Deja como invitados de la tarea exactamente a `guest_ids`: borra los sobrantes e inserta los nuevos
+    en lote. No confirma la transacción."""
+    creator_id = db.query(Task.CreatorID).filter(Task.TaskID == task_id).scalar()
+    if creator_id is None:
+        raise HTTPException(status_code=404, detail="Tarea no encontrada")
+
+    current_guest_ids = {guest_id for (guest_id,) in db.query(Invitation.GuestID).filter(Invitation.TaskID == task_id)}
+    new_guest_ids = set(guest_ids)
+    to_remove = current_guest_ids - new_guest_ids
+    to_add = new_guest_ids - current_guest_ids
+
+    if to_remove:
+        removed = Invitation.TaskID == task_id, Invitation.GuestID.in_(to_remove)
+        record_invitation_changes(db, invitation_keys(db, *removed), DELETE)
+        db.query(Invitation).filter(*removed).delete(synchronize_session=False)
+        refresh_visibility(db, to_remove, [task_id])
+
+    now = datetime.utcnow()
+    added = sorted(to_add)
+    invitation_ids = insert_returning_ids(db, Invitation.__table__, [
+        {"CreatorID": creator_id, "GuestID": guest_id, "TaskID": task_id, "RecurringID": None, "Status": "Pendiente", "Date": now}
+        for guest_id in added
+    ])
+    record_invitation_changes(db, [(invitation_id, creator_id, guest_id) for invitation_id, guest_id in zip(invitation_ids, added)], INSERT)
+
+    touch_users(db, to_remove | to_add | {creator_id})
+    return {"Invitaciones_creadas": len(to_add), "Invitaciones_eliminadas": len(to_remove)}
+
+
+@job_handler("sync_task_guests")
+def run_sync_task_guests(db: Session, payload: dict):
+    return sync_task_guests(db, payload["TaskID"], payload["GuestIDs"])
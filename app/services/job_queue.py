@@ -0,0 +1,337 @@
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from itertools import count
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from sqlalchemy import and_, event, or_
+from sqlalchemy.orm import Session
+from app.database import SessionLocal, env_int
+from app.models.job import Job
+from app.services.serialization import json_default
+
+logger = logging.getLogger(__name__)
+
+JOB_BACKEND = os.getenv("JOB_BACKEND", "database")
+JOB_WORKERS = env_int("JOB_WORKERS", 2)
+JOB_QUEUE_SIZE = env_int("JOB_QUEUE_SIZE", 1000)
+JOB_MAX_ATTEMPTS = env_int("JOB_MAX_ATTEMPTS", 5)
+JOB_RETRY_BASE = env_int("JOB_RETRY_BASE", 2)
+JOB_RETRY_MAX = env_int("JOB_RETRY_MAX", 300)
+JOB_LEASE_SECONDS = env_int("JOB_LEASE_SECONDS", 300)
+JOB_POLL_INTERVAL = env_int("JOB_POLL_INTERVAL", 2)
+# Por encima de este número estimado de filas a escribir, el trabajo se encola en lugar de hacerse en la solicitud
+JOB_INLINE_ROWS = env_int("JOB_INLINE_ROWS", 200)
+
+PENDING, RUNNING, DONE, FAILED = "Pendiente", "En curso", "Completado", "Fallido"
+
+handlers = {}
+
+
+def job_handler(kind: str):
+    """Registra `fn(db, payload)` como ejecutor de los trabajos de tipo `kind`. No debe confirmar la transacción:
+    la cola marca el trabajo como completado en esa misma transacción y la confirma, de modo que un reintento
+    nunca repite escrituras ya confirmadas. Devuelve un resultado serializable; si lanza HTTPException el
+    trabajo falla sin reintentos."""
+    def register(fn):
+        handlers[kind] = fn
+        return fn
+    return register
+
+
+def backoff_seconds(attempts: int):
+    return min(JOB_RETRY_BASE * 2 ** (attempts - 1), JOB_RETRY_MAX)
+
+
+class DatabaseJobBackend:
+    """Cola durable sobre la tabla Job. Los workers reclaman trabajos con un UPDATE condicional y un plazo
+    de concesión, de modo que varios procesos comparten la cola y un trabajo abandonado vuelve a estar disponible.
+
+    Cada reclamo incrementa Attempts, que sirve de testigo: las actualizaciones de un worker exigen que
+    Attempts siga siendo el suyo, así que quien perdió la concesión no puede completar ni reprogramar el trabajo."""
+
+    def pending_count(self, db: Session):
+        return db.query(Job).filter(Job.Status.in_([PENDING, RUNNING])).count()
+
+    def enqueue(self, db: Session, kind: str, payload: dict, max_attempts: int):
+        now = datetime.utcnow()
+        job = Job(
+            Kind=kind, Payload=json.dumps(payload, default=json_default), Status=PENDING, Attempts=0,
+            MaxAttempts=max_attempts, RunAfter=now, CreatedAt=now, UpdatedAt=now
+        )
+        db.add(job)
+        db.flush()
+        return job.JobID
+
+    def publish(self, job_ids):
+        pass
+
+    def discard(self, job_ids):
+        pass
+
+    def claimable(self, now: datetime):
+        return or_(
+            and_(Job.Status == PENDING, Job.RunAfter <= now),
+            and_(Job.Status == RUNNING, Job.LeaseUntil < now)
+        )
+
+    def claim(self):
+        db = SessionLocal()
+        try:
+            now = datetime.utcnow()
+            candidates = db.query(Job.JobID).filter(self.claimable(now)).order_by(Job.RunAfter, Job.JobID).limit(5).all()
+            for (job_id,) in candidates:
+                claimed = db.query(Job).filter(Job.JobID == job_id, self.claimable(now)).update({
+                    Job.Status: RUNNING,
+                    Job.Attempts: Job.Attempts + 1,
+                    Job.LeaseUntil: now + timedelta(seconds=JOB_LEASE_SECONDS),
+                    Job.UpdatedAt: now
+                }, synchronize_session=False)
+                db.commit()
+                if claimed:
+                    return self.get(db, job_id)
+            return None
+        finally:
+            db.close()
+
+    def owned(self, job: dict):
+        return [Job.JobID == job["JobID"], Job.Status == RUNNING, Job.Attempts == job["Attempts"]]
+
+    def renew(self, job: dict):
+        db = SessionLocal()
+        try:
+            now = datetime.utcnow()
+            renewed = db.query(Job).filter(*self.owned(job)).update(
+                {Job.LeaseUntil: now + timedelta(seconds=JOB_LEASE_SECONDS), Job.UpdatedAt: now}, synchronize_session=False
+            )
+            db.commit()
+            return bool(renewed)
+        finally:
+            db.close()
+
+    def finish(self, db: Session, job: dict, values: dict):
+        return bool(db.query(Job).filter(*self.owned(job)).update(
+            {**values, Job.LeaseUntil: None, Job.UpdatedAt: datetime.utcnow()}, synchronize_session=False
+        ))
+
+    def complete(self, db: Session, job: dict, result):
+        """Marca el trabajo como completado dentro de la transacción del ejecutor, sin confirmarla.
+        Devuelve False si el worker ya no tiene la concesión."""
+        return self.finish(db, job, {Job.Status: DONE, Job.Result: json.dumps(result, default=json_default), Job.Error: None})
+
+    def finish_now(self, job: dict, values: dict):
+        db = SessionLocal()
+        try:
+            self.finish(db, job, values)
+            db.commit()
+        finally:
+            db.close()
+
+    def retry(self, job: dict, error: str, run_after: datetime):
+        self.finish_now(job, {Job.Status: PENDING, Job.RunAfter: run_after, Job.Error: error})
+
+    def fail(self, job: dict, error: str):
+        self.finish_now(job, {Job.Status: FAILED, Job.Error: error})
+
+    def get(self, db: Session, job_id: int):
+        job = db.query(Job).filter(Job.JobID == job_id).first()
+        if not job:
+            return None
+        return {
+            "JobID": job.JobID,
+            "Kind": job.Kind,
+            "Payload": json.loads(job.Payload),
+            "Status": job.Status,
+            "Attempts": job.Attempts,
+            "MaxAttempts": job.MaxAttempts,
+            "Result": json.loads(job.Result) if job.Result else None,
+            "Error": job.Error,
+            "CreatedAt": job.CreatedAt,
+            "UpdatedAt": job.UpdatedAt
+        }
+
+
+class InMemoryJobBackend:
+    """Cola en memoria del proceso, sin durabilidad. Los trabajos solo se vuelven visibles al confirmar
+    la transacción que los encoló."""
+
+    def __init__(self):
+        self.jobs = {}
+        self.staged = {}
+        self.ids = count(1)
+        self.lock = threading.Lock()
+
+    def pending_count(self, db: Session):
+        with self.lock:
+            return sum(job["Status"] in (PENDING, RUNNING) for job in self.jobs.values()) + len(self.staged)
+
+    def enqueue(self, db: Session, kind: str, payload: dict, max_attempts: int):
+        now = datetime.utcnow()
+        with self.lock:
+            job_id = next(self.ids)
+            self.staged[job_id] = {
+                "JobID": job_id, "Kind": kind, "Payload": json.loads(json.dumps(payload, default=json_default)),
+                "Status": PENDING, "Attempts": 0, "MaxAttempts": max_attempts, "RunAfter": now,
+                "Result": None, "Error": None, "CreatedAt": now, "UpdatedAt": now
+            }
+        return job_id
+
+    def publish(self, job_ids):
+        with self.lock:
+            for job_id in job_ids:
+                self.jobs[job_id] = self.staged.pop(job_id)
+
+    def discard(self, job_ids):
+        with self.lock:
+            for job_id in job_ids:
+                self.staged.pop(job_id, None)
+
+    def claim(self):
+        now = datetime.utcnow()
+        with self.lock:
+            for job in self.jobs.values():
+                if job["Status"] == PENDING and job["RunAfter"] <= now:
+                    job.update(Status=RUNNING, Attempts=job["Attempts"] + 1, UpdatedAt=now)
+                    return dict(job)
+        return None
+
+    def update(self, job_id: int, **values):
+        with self.lock:
+            self.jobs[job_id].update(values, UpdatedAt=datetime.utcnow())
+
+    def renew(self, job: dict):
+        return True
+
+    def complete(self, db: Session, job: dict, result):
+        # Sin concesiones que caduquen, nadie más puede reclamar el trabajo mientras se ejecuta
+        self.update(job["JobID"], Status=DONE, Result=json.loads(json.dumps(result, default=json_default)), Error=None)
+        return True
+
+    def retry(self, job: dict, error: str, run_after: datetime):
+        self.update(job["JobID"], Status=PENDING, RunAfter=run_after, Error=error)
+
+    def fail(self, job: dict, error: str):
+        self.update(job["JobID"], Status=FAILED, Error=error)
+
+    def get(self, db: Session, job_id: int):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return dict(job) if job else None
+
+
+class JobQueue:
+    """Cola acotada con un pool de hilos que ejecutan los trabajos con reintentos y espera exponencial."""
+
+    def __init__(self, backend, workers: int, max_size: int):
+        self.backend = backend
+        self.workers = workers
+        self.max_size = max_size
+        self.wakeup = threading.Event()
+        self.stopping = threading.Event()
+        self.threads = []
+
+    def submit(self, db: Session, kind: str, payload: dict, max_attempts: int = JOB_MAX_ATTEMPTS):
+        """Encola un trabajo dentro de la transacción de `db`; se publica y despierta a los workers al confirmar."""
+        if kind not in handlers:
+            raise ValueError(f"Tipo de trabajo desconocido: {kind}")
+        if self.backend.pending_count(db) >= self.max_size:
+            raise HTTPException(status_code=503, detail="La cola de trabajos está llena, inténtalo más tarde")
+
+        job_id = self.backend.enqueue(db, kind, payload, max_attempts)
+        db.info.setdefault("pending_jobs", []).append(job_id)
+        return job_id
+
+    def get(self, db: Session, job_id: int):
+        return self.backend.get(db, job_id)
+
+    def start(self):
+        self.stopping.clear()
+        for n in range(self.workers):
+            thread = threading.Thread(target=self.work, name=f"job-worker-{n}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def stop(self, timeout: float = 10):
+        self.stopping.set()
+        self.wakeup.set()
+        for thread in self.threads:
+            thread.join(timeout)
+        self.threads = []
+
+    def work(self):
+        while not self.stopping.is_set():
+            try:
+                job = self.backend.claim()
+            except Exception:
+                logger.exception("No se pudo reclamar un trabajo")
+                job = None
+            if job is None:
+                self.wakeup.wait(JOB_POLL_INTERVAL)
+                self.wakeup.clear()
+                continue
+            self.run(job)
+
+    def heartbeat(self, job: dict, done: threading.Event):
+        """Renueva la concesión mientras el trabajo se ejecuta, para que otro worker no lo reclame."""
+        while not done.wait(JOB_LEASE_SECONDS / 3):
+            try:
+                if not self.backend.renew(job):
+                    logger.warning("El trabajo %s perdió la concesión", job["JobID"])
+                    return
+            except Exception:
+                logger.exception("No se pudo renovar la concesión del trabajo %s", job["JobID"])
+
+    def run(self, job: dict):
+        db = SessionLocal()
+        done = threading.Event()
+        threading.Thread(target=self.heartbeat, args=(job, done), name=f"job-lease-{job['JobID']}", daemon=True).start()
+        try:
+            result = handlers[job["Kind"]](db, job["Payload"])
+            if not self.backend.complete(db, job, result):
+                # Otro worker reclamó el trabajo: sus escrituras se descartan para no aplicarlas dos veces
+                db.rollback()
+                logger.warning("Se descarta el trabajo %s (%s): la concesión pasó a otro worker", job["JobID"], job["Kind"])
+                return
+            db.commit()
+        except HTTPException as error:
+            db.rollback()
+            self.backend.fail(job, str(error.detail))
+        except Exception as error:
+            db.rollback()
+            logger.exception("Falló el trabajo %s (%s), intento %s", job["JobID"], job["Kind"], job["Attempts"])
+            if job["Attempts"] < job["MaxAttempts"]:
+                run_after = datetime.utcnow() + timedelta(seconds=backoff_seconds(job["Attempts"]))
+                self.backend.retry(job, repr(error), run_after)
+            else:
+                self.backend.fail(job, repr(error))
+        finally:
+            done.set()
+            db.close()
+
+
+def create_job_backend(name=JOB_BACKEND):
+    return InMemoryJobBackend() if name == "memory" else DatabaseJobBackend()
+
+
+job_queue = JobQueue(create_job_backend(), JOB_WORKERS, JOB_QUEUE_SIZE)
+
+
+def job_accepted(job_id: int, message: str, **extra):
+    return JSONResponse(status_code=202, content={"message": message, "JobID": job_id, **extra})
+
+
+@event.listens_for(Session, "after_commit")
+def publish_jobs(session):
+    job_ids = session.info.pop("pending_jobs", None)
+    if job_ids:
+        job_queue.backend.publish(job_ids)
+        job_queue.wakeup.set()
+
+
+@event.listens_for(Session, "after_rollback")
+def discard_jobs(session):
+    job_ids = session.info.pop("pending_jobs", None)
+    if job_ids:
+        job_queue.backend.discard(job_ids)
@@ -0,0 +1,197 @@
+import logging
+import os
+import threading
+import time
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from starlette.routing import compile_path
+
+logger = logging.getLogger(__name__)
+
+# Este módulo lo importa app.database, por eso lee su configuración directamente del entorno
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+SLOW_QUERY_MS = int(os.getenv("SLOW_QUERY_MS") or 500)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestStats:
+    __slots__ = ("route", "statements", "db_seconds", "rows", "pool_wait_seconds")
+
+    def __init__(self, route: str):
+        self.route = route
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.rows = 0
+        self.pool_wait_seconds = 0.0
+
+
+current_request = ContextVar("current_request", default=None)
+
+
+class RouteMetrics:
+    """Acumuladores por ruta, expuestos en formato de texto de Prometheus."""
+
+    def __init__(self):
+        self.routes = {}
+        self.lock = threading.Lock()
+
+    def record(self, stats: RequestStats, seconds: float):
+        with self.lock:
+            route = self.routes.get(stats.route)
+            if route is None:
+                route = self.routes[stats.route] = {
+                    "requests": 0, "seconds": 0.0, "buckets": [0] * len(LATENCY_BUCKETS),
+                    "statements": 0, "db_seconds": 0.0, "rows": 0, "pool_wait_seconds": 0.0
+                }
+            route["requests"] += 1
+            route["seconds"] += seconds
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    route["buckets"][i] += 1
+            route["statements"] += stats.statements
+            route["db_seconds"] += stats.db_seconds
+            route["rows"] += stats.rows
+            route["pool_wait_seconds"] += stats.pool_wait_seconds
+
+    def render(self):
+        with self.lock:
+            routes = {name: {**values, "buckets": list(values["buckets"])} for name, values in self.routes.items()}
+
+        lines = [
+            "# HELP http_request_duration_seconds Latencia de las solicitudes por ruta.",
+            "# TYPE http_request_duration_seconds histogram"
+        ]
+        for name, route in sorted(routes.items()):
+            label = f'route="{escape_label(name)}"'
+            for bound, count in zip(LATENCY_BUCKETS, route["buckets"]):
+                lines.append(f'http_request_duration_seconds_bucket{{{label},le="{bound}"}} {count}')
+            lines.append(f'http_request_duration_seconds_bucket{{{label},le="+Inf"}} {route["requests"]}')
+            lines.append(f"http_request_duration_seconds_sum{{{label}}} {route['seconds']}")
+            lines.append(f"http_request_duration_seconds_count{{{label}}} {route['requests']}")
+
+        for metric, key, description in (
+            ("db_statements_total", "statements", "Sentencias SQL ejecutadas por ruta."),
+            ("db_seconds_total", "db_seconds", "Tiempo total en la base de datos por ruta."),
+            ("db_rows_total", "rows", "Filas devueltas o afectadas por ruta."),
+            ("db_pool_wait_seconds_total", "pool_wait_seconds", "Espera para obtener una conexión del pool por ruta.")
+        ):
+            lines.append(f"# HELP {metric} {description}")
+            lines.append(f"# TYPE {metric} counter")
+            for name, route in sorted(routes.items()):
+                lines.append(f'{metric}{{route="{escape_label(name)}"}} {route[key]}')
+
+        return "\n".join(lines) + "\n"
+
+
+def escape_label(value: str):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+route_metrics = RouteMetrics()
+
+
+class RouteTable:
+    """Plantillas completas (con el prefijo con que se incluyó cada router) de las rutas de la aplicación,
+    para etiquetar una solicitud antes de atenderla sin depender de cómo resuelve FastAPI los routers incluidos."""
+
+    def __init__(self):
+        self.routes = []
+
+    def add_router(self, router, prefix: str = ""):
+        for route in router.routes:
+            path = getattr(route, "path", None)
+            if path is not None:
+                regex, _, _ = compile_path(prefix + path)
+                self.routes.append((regex, getattr(route, "methods", None), prefix + path))
+
+    def label(self, scope):
+        """Si solo coincide la ruta y no el método, se etiqueta con esa plantilla: la solicitud acabará en un 405."""
+        partial = None
+        for regex, methods, template in self.routes:
+            if regex.match(scope["path"]):
+                if methods is None or scope["method"] in methods:
+                    return f"{scope['method']} {template}"
+                partial = partial or template
+        return f"{scope['method']} {partial}" if partial else "unmatched"
+
+
+route_table = RouteTable()
+
+
+class MetricsMiddleware:
+    """Middleware ASGI que mide cada solicitud HTTP y la atribuye a la plantilla de su ruta. La ruta se resuelve
+    antes de atender la solicitud, para que los registros de consultas lentas ya la lleven."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(route_table.label(scope))
+        token = current_request.set(stats)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            route_metrics.record(stats, time.perf_counter() - started)
+            current_request.reset(token)
+
+
+def record_pool_wait(seconds: float):
+    stats = current_request.get()
+    if stats is not None:
+        stats.pool_wait_seconds += seconds
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool que atribuye a la solicitud en curso el tiempo de espera de cada checkout."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            record_pool_wait(time.perf_counter() - started)
+
+
+class TimedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            record_pool_wait(time.perf_counter() - started)
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_started = time.perf_counter()
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_metrics_started", None)
+    if started is None:
+        return
+    seconds = time.perf_counter() - started
+
+    stats = current_request.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_seconds += seconds
+        stats.rows += max(cursor.rowcount, 0)
+
+    if SLOW_QUERY_MS and seconds * 1000 >= SLOW_QUERY_MS:
+        logger.warning(
+            "Consulta lenta (%.1f ms) en %s: %s",
+            seconds * 1000, stats.route if stats is not None else "fuera de solicitud", " ".join(statement.split())[:2000]
+        )
+
+
+if METRICS_ENABLED:
+    event.listen(Engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", after_cursor_execute)
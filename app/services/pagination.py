@@ -0,0 +1,26 @@
+import base64
+import json
+from datetime import datetime
+from fastapi import HTTPException
+
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(*values):
+    """Codifica los valores de la última fila de una página en un cursor opaco."""
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def decode_cursor(cursor: str, *types):
+    """Decodifica un cursor generado por encode_cursor según los tipos indicados."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+        if len(payload) != len(types):
+            raise ValueError
+        return tuple(
+            datetime.fromisoformat(value) if value_type is datetime else value_type(value)
+            for value, value_type in zip(payload, types)
+        )
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
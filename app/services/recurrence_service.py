@@ -0,0 +1,235 @@
+from datetime import datetime, timedelta
+from itertools import count, islice
+import calendar as cal
+
+WEEKDAYS = {"Lu": 0, "Ma": 1, "Mi": 2, "Ju": 3, "Vi": 4, "Sa": 5, "Do": 6}
+NUMPY_THRESHOLD = 2000
+
+
+def parse_weekdays(day_name_frequency: str):
+    """Días de la semana (0 = lunes) de una regla como 'Lu,Mi'. Lanza ValueError si está vacía o no es válida."""
+    days = {day.strip() for day in (day_name_frequency or "").split(",")} - {""}
+    if not days:
+        raise ValueError("DayNameFrequency debe indicar al menos un día.")
+    invalid_days = days - WEEKDAYS.keys()
+    if invalid_days:
+        raise ValueError(f"DayNameFrequency contiene días inválidos: {', '.join(sorted(invalid_days))}. "
+                         f"Usa combinaciones de: {', '.join(WEEKDAYS)}.")
+    return sorted(WEEKDAYS[day] for day in days)
+
+
+def parse_month_days(day_frequency: str):
+    """Días del mes de una regla como '1,15,30'. Lanza ValueError si está vacía o algún día no está entre 1 y 31,
+    porque una regla sin días posibles nunca produciría ocurrencias."""
+    parts = [day.strip() for day in (day_frequency or "").split(",")]
+    if not any(parts) or not all(part.isdigit() for part in parts):
+        raise ValueError("DayFrequency debe ser una combinación de números separados por comas. Ej: '1,15,30'.")
+    days = sorted({int(part) for part in parts})
+    invalid_days = [str(day) for day in days if not 1 <= day <= 31]
+    if invalid_days:
+        raise ValueError(f"DayFrequency contiene valores inválidos: {', '.join(invalid_days)}. Deben estar entre 1 y 31.")
+    return days
+
+
+def next_month(year: int, month: int):
+    return (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def iter_weekday_dates(start_date: datetime, weekdays: list):
+    """Salta directamente a cada día de la semana pedido: desplazamientos fijos dentro de cada semana."""
+    offsets = sorted((weekday - start_date.weekday()) % 7 for weekday in weekdays)
+    for week in count():
+        for offset in offsets:
+            yield start_date + timedelta(days=7 * week + offset)
+
+
+def iter_month_day_dates(start_date: datetime, month_days: list):
+    """Recorre mes a mes los días pedidos; los que no existen en meses cortos (p. ej. 31 en abril) se omiten."""
+    month_days = [day for day in month_days if 1 <= day <= 31]
+    if not month_days:
+        return
+    year, month = start_date.year, start_date.month
+    first_day = start_date.day
+    while True:
+        month_length = cal.monthrange(year, month)[1]
+        for day in month_days:
+            if day > month_length:
+                break
+            if day >= first_day:
+                yield start_date.replace(year=year, month=month, day=day)
+        year, month = next_month(year, month)
+        first_day = 1
+
+
+def iter_monthly_dates(start_date: datetime):
+    # Igual que la regla original: al pasar por un mes corto el día queda recortado en los meses siguientes
+    current_date = start_date
+    while True:
+        yield current_date
+        year, month = next_month(current_date.year, current_date.month)
+        day = min(current_date.day, cal.monthrange(year, month)[1])
+        current_date = datetime(year, month, day, current_date.hour, current_date.minute)
+
+
+def iter_recurrence_dates(start_date: datetime, frequency=None, day_name_frequency=None, day_frequency=None):
+    """Genera indefinidamente las fechas de una recurrencia a partir de start_date (incluida si coincide)."""
+    if frequency == "diaria":
+        return (start_date + timedelta(days=i) for i in count())
+    if frequency == "semanal":
+        return (start_date + timedelta(weeks=i) for i in count())
+    if frequency == "mensual":
+        return iter_monthly_dates(start_date)
+    if day_name_frequency:
+        return iter_weekday_dates(start_date, parse_weekdays(day_name_frequency))
+    if day_frequency:
+        return iter_month_day_dates(start_date, parse_month_days(day_frequency))
+    return iter(())
+
+
+def generate_recurrence_dates(start_date: datetime, occurrences: int, frequency=None, day_name_frequency=None, day_frequency=None):
+    """Devuelve las primeras `occurrences` fechas de la regla; los lotes grandes usan NumPy si está disponible."""
+    if occurrences >= NUMPY_THRESHOLD and start_date.tzinfo is None:
+        try:
+            return generate_recurrence_dates_numpy(start_date, occurrences, frequency, day_name_frequency, day_frequency)
+        except ImportError:
+            pass
+    return list(islice(iter_recurrence_dates(start_date, frequency, day_name_frequency, day_frequency), occurrences))
+
+
+def generate_recurrence_dates_numpy(start_date: datetime, occurrences: int, frequency=None, day_name_frequency=None, day_frequency=None):
+    """Versión vectorizada con datetime64 de generate_recurrence_dates, con la misma semántica."""
+    import numpy as np
+
+    if occurrences <= 0 or not any([frequency, day_name_frequency, day_frequency]):
+        return []
+
+    start_day = np.datetime64(start_date.date(), "D")
+    time_of_day = np.timedelta64(start_date - datetime.combine(start_date.date(), datetime.min.time()), "us")
+    keep_first = False
+
+    if frequency in ("diaria", "semanal"):
+        step = 7 if frequency == "semanal" else 1
+        days = start_day + np.arange(occurrences) * step
+    elif frequency == "mensual":
+        months = np.datetime64(start_date.strftime("%Y-%m"), "M") + np.arange(occurrences)
+        month_lengths = ((months + 1).astype("datetime64[D]") - months.astype("datetime64[D]")).astype(int)
+        month_days = np.minimum.accumulate(np.minimum(month_lengths, start_date.day))
+        days = months.astype("datetime64[D]") + (month_days - 1)
+        # Tras la primera ocurrencia la regla mensual conserva solo hora y minuto
+        time_of_day = np.timedelta64(start_date.hour * 60 + start_date.minute, "m").astype("timedelta64[us]")
+        keep_first = True
+    elif day_name_frequency:
+        offsets = np.array(sorted((weekday - start_date.weekday()) % 7 for weekday in parse_weekdays(day_name_frequency)))
+        weeks = -(-occurrences // len(offsets))
+        days = (start_day + (np.arange(weeks)[:, None] * 7 + offsets[None, :]).ravel())[:occurrences]
+    elif day_frequency:
+        month_days = np.array(parse_month_days(day_frequency))
+        # Con días entre 1 y 31, cada año aporta al menos uno: el bucle termina
+        first_month = np.datetime64(start_date.strftime("%Y-%m"), "M")
+        months_needed = occurrences // len(month_days) + 2
+        while True:
+            months = first_month + np.arange(months_needed)
+            month_starts = months.astype("datetime64[D]")
+            month_lengths = ((months + 1).astype("datetime64[D]") - month_starts).astype(int)
+            candidates = month_starts[:, None] + (month_days[None, :] - 1)
+            valid = (month_days[None, :] <= month_lengths[:, None]) & (candidates >= start_day)
+            days = candidates[valid]
+            if len(days) >= occurrences:
+                days = days[:occurrences]
+                break
+            months_needed *= 2
+    else:
+        return []
+
+    dates = (days.astype("datetime64[us]") + time_of_day).tolist()
+    if keep_first:
+        dates[0] = start_date
+    return dates
+
+
+def iter_series_dates(recurring):
+    """Fechas de inicio de una serie almacenada solo como regla, respetando su número de ocurrencias.
+    Una regla guardada que no es válida no produce ocurrencias."""
+    try:
+        dates = iter_recurrence_dates(
+            recurring.StartTimestamp, recurring.Frequency, recurring.DayNameFrequency, recurring.DayFrequency
+        )
+    except ValueError:
+        return iter(())
+    if recurring.Occurrences is not None:
+        dates = islice(dates, recurring.Occurrences)
+    return dates
+
+
+def months_between(start_date: datetime, end_date: datetime):
+    return (end_date.year - start_date.year) * 12 + end_date.month - start_date.month
+
+
+def monthly_date_at(start_date: datetime, months: int):
+    """Fecha `months` meses después de start_date según iter_monthly_dates, sin recorrer los meses intermedios.
+    El día queda recortado por el mes más corto atravesado; en 48 meses siempre hay un febrero de 28 días."""
+    year, month = start_date.year, start_date.month
+    day = start_date.day
+    for _ in range(min(months, 48)):
+        year, month = next_month(year, month)
+        day = min(day, cal.monthrange(year, month)[1])
+    year, month = divmod(start_date.year * 12 + start_date.month - 1 + months, 12)
+    return datetime(year, month + 1, day, start_date.hour, start_date.minute)
+
+
+def series_dates_from(recurring, since: datetime):
+    """Como iter_series_dates, pero para las reglas de paso fijo salta aritméticamente hasta `since`: leer una ventana
+    no cuesta más por la antigüedad de la serie. Puede devolver alguna fecha anterior a `since`."""
+    start_date = recurring.StartTimestamp
+    if recurring.Frequency in ("diaria", "semanal") and since > start_date:
+        step = timedelta(days=1 if recurring.Frequency == "diaria" else 7)
+        skipped = (since - start_date) // step
+        dates = (start_date + step * i for i in count(skipped))
+    elif recurring.Frequency == "mensual" and months_between(start_date, since) > 0:
+        skipped = months_between(start_date, since)
+        dates = iter_monthly_dates(monthly_date_at(start_date, skipped))
+    else:
+        return iter_series_dates(recurring)
+
+    if recurring.Occurrences is not None:
+        dates = islice(dates, max(recurring.Occurrences - skipped, 0))
+    return dates
+
+
+def is_series_occurrence(recurring, occurrence_date: datetime):
+    for date in series_dates_from(recurring, occurrence_date):
+        if date >= occurrence_date:
+            return date == occurrence_date
+    return False
+
+
+def expand_occurrences(recurring, exceptions, window_start: datetime, window_end: datetime):
+    """Expande las ocurrencias de la serie que comienzan en [window_start, window_end), aplicando excepciones."""
+    duration = timedelta(minutes=recurring.MinutesDuration or 0)
+    exceptions_by_date = {exception.OccurrenceDate: exception for exception in exceptions}
+    occurrences = []
+
+    for date in series_dates_from(recurring, window_start):
+        if date >= window_end:
+            break
+        if date < window_start or date in exceptions_by_date:
+            continue
+        occurrences.append({
+            "OccurrenceDate": date,
+            "StartTimestamp": date,
+            "EndTimestamp": date + duration,
+            "Modified": False
+        })
+
+    for exception in exceptions:
+        if exception.Cancelled or not (window_start <= exception.NewStartTimestamp < window_end):
+            continue
+        occurrences.append({
+            "OccurrenceDate": exception.OccurrenceDate,
+            "StartTimestamp": exception.NewStartTimestamp,
+            "EndTimestamp": exception.NewEndTimestamp,
+            "Modified": True
+        })
+
+    occurrences.sort(key=lambda occurrence: occurrence["StartTimestamp"])
+    return occurrences
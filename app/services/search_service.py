@@ -0,0 +1,283 @@
+import asyncio
+import math
+import re
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+from sqlalchemy import event, func, or_
+from sqlalchemy.orm import Session
+from app.database import SessionLocal, async_engine, env_int
+from app.models.task import Task
+from app.models.recurring import Recurring
+from app.models.task_visibility import TaskVisibility
+from app.services.task_view_service import visible_tasks_filter
+
+PREFIX_EXPANSION_LIMIT = env_int("SEARCH_PREFIX_EXPANSION_LIMIT", 100)
+SEARCH_BUILD_BATCH = 2000
+TITLE_WEIGHT, SERIES_WEIGHT, DESCRIPTION_WEIGHT = 3.0, 2.0, 1.0
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """Términos en minúsculas y sin tildes, para que 'Reunión' y 'reunion' coincidan como en MySQL."""
+    if not text:
+        return []
+    text = unicodedata.normalize("NFKD", text.lower())
+    return TOKEN_PATTERN.findall("".join(char for char in text if not unicodedata.combining(char)))
+
+
+class SearchIndex:
+    """Índice invertido en memoria con expansión de prefijos sobre la lista ordenada de términos.
+
+    Los documentos son los textos distintos (Title, Description, título de la serie): todas las ocurrencias
+    de una serie comparten uno. Se construye al arrancar y se mantiene al día releyendo, antes de cada
+    búsqueda, las tareas y series marcadas como modificadas por las transacciones confirmadas.
+
+    La construcción y las puestas al día leen la base en un hilo de trabajo (refresh_async) y aplican los
+    cambios por lotes; el hilo del event loop solo toma `lock` durante una búsqueda o un lote."""
+
+    def __init__(self):
+        self.postings = {}
+        self.terms = []
+        self.doc_terms = {}
+        self.doc_tasks = {}
+        self.task_docs = {}
+        self.built = False
+        self.tracking = False
+        self.dirty_tasks = set()
+        self.dirty_series = set()
+        self.lock = threading.Lock()
+        self.dirty_lock = threading.Lock()
+        self.refresh_lock = threading.Lock()
+        self.refresh_guard = None
+
+    def add(self, task_id: int, title, description, series_title):
+        doc = (title or "", description or "", series_title or "")
+        if self.task_docs.get(task_id) == doc:
+            return
+        self.remove(task_id)
+        self.task_docs[task_id] = doc
+        tasks = self.doc_tasks.get(doc)
+        if tasks is not None:
+            tasks.add(task_id)
+            return
+
+        self.doc_tasks[doc] = {task_id}
+        fields = tuple(frozenset(tokenize(text)) for text in doc)
+        self.doc_terms[doc] = fields
+        for term in fields[0] | fields[1] | fields[2]:
+            docs = self.postings.get(term)
+            if docs is None:
+                docs = self.postings[term] = set()
+                insort(self.terms, term)
+            docs.add(doc)
+
+    def remove(self, task_id: int):
+        doc = self.task_docs.pop(task_id, None)
+        if doc is None:
+            return
+        tasks = self.doc_tasks[doc]
+        tasks.discard(task_id)
+        if tasks:
+            return
+
+        del self.doc_tasks[doc]
+        title_terms, description_terms, series_terms = self.doc_terms.pop(doc)
+        for term in title_terms | description_terms | series_terms:
+            docs = self.postings[term]
+            docs.discard(doc)
+            if not docs:
+                del self.postings[term]
+                del self.terms[bisect_left(self.terms, term)]
+
+    def expand_prefix(self, prefix: str):
+        """Términos que empiezan por `prefix`, los más frecuentes primero, hasta PREFIX_EXPANSION_LIMIT."""
+        start = bisect_left(self.terms, prefix)
+        end = bisect_left(self.terms, prefix + "\uffff")
+        terms = self.terms[start:end]
+        if len(terms) > PREFIX_EXPANSION_LIMIT:
+            terms = sorted(terms, key=lambda term: -len(self.postings[term]))[:PREFIX_EXPANSION_LIMIT]
+        return terms
+
+    def score(self, doc, term_groups):
+        total_docs = len(self.doc_tasks)
+        title_terms, description_terms, series_terms = self.doc_terms[doc]
+        score = 0.0
+        for group in term_groups:
+            best = 0.0
+            for term in group:
+                if term in title_terms:
+                    weight = TITLE_WEIGHT
+                elif term in series_terms:
+                    weight = SERIES_WEIGHT
+                elif term in description_terms:
+                    weight = DESCRIPTION_WEIGHT
+                else:
+                    continue
+                best = max(best, weight * math.log(1 + total_docs / len(self.postings[term])))
+            score += best
+        return score
+
+    def search(self, query: str, visible_task_ids: set, limit: int):
+        """TaskIDs visibles que contienen todos los términos de `query` (el último como prefijo), por relevancia."""
+        with self.lock:
+            return self.ranked_task_ids(query, visible_task_ids, limit)
+
+    def ranked_task_ids(self, query: str, visible_task_ids: set, limit: int):
+        query_terms = tokenize(query)
+        if not query_terms:
+            return []
+
+        term_groups = [[term] if term in self.postings else [] for term in query_terms[:-1]]
+        term_groups.append(self.expand_prefix(query_terms[-1]))
+        if not all(term_groups):
+            return []
+
+        doc_sets = sorted(
+            (set().union(*(self.postings[term] for term in group)) for group in term_groups), key=len
+        )
+        candidates = doc_sets[0].intersection(*doc_sets[1:])
+
+        ranked = []
+        for doc in candidates:
+            tasks = self.doc_tasks[doc]
+            visible = tasks & visible_task_ids if len(tasks) < len(visible_task_ids) else visible_task_ids & tasks
+            if visible:
+                score = self.score(doc, term_groups)
+                ranked.extend((-score, task_id) for task_id in visible)
+
+        ranked.sort()
+        return [task_id for _, task_id in ranked[:limit]]
+
+    def index_query(self, db: Session):
+        return db.query(Task.TaskID, Task.Title, Task.Description, Recurring.Title).outerjoin(
+            Recurring, Recurring.RecurringID == Task.RecurringID
+        )
+
+    def apply(self, rows, removed=()):
+        with self.lock:
+            for task_id, title, description, series_title in rows:
+                self.add(task_id, title, description, series_title)
+            for task_id in removed:
+                self.remove(task_id)
+
+    def stale(self):
+        return not self.built or bool(self.dirty_tasks or self.dirty_series)
+
+    def ensure_fresh(self, db: Session):
+        """Construye el índice o relee lo marcado como modificado. Hace E/S con la base: no debe llamarse
+        desde el hilo del event loop (ver refresh_async)."""
+        with self.refresh_lock:
+            with self.dirty_lock:
+                # Desde aquí se anotan las escrituras confirmadas, aunque la construcción no haya terminado
+                self.tracking = True
+                dirty_tasks, dirty_series = self.dirty_tasks, self.dirty_series
+                self.dirty_tasks, self.dirty_series = set(), set()
+
+            if not self.built:
+                batch = []
+                for row in self.index_query(db).yield_per(SEARCH_BUILD_BATCH):
+                    batch.append(row)
+                    if len(batch) >= SEARCH_BUILD_BATCH:
+                        self.apply(batch)
+                        batch = []
+                self.apply(batch)
+                self.built = True
+                return
+
+            if not dirty_tasks and not dirty_series:
+                return
+            conditions = []
+            if dirty_tasks:
+                conditions.append(Task.TaskID.in_(dirty_tasks))
+            if dirty_series:
+                conditions.append(Task.RecurringID.in_(dirty_series))
+            rows = self.index_query(db).filter(or_(*conditions)).all()
+            self.apply(rows, dirty_tasks - {row[0] for row in rows})
+
+    def refresh(self):
+        db = SessionLocal()
+        try:
+            self.ensure_fresh(db)
+        finally:
+            db.close()
+
+    async def refresh_async(self):
+        """Pone al día el índice en un hilo de trabajo. Las corrutinas que llegan mientras tanto esperan
+        a esa misma puesta al día en lugar de lanzar otra."""
+        if self.refresh_guard is None:
+            self.refresh_guard = asyncio.Lock()
+        async with self.refresh_guard:
+            if self.stale():
+                await asyncio.to_thread(self.refresh)
+
+    def mark_dirty(self, task_ids, recurring_ids):
+        with self.dirty_lock:
+            if self.tracking:
+                self.dirty_tasks.update(task_ids)
+                self.dirty_series.update(recurring_ids)
+
+
+search_index = SearchIndex()
+
+
+def mark_search_dirty(db: Session, task_ids=(), recurring_ids=()):
+    """Anota tareas o series cuyo texto cambió; el índice en memoria las relee tras confirmar la transacción."""
+    pending = db.info.setdefault("search_dirty", (set(), set()))
+    pending[0].update(task_ids)
+    pending[1].update(recurring_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def publish_search_dirty(session):
+    pending = session.info.pop("search_dirty", None)
+    if pending:
+        search_index.mark_dirty(*pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def discard_search_dirty(session):
+    session.info.pop("search_dirty", None)
+
+
+def fulltext_search(db: Session, user_id: int, query_terms: list, limit: int):
+    """Búsqueda con los índices FULLTEXT de MySQL en modo booleano: todos los términos, el último como prefijo."""
+    from sqlalchemy.dialects.mysql import match
+
+    against = " ".join([f"+{term}" for term in query_terms[:-1]] + [f"+{query_terms[-1]}*"])
+    task_score = match(Task.Title, Task.Description, against=against).in_boolean_mode()
+    series_score = match(Recurring.Title, against=against).in_boolean_mode()
+    score = task_score + func.coalesce(series_score, 0)
+
+    rows = db.query(Task.TaskID).outerjoin(
+        Recurring, Recurring.RecurringID == Task.RecurringID
+    ).filter(
+        visible_tasks_filter(user_id),
+        or_(task_score > 0, series_score > 0)
+    ).order_by(score.desc(), Task.TaskID).limit(limit).all()
+    return [task_id for (task_id,) in rows]
+
+
+def uses_fulltext(bind):
+    return bind.dialect.name == "mysql"
+
+
+async def fresh_search_index():
+    """Dependencia de las rutas de búsqueda: sin FULLTEXT, deja el índice en memoria al día antes de la ruta."""
+    if not uses_fulltext(async_engine):
+        await search_index.refresh_async()
+    return search_index
+
+
+def search_task_ids(db: Session, user_id: int, query: str, limit: int, index: SearchIndex = search_index):
+    """TaskIDs visibles para el usuario que coinciden con `query`, ordenados por relevancia. Sin FULLTEXT,
+    usa el índice en memoria tal como esté: quien llama debe haberlo puesto al día."""
+    query_terms = tokenize(query)
+    if not query_terms:
+        return []
+
+    if uses_fulltext(db.get_bind()):
+        return fulltext_search(db, user_id, query_terms, limit)
+
+    visible_task_ids = {task_id for (task_id,) in db.query(TaskVisibility.TaskID).filter(TaskVisibility.UserID == user_id)}
+    return index.search(query, visible_task_ids, limit)
@@ -0,0 +1,40 @@
+import json
+from datetime import date, datetime
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def dumps(value) -> bytes:
+    """Serializa a JSON compacto con orjson si está instalado; si no, con json de la biblioteca estándar."""
+    if orjson is not None:
+        return orjson.dumps(value, default=json_default)
+    return json.dumps(value, default=json_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def json_response(content=None, response: Response = None, body: bytes = None):
+    """Respuesta JSON para datos que el servidor ya armó con la forma del response_model.
+
+    Al devolver una Response, FastAPI no vuelve a validar ni a codificar el contenido. Acepta el cuerpo ya
+    serializado en `body` y copia las cabeceras fijadas en `response` (p. ej. el ETag)."""
+    result = FastJSONResponse(content) if body is None else Response(body, media_type="application/json")
+    if response is not None:
+        for name, value in response.headers.items():
+            if name != "content-length":
+                result.headers[name] = value
+    return result
@@ -0,0 +1,132 @@
+from datetime import timedelta
+from fastapi import HTTPException
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session, aliased
+from app.models.task import Task
+from app.models.calendar import Calendar
+from app.models.recurring import Recurring
+from app.models.recurring_exception import RecurringException
+from app.schemas.recurring import RecurringUpdateRequest, SCOPE_ALL, SCOPE_THIS, SCOPE_FOLLOWING
+from app.services.calendar_service import calendar_key, get_or_create_calendar_ids, mark_orphan_calendars
+
+
+def series_values(update_data: RecurringUpdateRequest):
+    values = {}
+    if update_data.Title:
+        values["Title"] = update_data.Title
+    if update_data.Description:
+        values["Description"] = update_data.Description
+    if update_data.Priority is not None:
+        values["Priority"] = update_data.Priority
+    return values
+
+
+def scoped_tasks_filter(recurring_id: int, scope: str, occurrence_date):
+    """Condiciones sobre Task para las ocurrencias materializadas que abarca el alcance de la edición."""
+    conditions = [Task.RecurringID == recurring_id]
+    if scope == SCOPE_THIS:
+        conditions.append(Task.StartTimestampID.in_(
+            select(Calendar.CalendarID).where(Calendar.Date == calendar_key(occurrence_date))
+        ))
+    elif scope == SCOPE_FOLLOWING:
+        conditions.append(Task.StartTimestampID.in_(
+            select(Calendar.CalendarID).where(Calendar.Date >= calendar_key(occurrence_date))
+        ))
+    return conditions
+
+
+def retime_tasks(db: Session, conditions: list, values: dict, shift: timedelta, minutes_duration):
+    """Desplaza y/o cambia la duración de las tareas: una lectura de sus fechas, una resolución de Calendar
+    en lote y un único UPDATE por clave primaria ejecutado con executemany. Los Calendar que dejan de usarse
+    se marcan como huérfanos en la misma transacción."""
+    start_calendar, end_calendar = aliased(Calendar), aliased(Calendar)
+    rows = db.query(
+        Task.TaskID, start_calendar.Date, end_calendar.Date, Task.StartTimestampID, Task.EndTimeStampID
+    ).join(
+        start_calendar, start_calendar.CalendarID == Task.StartTimestampID
+    ).join(
+        end_calendar, end_calendar.CalendarID == Task.EndTimeStampID
+    ).filter(*conditions).all()
+
+    new_times = {}
+    previous_calendar_ids = set()
+    for task_id, start_date, end_date, start_id, end_id in rows:
+        previous_calendar_ids.update((start_id, end_id))
+        new_start = start_date + shift
+        new_end = new_start + timedelta(minutes=minutes_duration) if minutes_duration is not None else end_date + shift
+        new_times[task_id] = (new_start, new_end)
+
+    calendar_ids = get_or_create_calendar_ids(db, [date for dates in new_times.values() for date in dates])
+    if minutes_duration is not None:
+        values = {**values, "MinutesDuration": minutes_duration}
+
+    params = [
+        {
+            "TaskID": task_id,
+            "StartTimestampID": calendar_ids[new_start],
+            "EndTimeStampID": calendar_ids[new_end],
+            **values
+        }
+        for task_id, (new_start, new_end) in new_times.items()
+    ]
+    if params:
+        db.execute(update(Task), params)
+        mark_orphan_calendars(db, previous_calendar_ids)
+    return len(params)
+
+
+def shift_exceptions(db: Session, recurring_id: int, shift: timedelta):
+    exceptions = db.query(RecurringException.ExceptionID, RecurringException.OccurrenceDate).filter(
+        RecurringException.RecurringID == recurring_id
+    ).order_by(
+        # Se actualiza empezando por el extremo hacia el que se desplaza para no chocar con uq_recurring_exception_occurrence
+        RecurringException.OccurrenceDate.desc() if shift > timedelta(0) else RecurringException.OccurrenceDate
+    ).all()
+    if exceptions:
+        db.execute(update(RecurringException), [
+            {"ExceptionID": exception_id, "OccurrenceDate": occurrence_date + shift}
+            for exception_id, occurrence_date in exceptions
+        ])
+
+
+def update_series(db: Session, recurring: Recurring, update_data: RecurringUpdateRequest):
+    """Aplica a la serie, a una ocurrencia o a esa y las siguientes los cambios de atributos y de horario
+    con sentencias UPDATE por conjuntos, sin cargar las tareas en la sesión. No confirma la transacción.
+
+    Devuelve el número de tareas materializadas actualizadas."""
+    scope = update_data.Scope
+    values = series_values(update_data)
+    shift = timedelta(minutes=update_data.ShiftMinutes or 0)
+    retimed = bool(shift) or update_data.MinutesDuration is not None
+
+    if recurring.ExpandOnRead and scope != SCOPE_ALL:
+        raise HTTPException(
+            status_code=400,
+            detail="Las series expandidas en lectura solo admiten Scope 'todas'; usa /recurring/exception para una ocurrencia"
+        )
+
+    if scope == SCOPE_ALL:
+        recurring_values = dict(values)
+        if shift and recurring.StartTimestamp is not None:
+            recurring_values["StartTimestamp"] = recurring.StartTimestamp + shift
+        if update_data.MinutesDuration is not None:
+            recurring_values["MinutesDuration"] = update_data.MinutesDuration
+        if recurring_values:
+            db.query(Recurring).filter(Recurring.RecurringID == recurring.RecurringID).update(
+                recurring_values, synchronize_session=False
+            )
+        if shift and recurring.ExpandOnRead:
+            shift_exceptions(db, recurring.RecurringID, shift)
+
+    conditions = scoped_tasks_filter(recurring.RecurringID, scope, update_data.OccurrenceDate)
+    if retimed:
+        updated = retime_tasks(db, conditions, values, shift, update_data.MinutesDuration)
+    elif values:
+        updated = db.query(Task).filter(*conditions).update(values, synchronize_session=False)
+    else:
+        updated = db.query(Task).filter(*conditions).count()
+
+    if scope != SCOPE_ALL and not updated:
+        raise HTTPException(status_code=404, detail="Ocurrencia no encontrada en la serie")
+
+    return updated
@@ -0,0 +1,123 @@
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+from app.models.task import Task
+from app.models.user import User
+from app.models.invitation import Invitation
+from app.models.recurring import Recurring
+from app.models.task_visibility import TaskVisibility
+
+
+def visible_tasks_filter(user_id: int):
+    """Condición sobre Task para las tareas creadas por el usuario o aceptadas como invitado, resuelta con
+    una búsqueda por clave primaria en TaskVisibility."""
+    return Task.TaskID.in_(select(TaskVisibility.TaskID).where(TaskVisibility.UserID == user_id))
+
+
+def task_audience(db: Session, task_ids=(), recurring_ids=()):
+    """Usuarios cuyas vistas pueden cambiar al modificar estas tareas o series: creadores e invitados."""
+    task_ids, recurring_ids = set(task_ids), set(recurring_ids)
+    if task_ids:
+        recurring_ids |= {
+            recurring_id for (recurring_id,) in db.query(Task.RecurringID).filter(
+                Task.TaskID.in_(task_ids), Task.RecurringID.isnot(None)
+            ).distinct()
+        }
+
+    creators, conditions = set(), []
+    if task_ids:
+        creators |= {user_id for (user_id,) in db.query(Task.CreatorID).filter(Task.TaskID.in_(task_ids)).distinct()}
+        conditions.append(Invitation.TaskID.in_(task_ids))
+    if recurring_ids:
+        creators |= {user_id for (user_id,) in db.query(Recurring.CreatorID).filter(Recurring.RecurringID.in_(recurring_ids))}
+        conditions.append(Invitation.RecurringID.in_(recurring_ids))
+        conditions.append(Invitation.TaskID.in_(select(Task.TaskID).where(Task.RecurringID.in_(recurring_ids))))
+
+    if not conditions:
+        return creators
+
+    guests = {user_id for (user_id,) in db.query(Invitation.GuestID).filter(or_(*conditions)).distinct()}
+    return creators | guests
+
+
+TASK_VIEW_COLUMNS = (
+    Task.TaskID, Task.CreatorID, Task.Title, Task.Description, Task.Priority,
+    Task.StartTimestampID, Task.EndTimeStampID, Task.RecurringStart
+)
+RECURRING_VIEW_COLUMNS = (
+    Recurring.RecurringID, Recurring.Title, Recurring.Description, Recurring.Priority,
+    Recurring.CreatorID, Recurring.Frequency, Recurring.DayNameFrequency, Recurring.DayFrequency
+)
+
+
+def recurring_to_dict(recurring):
+    if not recurring:
+        return None
+    return {column.key: getattr(recurring, column.key) for column in RECURRING_VIEW_COLUMNS}
+
+
+def task_to_dict(task: Task):
+    view = {column.key: getattr(task, column.key) for column in TASK_VIEW_COLUMNS}
+    view["Recurring"] = recurring_to_dict(task.recurring)
+    return view
+
+
+def row_to_view(row):
+    """Vista de una fila (columnas de Task seguidas de las de Recurring) sin pasar por objetos ORM."""
+    task_count = len(TASK_VIEW_COLUMNS)
+    view = {column.key: value for column, value in zip(TASK_VIEW_COLUMNS, row)}
+    view["Recurring"] = None if row[task_count] is None else {
+        column.key: value for column, value in zip(RECURRING_VIEW_COLUMNS, row[task_count:])
+    }
+    return view
+
+
+def attach_attendees(db: Session, views: list[dict]):
+    """Completa los asistentes de varias vistas con una consulta para creadores y otra para invitados aceptados."""
+    if not views:
+        return views
+
+    task_ids = [view["TaskID"] for view in views]
+    creator_ids = {view["CreatorID"] for view in views}
+
+    creators = {
+        user_id: username
+        for user_id, username in db.query(User.UserID, User.UserName).filter(User.UserID.in_(creator_ids)).all()
+    }
+
+    guests_by_task = {}
+    accepted_guests = db.query(Invitation.TaskID, User.UserID, User.UserName).join(
+        User, User.UserID == Invitation.GuestID
+    ).filter(
+        Invitation.TaskID.in_(task_ids),
+        Invitation.Status == "Aceptada"
+    ).order_by(Invitation.InvitationID).all()
+
+    for task_id, user_id, username in accepted_guests:
+        guests_by_task.setdefault(task_id, []).append({"UserID": user_id, "Username": username})
+
+    for view in views:
+        attendees = []
+        if view["CreatorID"] in creators:
+            attendees.append({"UserID": view["CreatorID"], "Username": creators[view["CreatorID"]]})
+        attendees += guests_by_task.get(view["TaskID"], [])
+        view["attendees"] = attendees
+
+    return views
+
+
+def build_task_views(db: Session, tasks: list[Task]):
+    """Arma las respuestas de varias tareas ya cargadas como objetos ORM."""
+    return attach_attendees(db, [task_to_dict(task) for task in tasks])
+
+
+def load_task_views(db: Session, *criteria, order_by=None, limit=None):
+    """Arma las respuestas de las tareas que cumplen `criteria` leyendo solo las columnas necesarias
+    como tuplas, sin materializar objetos ORM."""
+    query = db.query(*TASK_VIEW_COLUMNS, *RECURRING_VIEW_COLUMNS).outerjoin(
+        Recurring, Recurring.RecurringID == Task.RecurringID
+    ).filter(*criteria)
+    if order_by is not None:
+        query = query.order_by(order_by)
+    if limit is not None:
+        query = query.limit(limit)
+    return attach_attendees(db, [row_to_view(row) for row in query.all()])
@@ -0,0 +1,45 @@
+import hashlib
+from fastapi import Request, Response
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.models.user_version import UserVersion
+
+
+def touch_users(db: Session, user_ids):
+    """Incrementa, dentro de la transacción actual, la versión de lo que ven estos usuarios. Al confirmar
+    cambian sus ETags y las claves de sus vistas cacheadas."""
+    user_ids = sorted({user_id for user_id in user_ids if user_id is not None})
+    if not user_ids:
+        return
+
+    db.query(UserVersion).filter(UserVersion.UserID.in_(user_ids)).update(
+        {UserVersion.Version: UserVersion.Version + 1}, synchronize_session=False
+    )
+    db.execute(
+        insert(UserVersion.__table__).prefix_with("IGNORE", dialect="mysql").prefix_with("OR IGNORE", dialect="sqlite"),
+        [{"UserID": user_id, "Version": 1} for user_id in user_ids]
+    )
+
+
+def user_version(db: Session, user_id: int):
+    version = db.query(UserVersion.Version).filter(UserVersion.UserID == user_id).scalar()
+    return version or 0
+
+
+def conditional_get(db: Session, request: Request, response: Response, user_id: int, version: int = None):
+    """Calcula el ETag de la lectura a partir de la versión del usuario y la URL solicitada.
+
+    Si la ruta también cachea la vista, debe leer `version` una vez y usarla para el ETag y para la clave
+    de caché. Devuelve una respuesta 304 si coincide con If-None-Match; si no, añade el ETag a `response`
+    y devuelve None."""
+    if version is None:
+        version = user_version(db, user_id)
+    digest = hashlib.sha1(f"{request.url.path}?{request.url.query}".encode()).hexdigest()[:16]
+    etag = f'W/"{version}-{digest}"'
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
+    return None
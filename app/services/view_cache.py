@@ -0,0 +1,93 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from app.database import env_int
+from app.services.serialization import dumps
+
+VIEW_CACHE_SIZE = env_int("VIEW_CACHE_SIZE", 10000)
+VIEW_CACHE_TTL = env_int("VIEW_CACHE_TTL", 300)
+VIEW_CACHE_URL = os.getenv("VIEW_CACHE_URL")
+
+
+class InMemoryBackend:
+    """Subconjunto de la interfaz de Redis (get, set con `ex`, delete) con expiración y LRU acotado."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, name):
+        with self.lock:
+            entry = self.entries.get(name)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self.entries[name]
+                return None
+            self.entries.move_to_end(name)
+            return value
+
+    def set(self, name, value, ex=None):
+        if isinstance(value, str):
+            value = value.encode()
+        with self.lock:
+            self.entries[name] = (value, time.monotonic() + ex if ex else None)
+            self.entries.move_to_end(name)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+        return True
+
+    def delete(self, *names):
+        with self.lock:
+            return sum(self.entries.pop(name, None) is not None for name in names)
+
+
+def create_backend(url=VIEW_CACHE_URL):
+    if not url:
+        return InMemoryBackend(VIEW_CACHE_SIZE)
+    import redis
+    return redis.Redis.from_url(url)
+
+
+class TaskViewCache:
+    """Caché de vistas de tareas ya armadas, versionada por usuario.
+
+    Cada clave incluye la versión del usuario en la base (UserVersion), la misma que firma el ETag: cuando
+    cualquier proceso confirma una escritura que lo afecta, sus entradas anteriores quedan inalcanzables
+    y caducan por TTL o LRU."""
+
+    def __init__(self, backend, ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, user_id: int, version: int, name: str, build):
+        """Devuelve la vista como JSON ya codificado (bytes); solo se arma y serializa si no está en caché.
+
+        `version` debe leerse en la misma sesión que `build`, antes de armar la vista."""
+        key = f"view:{user_id}:{version}:{name}"
+        cached = self.backend.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        body = dumps(build())
+        self.backend.set(key, body, ex=self.ttl)
+        return body
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0
+        }
+
+
+view_cache = TaskViewCache(create_backend(), VIEW_CACHE_TTL)
+
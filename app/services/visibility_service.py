@@ -0,0 +1,85 @@
+"""Modelo de lectura (UserID, TaskID, Role) con las tareas que ve cada usuario: las que creó y las aceptadas
+como invitado, por tarea o por serie. Se mantiene en las mismas transacciones que las escrituras de origen.
+
+Reconstrucción completa desde Task e Invitation: python -m app.services.visibility_service
+"""
+from sqlalchemy import delete, insert, literal, or_, select
+from sqlalchemy.orm import Session
+from app.models.task import Task
+from app.models.invitation import Invitation
+from app.models.task_visibility import TaskVisibility
+
+CREATOR, GUEST = "Creador", "Invitado"
+
+
+def insert_ignore():
+    return insert(TaskVisibility.__table__).prefix_with("IGNORE", dialect="mysql").prefix_with("OR IGNORE", dialect="sqlite")
+
+
+def add_creator_rows(db: Session, pairs):
+    """Registra como visibles para su creador tareas recién insertadas: pares (CreatorID, TaskID)."""
+    rows = [{"UserID": user_id, "TaskID": task_id, "Role": CREATOR} for user_id, task_id in pairs]
+    if rows:
+        db.execute(insert_ignore(), rows)
+
+
+def scoped_task_ids(task_ids=None, recurring_ids=None):
+    conditions = []
+    if task_ids is not None:
+        conditions.append(Task.TaskID.in_(set(task_ids)))
+    if recurring_ids is not None:
+        conditions.append(Task.RecurringID.in_(set(recurring_ids)))
+    return select(Task.TaskID).where(or_(*conditions)) if conditions else None
+
+
+def refresh_visibility(db: Session, user_ids=None, task_ids=None, recurring_ids=None):
+    """Recalcula con sentencias por conjuntos las filas de los usuarios y tareas indicados (o de todas si no
+    se acota): borra las existentes y las vuelve a insertar desde Task e Invitation. No confirma la transacción."""
+    user_ids = set(user_ids) if user_ids is not None else None
+    tasks = scoped_task_ids(task_ids, recurring_ids)
+    if user_ids is not None and not user_ids:
+        return
+
+    def scoped(statement, user_column, task_column):
+        if user_ids is not None:
+            statement = statement.where(user_column.in_(user_ids))
+        if tasks is not None:
+            statement = statement.where(task_column.in_(tasks.scalar_subquery()))
+        return statement
+
+    db.execute(scoped(delete(TaskVisibility.__table__), TaskVisibility.UserID, TaskVisibility.TaskID))
+
+    # El creador se inserta primero: si además está invitado a su tarea, conserva el rol de creador
+    sources = (
+        select(Task.CreatorID, Task.TaskID, literal(CREATOR)),
+        select(Invitation.GuestID, Invitation.TaskID, literal(GUEST)).where(
+            Invitation.Status == "Aceptada", Invitation.TaskID.isnot(None)
+        ),
+        select(Invitation.GuestID, Task.TaskID, literal(GUEST)).join(
+            Task, Task.RecurringID == Invitation.RecurringID
+        ).where(Invitation.Status == "Aceptada")
+    )
+    user_columns = (Task.CreatorID, Invitation.GuestID, Invitation.GuestID)
+    task_columns = (Task.TaskID, Invitation.TaskID, Task.TaskID)
+    for source, user_column, task_column in zip(sources, user_columns, task_columns):
+        db.execute(insert_ignore().from_select(["UserID", "TaskID", "Role"], scoped(source, user_column, task_column)))
+
+
+def remove_tasks(db: Session, task_ids):
+    db.execute(delete(TaskVisibility.__table__).where(TaskVisibility.TaskID.in_(set(task_ids))))
+
+
+def rebuild_visibility(db: Session):
+    refresh_visibility(db)
+    db.commit()
+    return db.query(TaskVisibility).count()
+
+
+if __name__ == "__main__":
+    from app.database import SessionLocal
+
+    session = SessionLocal()
+    try:
+        print(f"TaskVisibility reconstruida: {rebuild_visibility(session)} filas")
+    finally:
+        session.close()
@@ -0,0 +1,102 @@
+"""Latencia p50/p99 de list_user_tasks bajo carga concurrente, con Session síncrona en el event loop
+(comportamiento anterior) y con la AsyncSession sobre aiosqlite.
+
+Uso: python -m benchmarks.bench_async_concurrency [solicitudes] [concurrencia]
+Requiere httpx y aiosqlite.
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+DB_FILE = os.path.join(tempfile.mkdtemp(), "bench.db")
+os.environ["DB_URL"] = f"sqlite:///{DB_FILE}"
+os.environ["DB_ASYNC_URL"] = f"sqlite+aiosqlite:///{DB_FILE}"
+
+import httpx
+from app.database import Base, engine, SessionLocal, get_async_read_db
+from app.main import app
+from app.models.user import User
+from app.schemas.task import TaskCreateRequest
+from app.services.bulk_write_service import bulk_create_tasks
+
+USERS = 50
+OCCURRENCES = 365
+
+
+class BlockingSession:
+    """Ejecuta la ruta con una Session síncrona directamente en el event loop, como antes del puerto."""
+
+    def __init__(self, session):
+        self.session = session
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return fn(self.session, *args, **kwargs)
+
+
+def get_blocking_db():
+    db = SessionLocal()
+    try:
+        yield BlockingSession(db)
+    finally:
+        db.close()
+
+
+def seed():
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    db.add_all([User(Email=f"user{i}@focusnet.test", Password="x", UserName=f"user{i}") for i in range(USERS)])
+    db.commit()
+    user_ids = [user_id for (user_id,) in db.query(User.UserID).all()]
+    bulk_create_tasks(db, [
+        TaskCreateRequest(
+            Title=f"Serie {user_id}", CreatorID=user_id, StartTimestamp=datetime(2025, 1, 1, 9, 0),
+            EndTimestamp=datetime(2025, 1, 1, 10, 0), RecurringStart=True, Frequency="diaria", Occurrences=OCCURRENCES
+        )
+        for user_id in user_ids
+    ])
+    db.close()
+    return user_ids
+
+
+async def load(user_ids, requests, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def call(n):
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(f"/task/list_user_tasks/{user_ids[n % len(user_ids)]}")
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(call(n) for n in range(requests)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return elapsed, latencies[len(latencies) // 2], latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+
+
+def report(label, result, requests):
+    elapsed, p50, p99 = result
+    print(f"{label:<9} {requests / elapsed:8.1f} req/s  p50 {p50 * 1000:8.1f} ms  p99 {p99 * 1000:8.1f} ms")
+
+
+def main():
+    args = [int(arg) for arg in sys.argv[1:3]]
+    requests, concurrency = args + [400, 32][len(args):]
+    user_ids = seed()
+
+    app.dependency_overrides[get_async_read_db] = get_blocking_db
+    report("bloqueante", asyncio.run(load(user_ids, requests, concurrency)), requests)
+
+    app.dependency_overrides.clear()
+    report("async", asyncio.run(load(user_ids, requests, concurrency)), requests)
+
+
+if __name__ == "__main__":
+    main()
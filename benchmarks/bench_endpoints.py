@@ -0,0 +1,175 @@
+"""Suite reproducible de benchmarks de endpoints sobre SQLite: siembra usuarios, series e invitaciones,
+recorre todos los routers de app/api con un cliente ASGI en proceso e informa por endpoint de latencias
+p50/p90/p99, solicitudes por segundo y sentencias SQL por solicitud.
+
+Uso: python -m benchmarks.bench_endpoints [--db RUTA|:memory:] [--users N] [--requests N] [--concurrency N]
+                                          [--output resultados.json] [--compare anteriores.json] [--only FILTRO]
+Requiere httpx y aiosqlite.
+"""
+import argparse
+import asyncio
+import random
+from datetime import datetime, timedelta
+from itertools import islice
+from benchmarks.harness import use_sqlite, StatementCounter, seed, run_scenario, save_results, compare_results
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", default=None, help="fichero SQLite o :memory: (por defecto, un fichero temporal)")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--guests", type=int, default=5, help="invitados por tarea y serie")
+    parser.add_argument("--occurrences", type=int, default=52)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", default=None)
+    parser.add_argument("--only", default=None, help="solo los escenarios cuyo nombre contiene este texto")
+    return parser.parse_args()
+
+
+def scenarios(ids, rng: random.Random):
+    """Escenarios por endpoint: nombre -> make_request(n) que devuelve (método, url, cuerpo)."""
+    from app.services.pagination import encode_cursor
+
+    users, tasks = ids["user_ids"], ids["task_ids"]
+    series, expanded = ids["recurring_ids"], ids["expand_ids"]
+    throwaway, throwaway_series = ids["throwaway_task_ids"], ids["throwaway_recurring_ids"]
+    occurrences, job_ids = ids["expand_occurrences"], ids["job_ids"]
+    window = "from=2025-01-01T00:00:00&to=2025-03-01T00:00:00"
+    pick = lambda values, n: values[n % len(values)]
+    day = lambda n: datetime(2026, 1, 1, 9, 0) + timedelta(days=n % 365, minutes=15 * (n % 20))
+
+    def free_slot(n):
+        guests = "&".join(f"user_id={user_id}" for user_id in rng.sample(users, min(10, len(users))))
+        return "GET", f"/freebusy/free_slot?{guests}&{window}&duration=60", None
+
+    def conflicts(n):
+        guests = "&".join(f"user_id={user_id}" for user_id in rng.sample(users, min(10, len(users))))
+        return "GET", f"/freebusy/conflicts?{guests}&{window}", None
+
+    def exception(n):
+        recurring_id, occurrence_date = pick(occurrences, n)
+        return "PUT", f"/recurring/recurring/exception/{recurring_id}", {
+            "OccurrenceDate": occurrence_date.isoformat(), "NewStartTimestamp": (occurrence_date + timedelta(hours=1)).isoformat(),
+            "NewEndTimestamp": (occurrence_date + timedelta(hours=2)).isoformat()
+        }
+
+    def bulk_create(n):
+        return "POST", "/task/bulk_create", [
+            {
+                "Title": f"Lote {n}-{i}", "CreatorID": pick(users, n), "StartTimestamp": day(n + i).isoformat(),
+                "EndTimestamp": (day(n + i) + timedelta(hours=1)).isoformat(), "GuestIDs": rng.sample(users, min(3, len(users)))
+            }
+            for i in range(10)
+        ]
+
+    return {
+        "calendar.export": lambda n: ("GET", "/calendar/export?Year=2025&Month=2", None),
+        "calendar.heatmap": lambda n: ("GET", f"/calendar/heatmap/{pick(users, n)}?{window}", None),
+        "calendar.heatmap_hourly": lambda n: ("GET", f"/calendar/heatmap/{pick(users, n)}?from=2025-01-01T00:00:00&to=2025-01-29T00:00:00&granularity=hora", None),
+        "changes.list": lambda n: ("GET", f"/changes/{pick(users, n)}?since={encode_cursor(0, 0)}&limit=100", None),
+        "freebusy.conflicts": conflicts,
+        "freebusy.free_slot": free_slot,
+        "invitations.list": lambda n: ("GET", f"/invitations/invitation/list/{pick(users, n)}", None),
+        "invitations.list_prop": lambda n: ("GET", f"/invitations/invitation/list_prop/{pick(users, n)}", None),
+        "invitations.counts": lambda n: ("GET", f"/invitations/invitation/counts/{pick(users, n)}", None),
+        "invitations.list_page": lambda n: ("GET", f"/invitations/invitation/list_page/{pick(users, n)}?status=Pendiente&limit=20", None),
+        "invitations.send_batch": lambda n: ("POST", "/invitations/invitation/send_batch", {
+            "CreatorID": pick(users, n), "TaskID": pick(tasks, n), "GuestIDs": rng.sample(users, min(20, len(users)))
+        }),
+        "invitations.respond_batch": lambda n: ("PUT", "/invitations/invitation/respond_batch", {
+            "GuestID": pick(users, n), "Status": "Aceptada", "CreatorID": pick(users, n + 1)
+        }),
+        "jobs.get": lambda n: ("GET", f"/jobs/{pick(job_ids, n)}", None),
+        "recurring.occurrences": lambda n: ("GET", f"/recurring/recurring/occurrences/{pick(expanded, n)}?{window}", None),
+        "recurring.user_occurrences": lambda n: ("GET", f"/recurring/recurring/occurrences/user/{pick(users, n)}?{window}", None),
+        "recurring.update": lambda n: ("PUT", f"/recurring/recurring/update/{pick(series, n)}", {"Title": f"Serie editada {n}"}),
+        "recurring.exception": exception,
+        "recurring.delete": lambda n: ("DELETE", f"/recurring/recurring/delete/{pick(throwaway_series, n)}", None),
+        "task.search_task": lambda n: ("GET", f"/task/search_task/?task_id={pick(tasks, n)}&user_id={pick(users, n // 10)}", None),
+        "task.search_tasks": lambda n: ("GET", f"/task/search_tasks/{pick(users, n)}?q=tarea {pick(users, n)}&limit=20", None),
+        "task.list_user_tasks": lambda n: ("GET", f"/task/list_user_tasks/{pick(users, n)}", None),
+        "task.list_user_tasks_page": lambda n: ("GET", f"/task/list_user_tasks_page/{pick(users, n)}?{window}&limit=50", None),
+        "task.create_task": lambda n: ("POST", "/task/task/create_task", {
+            "Title": f"Nueva {n}", "CreatorID": pick(users, n), "StartTimestamp": day(n).isoformat(),
+            "EndTimestamp": (day(n) + timedelta(hours=1)).isoformat(), "GuestIDs": rng.sample(users, min(3, len(users)))
+        }),
+        "task.update": lambda n: ("PUT", "/task/update", {
+            "TaskID": pick(tasks, n), "Title": f"Editada {n}", "RecurringStart": False,
+            "StartTimestamp": day(n).isoformat(), "EndTimestamp": (day(n) + timedelta(hours=2)).isoformat()
+        }),
+        "task.bulk_create": bulk_create,
+        "task.bulk_delete": lambda n: ("POST", "/task/bulk_delete", {"TaskIDs": [pick(throwaway, n)]})
+    }
+
+
+async def run(args, app, counter, ids):
+    import httpx
+    rng = random.Random(args.seed)
+    results = {}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for name, make_request in scenarios(ids, rng).items():
+            if args.only and args.only not in name:
+                continue
+            results[name] = await run_scenario(client, counter, make_request, args.requests, args.concurrency)
+            result = results[name]
+            print(f"{name:<34} {result['throughput_rps']:8.1f} req/s  p50 {result['p50_ms']:8.2f}  p90 {result['p90_ms']:8.2f}  "
+                  f"p99 {result['p99_ms']:8.2f} ms  {result['statements_per_request']:6.1f} sql/req  {result['errors']} errores")
+    return results
+
+
+def main():
+    args = parse_args()
+    use_sqlite(args.db)
+
+    from app.database import Base, engine, async_engine, SessionLocal
+    from app.main import app
+    from app.schemas.task import TaskCreateRequest
+    from app.models.recurring import Recurring
+    from app.services.bulk_write_service import bulk_create_tasks
+    from app.services.job_queue import job_queue
+    from app.services.recurrence_service import iter_series_dates
+
+    keepalive = engine.connect()
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    ids = seed(db, args.users, args.guests, args.occurrences, random.Random(args.seed))
+    begin = datetime(2027, 1, 1, 9, 0)
+    ids["throwaway_task_ids"] = [result["TaskID"] for result in bulk_create_tasks(db, [
+        TaskCreateRequest(Title="Desechable", CreatorID=ids["user_ids"][0], StartTimestamp=begin + timedelta(hours=n),
+                          EndTimestamp=begin + timedelta(hours=n, minutes=30))
+        for n in range(args.requests)
+    ])]
+    ids["throwaway_recurring_ids"] = [result["RecurringID"] for result in bulk_create_tasks(db, [
+        TaskCreateRequest(Title="Serie desechable", CreatorID=ids["user_ids"][0], StartTimestamp=begin + timedelta(days=n, hours=12),
+                          EndTimestamp=begin + timedelta(days=n, hours=12, minutes=30), RecurringStart=True, Frequency="semanal",
+                          Occurrences=args.occurrences, GuestIDs=ids["user_ids"][1:1 + args.guests])
+        for n in range(args.requests)
+    ])]
+    ids["expand_occurrences"] = [
+        (recurring.RecurringID, date)
+        for recurring in db.query(Recurring).filter(Recurring.RecurringID.in_(ids["expand_ids"]))
+        for date in islice(iter_series_dates(recurring), 10)
+    ]
+    # Trabajos que quedan pendientes: el cliente ASGI no arranca el ciclo de vida de la app ni sus workers
+    ids["job_ids"] = [
+        job_queue.submit(db, "sync_task_guests", {"TaskID": task_id, "GuestIDs": []}) for task_id in ids["task_ids"][:50]
+    ]
+    db.commit()
+    db.close()
+
+    counter = StatementCounter([engine, async_engine.sync_engine])
+    results = asyncio.run(run(args, app, counter, ids))
+
+    params = {key: value for key, value in vars(args).items() if key not in ("output", "compare", "only")}
+    save_results(args.output, params, results)
+    print(f"\nresultados guardados en {args.output}")
+    if args.compare:
+        compare_results(args.compare, results)
+    keepalive.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Benchmark del motor de disponibilidad: índice de intervalos frente a la intersección que hacían
+los clientes, y construcción del índice desde una base SQLite con miles de usuarios y tareas.
+
+Uso: python -m benchmarks.bench_freebusy [usuarios] [tareas_por_usuario] [usuarios_consultados]
+"""
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+for key, value in {"DB_USER": "bench", "DB_PASSWORD": "bench", "DB_HOST": "localhost", "DB_PORT": "3306", "DB_NAME": "bench"}.items():
+    os.environ.setdefault(key, value)
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.models.user import User
+from app.schemas.task import TaskCreateRequest
+from app.services.bulk_write_service import bulk_create_tasks
+from app.services.freebusy_service import BusyIndex, build_busy_index
+
+WINDOW_START = datetime(2025, 1, 1)
+WINDOW_END = WINDOW_START + timedelta(days=30)
+DURATION = timedelta(minutes=90)
+
+
+def random_intervals(rng, count):
+    intervals = []
+    for _ in range(count):
+        # Tareas de 30 a 120 minutos alineadas a cuartos de hora, en horario de 8 a 20
+        start = WINDOW_START + timedelta(days=rng.randrange(30), hours=rng.randrange(8, 20), minutes=15 * rng.randrange(4))
+        intervals.append((start, start + timedelta(minutes=30 * rng.randint(1, 4))))
+    return intervals
+
+
+def naive_free_slot(intervals_by_user, user_ids, step=timedelta(minutes=15)):
+    """Lo que hacía el cliente: probar cada hueco candidato contra todos los intervalos de todos los invitados."""
+    candidate = WINDOW_START
+    while candidate + DURATION <= WINDOW_END:
+        if all(not (start < candidate + DURATION and end > candidate)
+               for user_id in user_ids for start, end in intervals_by_user[user_id]):
+            return candidate, candidate + DURATION
+        candidate += step
+    return None
+
+
+def bench_algorithm(users, tasks_per_user, queried):
+    rng = random.Random(7)
+    intervals_by_user = {user_id: random_intervals(rng, tasks_per_user) for user_id in range(users)}
+    user_ids = rng.sample(range(users), queried)
+
+    started = time.perf_counter()
+    expected = naive_free_slot(intervals_by_user, user_ids)
+    naive_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    index = BusyIndex({user_id: intervals_by_user[user_id] for user_id in user_ids})
+    slot = index.first_free_slot(user_ids, WINDOW_START, WINDOW_END, DURATION)
+    conflicts = sum(len(index.conflicts(user_id, WINDOW_START, WINDOW_END)) for user_id in user_ids)
+    index_elapsed = time.perf_counter() - started
+
+    assert slot == expected, (slot, expected)
+    print(f"algoritmo  {queried} usuarios x {tasks_per_user} tareas  ingenuo {naive_elapsed * 1000:9.1f} ms  "
+          f"índice {index_elapsed * 1000:7.1f} ms  ({conflicts} intervalos fusionados)")
+
+
+def bench_database(users, tasks_per_user, queried):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine, autoflush=False)()
+    db.add_all([User(Email=f"user{i}@focusnet.test", Password="x", UserName=f"user{i}") for i in range(users)])
+    db.commit()
+    user_ids = [user_id for (user_id,) in db.query(User.UserID).order_by(User.UserID).all()]
+
+    rng = random.Random(7)
+    payloads = [
+        TaskCreateRequest(Title="Bench", CreatorID=user_id, StartTimestamp=start, EndTimestamp=end)
+        for user_id in user_ids for start, end in random_intervals(rng, tasks_per_user)
+    ]
+    started = time.perf_counter()
+    for i in range(0, len(payloads), 5000):
+        bulk_create_tasks(db, payloads[i:i + 5000])
+    print(f"carga      {len(payloads)} tareas en {time.perf_counter() - started:.1f} s")
+
+    queried_ids = rng.sample(user_ids, queried)
+    started = time.perf_counter()
+    index = build_busy_index(db, queried_ids, WINDOW_START, WINDOW_END)
+    built = time.perf_counter() - started
+    slot = index.first_free_slot(queried_ids, WINDOW_START, WINDOW_END, DURATION)
+    total = time.perf_counter() - started
+    print(f"base       {queried} usuarios  índice {built * 1000:7.1f} ms  hueco {slot}  total {total * 1000:7.1f} ms")
+    db.close()
+
+
+def main():
+    args = [int(arg) for arg in sys.argv[1:4]]
+    users, tasks_per_user, queried = args + [2000, 50, 50][len(args):]
+    bench_algorithm(users, tasks_per_user, queried)
+    bench_database(users, tasks_per_user, queried)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Compara sentencias y tiempo al invitar a N usuarios a una tarea: una llamada a send_invitation por
+invitado (camino anterior) frente a una sola llamada a send_invitations.
+
+Uso: python -m benchmarks.bench_invitation_fanout [invitados...]
+"""
+import os
+import sys
+import time
+from datetime import datetime
+
+for key, value in {"DB_USER": "bench", "DB_PASSWORD": "bench", "DB_HOST": "localhost", "DB_PORT": "3306", "DB_NAME": "bench"}.items():
+    os.environ.setdefault(key, value)
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.models.task import Task
+from app.models.recurring import Recurring
+from app.models.user import User
+from app.models.invitation import Invitation
+from app.schemas.task import TaskCreateRequest
+from app.services.bulk_write_service import bulk_create_tasks
+from app.services.invitation_service import send_invitations
+from app.services.user_version_service import touch_users
+
+
+def legacy_send_invitation(db, creator_id, guest_id, task_id):
+    """Reproduce send_invitation: cuatro comprobaciones de existencia y un commit por invitado."""
+    db.query(User).filter(User.UserID == creator_id).first()
+    db.query(User).filter(User.UserID == guest_id).first()
+    db.query(Task).filter(Task.TaskID == task_id).first()
+    db.query(Recurring).filter(Recurring.RecurringID == None).first()
+    invitation = Invitation(CreatorID=creator_id, GuestID=guest_id, TaskID=task_id, Status="Pendiente", Date=datetime.utcnow())
+    db.add(invitation)
+    touch_users(db, [creator_id, guest_id])
+    db.commit()
+    db.refresh(invitation)
+
+
+def new_session(guests):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(1))
+    db = sessionmaker(bind=engine, autoflush=False)()
+    db.add_all([User(Email=f"user{i}@focusnet.test", Password="x", UserName=f"user{i}") for i in range(guests + 1)])
+    db.commit()
+    user_ids = [user_id for (user_id,) in db.query(User.UserID).order_by(User.UserID).all()]
+    task_id = bulk_create_tasks(db, [TaskCreateRequest(
+        Title="Bench", CreatorID=user_ids[0], StartTimestamp=datetime(2025, 1, 1, 9, 0), EndTimestamp=datetime(2025, 1, 1, 10, 0)
+    )])[0]["TaskID"]
+    statements.clear()
+    return db, statements, user_ids, task_id
+
+
+def run(label, send, guests):
+    db, statements, user_ids, task_id = new_session(guests)
+    started = time.perf_counter()
+    send(db, user_ids[0], user_ids[1:], task_id)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<8} {guests:>6} invitados  {len(statements):>6} sentencias  {elapsed * 1000:9.1f} ms")
+    db.close()
+
+
+def main():
+    for guests in [int(arg) for arg in sys.argv[1:]] or [10, 50, 200, 500]:
+        run("legacy", lambda db, creator_id, guest_ids, task_id: [
+            legacy_send_invitation(db, creator_id, guest_id, task_id) for guest_id in guest_ids
+        ], guests)
+        run("batch", lambda db, creator_id, guest_ids, task_id: send_invitations(db, creator_id, guest_ids, task_id), guests)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Microbenchmark del motor de recurrencias frente al recorrido día a día original.
+
+Uso: python -m benchmarks.bench_recurrence [ocurrencias]
+"""
+import sys
+import timeit
+from datetime import datetime, timedelta
+from itertools import islice
+from app.services.recurrence_service import WEEKDAYS, iter_recurrence_dates, generate_recurrence_dates_numpy
+
+START = datetime(2025, 1, 1, 9, 0)
+RULES = {
+    "DayFrequency=31": (None, None, "31"),
+    "DayFrequency=1,15": (None, None, "1,15"),
+    "DayNameFrequency=Lu,Mi,Vi": (None, "Lu,Mi,Vi", None),
+    "Frequency=mensual": ("mensual", None, None),
+}
+
+
+def legacy_scan(start_date, occurrences, day_name_frequency=None, day_frequency=None):
+    """Recorrido día a día de la versión anterior de generate_recurrence_dates."""
+    if day_name_frequency:
+        target_days = {WEEKDAYS[day.strip()] for day in day_name_frequency.split(",")}
+        matches = lambda date: date.weekday() in target_days
+    else:
+        target_days = {int(day.strip()) for day in day_frequency.split(",")}
+        matches = lambda date: date.day in target_days
+    dates, current_date = [], start_date
+    while len(dates) < occurrences:
+        if matches(current_date):
+            dates.append(current_date)
+        current_date += timedelta(days=1)
+    return dates
+
+
+def best_of(fn, repeat=5):
+    return min(timeit.repeat(fn, number=1, repeat=repeat))
+
+
+def main():
+    occurrences = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    try:
+        import numpy  # noqa: F401
+        has_numpy = True
+    except ImportError:
+        has_numpy = False
+
+    print(f"{'regla':<28} {'escaneo':>10} {'aritmético':>11} {'numpy':>10}   ({occurrences} ocurrencias, ms)")
+    for label, (frequency, day_names, days) in RULES.items():
+        arithmetic = best_of(lambda: list(islice(iter_recurrence_dates(START, frequency, day_names, days), occurrences)))
+        legacy = best_of(lambda: legacy_scan(START, occurrences, day_names, days)) if not frequency else None
+        vectorized = best_of(lambda: generate_recurrence_dates_numpy(START, occurrences, frequency, day_names, days)) if has_numpy else None
+        print(
+            f"{label:<28} "
+            f"{legacy * 1000 if legacy is not None else float('nan'):>10.2f} "
+            f"{arithmetic * 1000:>11.2f} "
+            f"{vectorized * 1000 if vectorized is not None else float('nan'):>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Compara filas/segundo al crear series recurrentes con el camino ORM anterior y el pipeline por lotes.
+
+Uso: python -m benchmarks.bench_recurring_create [series] [ocurrencias] [invitados]
+"""
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+for key, value in {"DB_USER": "bench", "DB_PASSWORD": "bench", "DB_HOST": "localhost", "DB_PORT": "3306", "DB_NAME": "bench"}.items():
+    os.environ.setdefault(key, value)
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.models.task import Task
+from app.models.calendar import Calendar
+from app.models.recurring import Recurring
+from app.models.user import User
+from app.models.invitation import Invitation
+from app.schemas.task import TaskCreateRequest
+from app.services.bulk_write_service import bulk_create_tasks
+from app.services.recurrence_service import generate_recurrence_dates
+
+
+def legacy_create_recurring(db, task_data: TaskCreateRequest):
+    """Reproduce la rama recurrente original de create_task (objetos ORM, flush y dos commits)."""
+    def create_calendar_entry(date: datetime):
+        return Calendar(Date=date, Year=date.year, Month=date.month, Day=date.day,
+                        DayName=date.strftime('%A'), Hour=date.hour, Minute=date.minute)
+
+    duration_minutes = int((task_data.EndTimestamp - task_data.StartTimestamp).total_seconds() / 60)
+    new_recurring = Recurring(Title=task_data.Title, Description=task_data.Description, Priority=task_data.Priority,
+                              CreatorID=task_data.CreatorID, Frequency=task_data.Frequency)
+    db.add(new_recurring)
+    db.flush()
+
+    calendars = []
+    for date in generate_recurrence_dates(task_data.StartTimestamp, task_data.Occurrences, task_data.Frequency):
+        calendars.extend([create_calendar_entry(date), create_calendar_entry(date + (task_data.EndTimestamp - task_data.StartTimestamp))])
+    db.add_all(calendars)
+    db.flush()
+
+    calendar_ids = [calendar.CalendarID for calendar in calendars]
+    db.add_all([
+        Task(CreatorID=task_data.CreatorID, Title=task_data.Title, StartTimestampID=calendar_ids[i],
+             EndTimeStampID=calendar_ids[i + 1], MinutesDuration=duration_minutes, RecurringStart=True,
+             RecurringID=new_recurring.RecurringID, CreationDate=datetime.utcnow())
+        for i in range(0, len(calendar_ids), 2)
+    ])
+    db.commit()
+
+    db.add_all([
+        Invitation(CreatorID=task_data.CreatorID, GuestID=guest_id, RecurringID=new_recurring.RecurringID,
+                   Status="Pendiente", Date=datetime.utcnow())
+        for guest_id in task_data.GuestIDs
+    ])
+    db.commit()
+
+
+def new_session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    return Session()
+
+
+def seed_users(db, count):
+    db.add_all([User(Email=f"user{i}@focusnet.test", Password="x", UserName=f"user{i}") for i in range(count)])
+    db.commit()
+    return [user_id for (user_id,) in db.query(User.UserID).order_by(User.UserID).all()]
+
+
+def run(label, create, series, occurrences, guests):
+    db = new_session()
+    user_ids = seed_users(db, guests + 1)
+    # Cada serie ocupa días distintos: Calendar.Date es único y el camino anterior no reutiliza filas
+    payloads = [
+        TaskCreateRequest(
+            Title="Bench", CreatorID=user_ids[0], StartTimestamp=datetime(2025, 1, 1, 9, 0) + timedelta(days=n * occurrences),
+            EndTimestamp=datetime(2025, 1, 1, 10, 0) + timedelta(days=n * occurrences), RecurringStart=True,
+            Frequency="diaria", Occurrences=occurrences, GuestIDs=user_ids[1:]
+        )
+        for n in range(series)
+    ]
+
+    started = time.perf_counter()
+    for payload in payloads:
+        create(db, payload)
+    elapsed = time.perf_counter() - started
+
+    rows = series * (1 + occurrences * 3 + guests)
+    print(f"{label:<8} {rows:>9} filas  {elapsed:8.3f} s  {rows / elapsed:12.0f} filas/s")
+    db.close()
+
+
+def main():
+    args = [int(arg) for arg in sys.argv[1:4]]
+    series, occurrences, guests = args + [20, 365, 10][len(args):]
+    run("legacy", legacy_create_recurring, series, occurrences, guests)
+    run("bulk", lambda db, payload: bulk_create_tasks(db, [payload]), series, occurrences, guests)
+
+
+if __name__ == "__main__":
+    main()
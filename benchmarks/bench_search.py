@@ -0,0 +1,156 @@
+"""Benchmark de la búsqueda de tareas: índice invertido en memoria frente a recorrer todos los textos
+(lo que haría un LIKE '%q%' sin índice), a escala de un millón de tareas, y búsqueda completa desde una
+base SQLite con la tabla de visibilidad poblada.
+
+En MySQL la búsqueda usa los índices FULLTEXT; para medirla allí, ejecutar bench_endpoints contra esa base.
+
+Uso: python -m benchmarks.bench_search [tareas] [tareas_por_serie] [tareas_visibles] [consultas]
+"""
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+for key, value in {"DB_USER": "bench", "DB_PASSWORD": "bench", "DB_HOST": "localhost", "DB_PORT": "3306", "DB_NAME": "bench"}.items():
+    os.environ.setdefault(key, value)
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.models.user import User
+from app.schemas.task import TaskCreateRequest
+from app.services.bulk_write_service import bulk_create_tasks
+from app.services.search_service import SearchIndex, search_index, search_task_ids, tokenize
+
+SYLLABLES = ["ra", "me", "ti", "so", "lu", "na", "pe", "co", "ve", "da", "mi", "ca", "to", "re", "al", "en", "por", "ción"]
+
+
+def vocabulary(rng, size):
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def random_documents(rng, tasks, series_length):
+    """Textos por tarea; las tareas de una misma serie comparten título y descripción."""
+    words = vocabulary(rng, 50000)
+    # Distribución sesgada: pocas palabras muy frecuentes y una cola larga, como en títulos reales
+    weights = [1 / (rank + 1) for rank in range(len(words))]
+    documents = []
+    while len(documents) < tasks:
+        title = " ".join(rng.choices(words, weights, k=rng.randint(2, 5))).capitalize()
+        description = " ".join(rng.choices(words, weights, k=rng.randint(5, 15)))
+        series_title = title if series_length > 1 else None
+        documents.extend([(title, description, series_title)] * min(series_length, tasks - len(documents)))
+    return documents, words
+
+
+def random_queries(rng, documents, count):
+    """Consultas tomadas de títulos existentes: una palabra completa y el prefijo de la siguiente."""
+    queries = []
+    for _ in range(count):
+        terms = tokenize(rng.choice(documents)[0])
+        last = terms[min(1, len(terms) - 1)]
+        queries.append(" ".join(terms[:1] + [last[:rng.randint(1, len(last))]]) if len(terms) > 1 else last[:3])
+    return queries
+
+
+def naive_search(documents, query, visible_task_ids, limit):
+    query_terms = tokenize(query)
+    matches = []
+    for task_id in visible_task_ids:
+        text = tokenize(" ".join(filter(None, documents[task_id])))
+        if all(term in text for term in query_terms[:-1]) and any(term.startswith(query_terms[-1]) for term in text):
+            matches.append(task_id)
+    return matches[:limit]
+
+
+def percentiles(latencies):
+    latencies = sorted(latencies)
+    return latencies[len(latencies) // 2] * 1000, latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+
+
+def bench_algorithm(tasks, series_length, visible, queries):
+    rng = random.Random(7)
+    documents, _ = random_documents(rng, tasks, series_length)
+    visible_task_ids = set(rng.sample(range(tasks), visible))
+
+    index = SearchIndex()
+    started = time.perf_counter()
+    for task_id, (title, description, series_title) in enumerate(documents):
+        index.add(task_id, title, description, series_title)
+    built = time.perf_counter() - started
+    print(f"índice     {tasks} tareas  {len(index.doc_tasks)} textos  {len(index.terms)} términos  construido en {built:.1f} s")
+
+    query_list = random_queries(rng, documents, queries)
+    latencies, found = [], 0
+    for query in query_list:
+        started = time.perf_counter()
+        found += len(index.search(query, visible_task_ids, 20))
+        latencies.append(time.perf_counter() - started)
+    p50, p99 = percentiles(latencies)
+    print(f"índice     {queries} consultas  p50 {p50:7.2f} ms  p99 {p99:7.2f} ms  ({found} resultados)")
+
+    latencies = []
+    for query in query_list[:max(1, queries // 10)]:
+        started = time.perf_counter()
+        naive_search(documents, query, visible_task_ids, 20)
+        latencies.append(time.perf_counter() - started)
+    p50, p99 = percentiles(latencies)
+    print(f"recorrido  {len(latencies)} consultas  p50 {p50:7.2f} ms  p99 {p99:7.2f} ms  (solo {visible} tareas visibles)")
+
+    started = time.perf_counter()
+    for task_id in rng.sample(range(tasks), 1000):
+        index.add(task_id, *rng.choice(documents))
+    print(f"escritura  1000 reindexaciones en {(time.perf_counter() - started) * 1000:.1f} ms")
+
+
+def bench_database(tasks, series_length, visible, queries):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine, autoflush=False)()
+    users = max(1, tasks // visible)
+    db.add_all([User(Email=f"user{i}@focusnet.test", Password="x", UserName=f"user{i}") for i in range(users)])
+    db.commit()
+    user_ids = [user_id for (user_id,) in db.query(User.UserID).order_by(User.UserID).all()]
+
+    rng = random.Random(7)
+    documents, _ = random_documents(rng, tasks, 1)
+    start = datetime(2025, 1, 1, 9, 0)
+    payloads = [
+        TaskCreateRequest(
+            Title=title, Description=description, CreatorID=user_ids[i % users],
+            StartTimestamp=start + timedelta(hours=i % 2000), EndTimestamp=start + timedelta(hours=i % 2000, minutes=30)
+        )
+        for i, (title, description, _) in enumerate(documents)
+    ]
+    started = time.perf_counter()
+    for i in range(0, len(payloads), 5000):
+        bulk_create_tasks(db, payloads[i:i + 5000])
+    print(f"carga      {len(payloads)} tareas en {time.perf_counter() - started:.1f} s")
+
+    started = time.perf_counter()
+    search_index.ensure_fresh(db)
+    print(f"base       índice construido desde SQLite en {time.perf_counter() - started:.1f} s")
+
+    latencies = []
+    for query in random_queries(rng, documents, queries):
+        started = time.perf_counter()
+        search_task_ids(db, rng.choice(user_ids), query, 20)
+        latencies.append(time.perf_counter() - started)
+    p50, p99 = percentiles(latencies)
+    print(f"base       {queries} consultas  p50 {p50:7.2f} ms  p99 {p99:7.2f} ms  (incluye leer la visibilidad)")
+    db.close()
+
+
+def main():
+    args = [int(arg) for arg in sys.argv[1:5]]
+    tasks, series_length, visible, queries = args + [1000000, 10, 5000, 500][len(args):]
+    bench_algorithm(tasks, series_length, visible, queries)
+    bench_database(min(tasks, 50000), series_length, visible, min(queries, 200))
+
+
+if __name__ == "__main__":
+    main()
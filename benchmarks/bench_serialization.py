@@ -0,0 +1,76 @@
+"""Vistas de tareas por segundo (un núcleo) al serializar una respuesta de list_user_tasks: validación
+con TaskSearchResponse y codificación con json (camino anterior) frente a dumps sobre los diccionarios ya
+armados, y el acierto de caché, que ahora devuelve los bytes guardados sin decodificarlos.
+
+Uso: python -m benchmarks.bench_serialization [tareas] [repeticiones]
+"""
+import json
+import os
+import sys
+import time
+from typing import List
+
+for key, value in {"DB_USER": "bench", "DB_PASSWORD": "bench", "DB_HOST": "localhost", "DB_PORT": "3306", "DB_NAME": "bench"}.items():
+    os.environ.setdefault(key, value)
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from app.schemas.task import TaskSearchResponse
+from app.services.serialization import dumps, json_response, orjson
+
+
+def sample_views(count):
+    return [
+        {
+            "TaskID": task_id,
+            "CreatorID": task_id % 50,
+            "Title": f"Tarea {task_id}",
+            "Description": "Revisión semanal del proyecto con el equipo",
+            "Priority": task_id % 3,
+            "StartTimestampID": 2 * task_id,
+            "EndTimeStampID": 2 * task_id + 1,
+            "RecurringStart": task_id % 4 == 0,
+            "Recurring": {
+                "RecurringID": task_id // 4, "Title": "Serie", "Description": None, "Priority": 1,
+                "CreatorID": task_id % 50, "Frequency": "semanal", "DayNameFrequency": None, "DayFrequency": None
+            } if task_id % 4 == 0 else None,
+            "attendees": [{"UserID": user_id, "Username": f"user{user_id}"} for user_id in range(task_id % 5)]
+        }
+        for task_id in range(count)
+    ]
+
+
+def legacy_encode(adapter, views):
+    """Lo que hacía FastAPI con el dict devuelto: validar contra response_model, volcar y codificar con json."""
+    validated = adapter.validate_python(views)
+    return json.dumps(jsonable_encoder(adapter.dump_python(validated)), ensure_ascii=False).encode()
+
+
+def legacy_cache_hit(adapter, body):
+    return legacy_encode(adapter, json.loads(body))
+
+
+def measure(label, fn, tasks, repeats):
+    started = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<22} {elapsed / repeats * 1000:9.2f} ms/respuesta  {tasks * repeats / elapsed:12.0f} vistas/s")
+
+
+def main():
+    args = [int(arg) for arg in sys.argv[1:3]]
+    tasks, repeats = args + [5000, 20][len(args):]
+    views = sample_views(tasks)
+    adapter = TypeAdapter(List[TaskSearchResponse])
+    body = dumps(views)
+
+    print(f"encoder: {'orjson' if orjson is not None else 'json'}")
+    measure("antes: armado", lambda: legacy_encode(adapter, views), tasks, repeats)
+    measure("después: armado", lambda: dumps(views), tasks, repeats)
+    measure("antes: acierto caché", lambda: legacy_cache_hit(adapter, body), tasks, repeats)
+    measure("después: acierto caché", lambda: json_response(body=body).body, tasks, repeats)
+
+
+if __name__ == "__main__":
+    main()
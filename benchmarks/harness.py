@@ -0,0 +1,166 @@
+"""Utilidades comunes de los benchmarks de endpoints: base de datos SQLite local en lugar de MySQL,
+datos sembrados, conteo de sentencias SQL y medición de latencias con un cliente ASGI en proceso.
+
+`use_sqlite` debe llamarse antes de importar `app.database`, que crea los engines al importarse.
+"""
+import json
+import os
+import random
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+def use_sqlite(path=None):
+    """Apunta los engines síncrono y asíncrono a la misma base SQLite: un fichero o, con path=":memory:",
+    una base en memoria compartida por todas las conexiones del proceso."""
+    if path == ":memory:":
+        name = f"file:bench{os.getpid()}?mode=memory&cache=shared&uri=true"
+        os.environ["DB_URL"] = f"sqlite:///{name}"
+        os.environ["DB_ASYNC_URL"] = f"sqlite+aiosqlite:///{name}"
+    else:
+        path = path or os.path.join(tempfile.mkdtemp(), "bench.db")
+        os.environ["DB_URL"] = f"sqlite:///{path}"
+        os.environ["DB_ASYNC_URL"] = f"sqlite+aiosqlite:///{path}"
+    os.environ.setdefault("CALENDAR_SWEEP_INTERVAL", "0")
+    return os.environ["DB_URL"]
+
+
+class StatementCounter:
+    """Cuenta las sentencias ejecutadas por los engines indicados."""
+
+    def __init__(self, engines):
+        from sqlalchemy import event
+        self.count = 0
+        for engine in engines:
+            event.listen(engine, "before_cursor_execute", self.on_execute)
+
+    def on_execute(self, *args):
+        self.count += 1
+
+
+def seed(db, users: int, guests_per_task: int, occurrences: int, rng: random.Random):
+    """Siembra usuarios, tareas únicas, series materializadas y expandidas en lectura, e invitaciones
+    con un reparto de estados parecido al real. Devuelve los ids útiles para los escenarios."""
+    from app.models.user import User
+    from app.models.invitation import Invitation
+    from app.schemas.task import TaskCreateRequest
+    from app.services.bulk_write_service import bulk_create_tasks
+    from app.services.visibility_service import rebuild_visibility
+
+    db.add_all([User(Email=f"user{i}@focusnet.test", Password="x", UserName=f"user{i}") for i in range(users)])
+    db.commit()
+    user_ids = [user_id for (user_id,) in db.query(User.UserID).order_by(User.UserID).all()]
+
+    def guests(creator_id):
+        return rng.sample([user_id for user_id in user_ids if user_id != creator_id], min(guests_per_task, len(user_ids) - 1))
+
+    def start(day):
+        return datetime(2025, 1, 1, rng.randrange(8, 19), 15 * rng.randrange(4)) + timedelta(days=day)
+
+    payloads = []
+    for user_id in user_ids:
+        for day in rng.sample(range(90), 10):
+            begin = start(day)
+            payloads.append(TaskCreateRequest(
+                Title=f"Tarea {user_id}-{day}", CreatorID=user_id, StartTimestamp=begin,
+                EndTimestamp=begin + timedelta(minutes=60), GuestIDs=guests(user_id)
+            ))
+        begin = start(0)
+        payloads.append(TaskCreateRequest(
+            Title=f"Serie {user_id}", CreatorID=user_id, StartTimestamp=begin, EndTimestamp=begin + timedelta(minutes=30),
+            RecurringStart=True, Frequency="semanal", Occurrences=occurrences, GuestIDs=guests(user_id)
+        ))
+        payloads.append(TaskCreateRequest(
+            Title=f"Serie en lectura {user_id}", CreatorID=user_id, StartTimestamp=begin, EndTimestamp=begin + timedelta(minutes=45),
+            RecurringStart=True, DayNameFrequency="Lu,Mi,Vi", Occurrences=None, ExpandOnRead=True, GuestIDs=guests(user_id)
+        ))
+    results = bulk_create_tasks(db, payloads)
+
+    invitation_ids = [invitation_id for (invitation_id,) in db.query(Invitation.InvitationID).all()]
+    accepted = set(rng.sample(invitation_ids, len(invitation_ids) // 2))
+    rejected = set(rng.sample(sorted(set(invitation_ids) - accepted), len(invitation_ids) // 6))
+    for status, ids in (("Aceptada", accepted), ("Rechazada", rejected)):
+        if ids:
+            db.query(Invitation).filter(Invitation.InvitationID.in_(ids)).update({Invitation.Status: status}, synchronize_session=False)
+    db.commit()
+    rebuild_visibility(db)
+
+    return {
+        "user_ids": user_ids,
+        "task_ids": [result["TaskID"] for result in results if "TaskID" in result],
+        "recurring_ids": [result["RecurringID"] for result in results if "RecurringID" in result and result["Tareas_creadas"]],
+        "expand_ids": [result["RecurringID"] for result in results if "RecurringID" in result and not result["Tareas_creadas"]]
+    }
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def run_scenario(client, counter, make_request, requests: int, concurrency: int):
+    """Lanza `requests` solicitudes generadas por make_request(n) -> (método, url, json) con la concurrencia dada."""
+    import asyncio
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, errors = [], 0
+
+    async def call(n):
+        nonlocal errors
+        method, url, body = make_request(n)
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.request(method, url, json=body)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    statements = counter.count
+    started = time.perf_counter()
+    await asyncio.gather(*(call(n) for n in range(requests)))
+    elapsed = time.perf_counter() - started
+    statements = counter.count - statements
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "throughput_rps": round(requests / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p90_ms": round(percentile(latencies, 0.90) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "statements_per_request": round(statements / requests, 2)
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_results(path: str, params: dict, results: dict):
+    with open(path, "w") as output:
+        json.dump({
+            "commit": git_commit(),
+            "date": datetime.utcnow().isoformat(),
+            "params": params,
+            "endpoints": results
+        }, output, indent=2, ensure_ascii=False)
+
+
+def compare_results(path: str, results: dict):
+    """Imprime la variación de p50, p99 y sentencias respecto a un fichero de resultados anterior."""
+    with open(path) as previous_file:
+        previous = json.load(previous_file)
+    print(f"\ncomparación con {previous.get('commit') or path}")
+    for name, current in results.items():
+        before = previous["endpoints"].get(name)
+        if not before:
+            continue
+        deltas = []
+        for metric in ("p50_ms", "p99_ms", "statements_per_request"):
+            if before[metric]:
+                deltas.append(f"{metric} {(current[metric] - before[metric]) / before[metric] * 100:+7.1f}%")
+        print(f"{name:<34} " + "  ".join(deltas))
@@ -0,0 +1,30 @@
+import os
+import tempfile
+
+# app.database crea los engines al importarse: la base de pruebas debe configurarse antes
+DB_FILE = os.path.join(tempfile.mkdtemp(), "test.db")
+os.environ["DB_URL"] = f"sqlite:///{DB_FILE}"
+os.environ["DB_ASYNC_URL"] = f"sqlite+aiosqlite:///{DB_FILE}"
+os.environ["CALENDAR_SWEEP_INTERVAL"] = "0"
+os.environ["CHANGE_LOG_PRUNE_INTERVAL"] = "0"
+os.environ["JOB_WORKERS"] = "0"
+
+import pytest
+from fastapi.testclient import TestClient
+from app.database import Base, engine, SessionLocal
+from app.main import app
+
+
+@pytest.fixture(scope="session")
+def client():
+    Base.metadata.create_all(engine)
+    return TestClient(app)
+
+
+@pytest.fixture
+def db(client):
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
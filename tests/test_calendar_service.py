@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.migrations.calendar_unique_date import has_unique_date, merge_duplicate_calendars
+from app.models.calendar import Calendar
+from app.models.task import Task
+from app.models.user import User
+from app.services.calendar_service import calendar_key, calendar_row, get_or_create_calendar_ids
+from tests.test_list_user_tasks import create_user
+
+
+def test_calendar_key_converts_offsets_to_utc():
+    madrid = timezone(timedelta(hours=2))
+    assert calendar_key(datetime(2025, 6, 1, 11, 30, 45, tzinfo=madrid)) == datetime(2025, 6, 1, 9, 30)
+    assert calendar_key(datetime(2025, 6, 1, 9, 30, 45)) == datetime(2025, 6, 1, 9, 30)
+
+
+def test_same_instant_with_and_without_offset_shares_calendar_row(db):
+    aware = datetime(2031, 3, 4, 12, 15, tzinfo=timezone(timedelta(hours=-5)))
+    naive = datetime(2031, 3, 4, 17, 15)
+    calendar_ids = get_or_create_calendar_ids(db, [aware, naive])
+    db.commit()
+
+    assert calendar_ids[aware] == calendar_ids[naive]
+    assert db.query(Calendar.Date).filter(Calendar.CalendarID == calendar_ids[aware]).scalar() == naive
+
+
+def test_update_task_marks_the_replaced_calendar_rows(client, db):
+    user_id = create_user(db, "calendario_huerfano")
+    task = client.post("/task/task/create_task", json={
+        "Title": "Mover", "CreatorID": user_id, "StartTimestamp": "2032-05-01T08:00:00", "EndTimestamp": "2032-05-01T08:45:00"
+    }).json()
+    old_ids = db.query(Task.StartTimestampID, Task.EndTimeStampID).filter(Task.TaskID == task["TaskID"]).one()
+
+    response = client.put("/task/update", json={
+        "TaskID": task["TaskID"], "Title": "Mover", "RecurringStart": False, "StartTimestamp": "2032-05-02T08:00:00", "EndTimestamp": "2032-05-02T08:45:00"
+    })
+
+    assert response.status_code == 200
+    db.expire_all()
+    assert db.query(Calendar).filter(Calendar.CalendarID.in_(old_ids), Calendar.OrphanedAt.is_(None)).count() == 0
+
+
+def test_merge_duplicate_calendars_repoints_tasks_to_the_kept_row():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        # Tabla como las creadas antes de que Date fuera única
+        connection.exec_driver_sql('ALTER TABLE "Calendar" RENAME TO "Calendar_unique"')
+        connection.exec_driver_sql('CREATE TABLE "Calendar" AS SELECT * FROM "Calendar_unique"')
+    db = sessionmaker(bind=engine)()
+    date = datetime(2025, 1, 1, 9)
+    db.add_all([Calendar(CalendarID=calendar_id, **calendar_row(date)) for calendar_id in (1, 2, 3)])
+    db.add(Calendar(CalendarID=4, **calendar_row(date + timedelta(minutes=30))))
+    db.add(User(UserID=1, Email="dup@focusnet.test", Password="x", UserName="dup"))
+    db.add_all([
+        Task(TaskID=task_id, CreatorID=1, Title="Duplicada", StartTimestampID=start_id, EndTimeStampID=4,
+             RecurringStart=False, CreationDate=date)
+        for task_id, start_id in ((1, 2), (2, 3), (3, 1))
+    ])
+    db.commit()
+    assert not has_unique_date(engine)
+
+    assert merge_duplicate_calendars(db) == {"duplicados": 2}
+    db.commit()
+
+    assert db.query(Calendar.CalendarID).order_by(Calendar.CalendarID).all() == [(1,), (4,)]
+    assert {start_id for (start_id,) in db.query(Task.StartTimestampID)} == {1}
+    assert merge_duplicate_calendars(db) == {"duplicados": 0}
+    db.close()
@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta
+from app.database import SessionLocal
+from app.models.change_log import ChangeLog
+from app.models.change_sequence import ChangeSequence
+from app.models.task import Task
+from app.services.change_feed import PRUNED_SEQUENCE, UPDATE, prune_change_log, record_changes
+from tests.test_list_user_tasks import create_user
+
+
+def test_deleting_a_series_records_one_change_per_user(client, db):
+    creator_id = create_user(db, "feed_serie")
+    guest_id = create_user(db, "feed_serie_invitado")
+    created = client.post("/task/task/create_task", json={
+        "Title": "Serie", "CreatorID": creator_id, "StartTimestamp": "2025-02-01T09:00:00",
+        "EndTimestamp": "2025-02-01T09:30:00", "RecurringStart": True, "Frequency": "diaria",
+        "Occurrences": 40, "GuestIDs": [guest_id]
+    }).json()
+    recurring_id = created["RecurringID"]
+    task_ids = [task_id for (task_id,) in db.query(Task.TaskID).filter(Task.RecurringID == recurring_id)]
+    assert len(task_ids) == 40
+
+    assert client.delete(f"/recurring/recurring/delete/{recurring_id}").status_code == 200
+
+    deletes = db.query(ChangeLog.UserID, ChangeLog.Entity, ChangeLog.EntityID).filter(ChangeLog.Operation == "delete")
+    assert deletes.filter(ChangeLog.Entity == "Task", ChangeLog.EntityID.in_(task_ids)).count() == 0
+    assert sorted(deletes.filter(ChangeLog.Entity == "Recurring", ChangeLog.EntityID == recurring_id).all()) == [
+        (creator_id, "Recurring", recurring_id), (guest_id, "Recurring", recurring_id)
+    ]
+
+
+def read_changes(client, user_id, since, limit=500):
+    response = client.get(f"/changes/{user_id}", params={"since": since, "limit": limit})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_cursor_pages_follow_commit_order(client, db):
+    user_id = create_user(db, "feed_cursor")
+    cursor = client.get(f"/changes/{user_id}").json()["next_cursor"]
+
+    # La secuencia se asigna al confirmar: una transacción que anotó antes pero confirma después queda detrás
+    late = SessionLocal()
+    record_changes(late, [(user_id, "Task", 1, UPDATE)])
+    record_changes(db, [(user_id, "Task", entity_id, UPDATE) for entity_id in (2, 3, 4)])
+    db.commit()
+    first = read_changes(client, user_id, cursor)
+    assert [change["EntityID"] for change in first["changes"]] == [2, 3, 4]
+    late.commit()
+    late.close()
+    record_changes(db, [(user_id, "Task", 5, UPDATE)])
+    db.commit()
+
+    entity_ids, page_cursor, pages = [], first["next_cursor"], 0
+    while True:
+        page = read_changes(client, user_id, page_cursor, limit=1)
+        entity_ids += [change["EntityID"] for change in page["changes"]]
+        page_cursor, pages = page["next_cursor"], pages + 1
+        if not page["has_more"]:
+            break
+
+    assert entity_ids == [1, 5]
+    assert pages == 2
+    assert read_changes(client, user_id, page_cursor)["changes"] == []
+
+    rows = db.query(ChangeLog.Sequence, ChangeLog.EntityID).filter(ChangeLog.UserID == user_id).order_by(
+        ChangeLog.Sequence, ChangeLog.ChangeID
+    ).all()
+    assert [entity_id for _, entity_id in rows] == [2, 3, 4, 1, 5]
+    assert len({sequence for sequence, entity_id in rows if entity_id in (2, 3, 4)}) == 1
+
+
+def test_pruned_history_asks_old_cursors_to_resync(client, db):
+    user_id = create_user(db, "feed_retencion")
+    record_changes(db, [(user_id, "Task", 1, UPDATE)])
+    db.commit()
+    old_cursor = client.get(f"/changes/{user_id}").json()["next_cursor"]
+    record_changes(db, [(user_id, "Task", 2, UPDATE)])
+    db.commit()
+    db.query(ChangeLog).filter(ChangeLog.UserID == user_id).update({ChangeLog.Date: datetime.utcnow() - timedelta(days=40)})
+    db.commit()
+
+    try:
+        result = prune_change_log(db, timedelta(days=30))
+        assert result["deleted"] >= 2
+        assert db.query(ChangeLog).filter(ChangeLog.UserID == user_id).count() == 0
+
+        assert client.get(f"/changes/{user_id}", params={"since": old_cursor}).status_code == 410
+        new_cursor = client.get(f"/changes/{user_id}").json()["next_cursor"]
+        record_changes(db, [(user_id, "Task", 3, UPDATE)])
+        db.commit()
+        assert [change["EntityID"] for change in read_changes(client, user_id, new_cursor)["changes"]] == [3]
+    finally:
+        db.query(ChangeSequence).filter(ChangeSequence.SequenceID == PRUNED_SEQUENCE).delete()
+        db.commit()
@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta
+import pytest
+from app.models.job import Job
+from app.models.task import Task
+from app.models.user import User
+from app.services import job_queue as job_queue_module
+from app.services.job_queue import DONE, FAILED, PENDING, RUNNING, DatabaseJobBackend, JobQueue
+from tests.test_list_user_tasks import create_user
+
+
+@pytest.fixture
+def queue(db, monkeypatch):
+    """Cola sin workers sobre la tabla Job vacía; los trabajos se reclaman y ejecutan a mano."""
+    db.query(Job).delete()
+    db.commit()
+    monkeypatch.setitem(job_queue_module.handlers, "create_user", create_user_handler)
+    monkeypatch.setitem(job_queue_module.handlers, "broken", broken_handler)
+    return JobQueue(DatabaseJobBackend(), workers=0, max_size=100)
+
+
+def create_user_handler(db, payload):
+    db.add(User(Email=f"{payload['name']}@focusnet.test", Password="x", UserName=payload["name"]))
+    db.flush()
+    return {"name": payload["name"]}
+
+
+def broken_handler(db, payload):
+    raise RuntimeError("fallo")
+
+
+def submit(queue, db, kind, payload, **options):
+    job_id = queue.submit(db, kind, payload, **options)
+    db.commit()
+    return job_id
+
+
+def expire(db, job_id, **values):
+    db.query(Job).filter(Job.JobID == job_id).update(values or {Job.LeaseUntil: datetime.utcnow() - timedelta(seconds=1)})
+    db.commit()
+
+
+def test_expired_lease_is_claimed_again_and_the_stale_worker_cannot_complete(queue, db):
+    job_id = submit(queue, db, "create_user", {"name": "trabajo_cola"})
+    stale = queue.backend.claim()
+    expire(db, job_id)
+
+    current = queue.backend.claim()
+    assert (current["JobID"], current["Attempts"]) == (job_id, stale["Attempts"] + 1)
+    assert not queue.backend.renew(stale)
+
+    queue.run(stale)
+    db.expire_all()
+    assert db.query(User).filter(User.UserName == "trabajo_cola").count() == 0
+    assert db.get(Job, job_id).Status == RUNNING
+
+    queue.run(current)
+    db.expire_all()
+    assert db.query(User).filter(User.UserName == "trabajo_cola").count() == 1
+    assert queue.get(db, job_id)["Status"] == DONE
+    assert queue.get(db, job_id)["Result"] == {"name": "trabajo_cola"}
+
+
+def test_job_fails_after_max_attempts(queue, db):
+    job_id = submit(queue, db, "broken", {}, max_attempts=2)
+
+    queue.run(queue.backend.claim())
+    db.expire_all()
+    assert db.get(Job, job_id).Status == PENDING
+    assert db.get(Job, job_id).RunAfter > datetime.utcnow()
+
+    expire(db, job_id, RunAfter=datetime.utcnow() - timedelta(seconds=1))
+    queue.run(queue.backend.claim())
+    job = queue.get(db, job_id)
+    assert (job["Status"], job["Attempts"]) == (FAILED, 2)
+    assert "fallo" in job["Error"]
+    assert queue.backend.claim() is None
+
+
+def test_large_bulk_create_is_queued_and_run_by_a_worker(queue, client, db):
+    creator_id = create_user(db, "bulk_en_cola")
+    payloads = [
+        {
+            "Title": f"Serie {n}", "CreatorID": creator_id, "StartTimestamp": f"2027-0{n + 1}-01T09:00:00",
+            "EndTimestamp": f"2027-0{n + 1}-01T09:30:00", "RecurringStart": True, "Frequency": "diaria", "Occurrences": 100
+        }
+        for n in range(3)
+    ]
+
+    response = client.post("/task/bulk_create", json=payloads)
+    assert response.status_code == 202
+    assert db.query(Task).filter(Task.CreatorID == creator_id).count() == 0
+
+    job_queue_module.job_queue.run(queue.backend.claim())
+    assert queue.get(db, response.json()["JobID"])["Status"] == DONE
+    assert db.query(Task).filter(Task.CreatorID == creator_id).count() == 300
+
+
+def test_bulk_create_rejects_unbounded_occurrences(client, db):
+    creator_id = create_user(db, "bulk_sin_limite")
+    response = client.post("/task/bulk_create", json=[{
+        "Title": "Demasiadas", "CreatorID": creator_id, "StartTimestamp": "2027-01-01T09:00:00",
+        "EndTimestamp": "2027-01-01T09:30:00", "RecurringStart": True, "Frequency": "diaria", "Occurrences": 10 ** 7
+    }])
+    assert response.status_code == 422
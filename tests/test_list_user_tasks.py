@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.models.invitation import Invitation
+from app.models.user import User
+from app.schemas.task import TaskCreateRequest
+from app.services.bulk_write_service import bulk_create_tasks
+
+
+def create_user(db, name):
+    user = User(Email=f"{name}@focusnet.test", Password="x", UserName=name)
+    db.add(user)
+    db.commit()
+    return user.UserID
+
+
+def seed_tasks(db, creator_id, guest_ids, count):
+    """Tareas del usuario con invitados que las aceptan, para que las vistas incluyan asistentes."""
+    start = datetime(2025, 1, 1, 9, 0)
+    bulk_create_tasks(db, [
+        TaskCreateRequest(
+            Title=f"Tarea {n}", CreatorID=creator_id, StartTimestamp=start + timedelta(hours=n),
+            EndTimestamp=start + timedelta(hours=n, minutes=30), GuestIDs=guest_ids
+        )
+        for n in range(count)
+    ])
+    db.query(Invitation).filter(Invitation.CreatorID == creator_id).update({Invitation.Status: "Aceptada"})
+    db.commit()
+
+
+def count_statements(client, url):
+    statements = []
+
+    def on_execute(*args):
+        statements.append(args[2])
+
+    event.listen(Engine, "before_cursor_execute", on_execute)
+    try:
+        response = client.get(url)
+    finally:
+        event.remove(Engine, "before_cursor_execute", on_execute)
+    assert response.status_code == 200
+    return len(statements), response.json()
+
+
+def test_list_user_tasks_query_count_is_constant(client, db):
+    guest_ids = [create_user(db, f"invitado{n}") for n in range(3)]
+    small_user = create_user(db, "pocas")
+    large_user = create_user(db, "muchas")
+    seed_tasks(db, small_user, guest_ids, 5)
+    seed_tasks(db, large_user, guest_ids, 50)
+
+    small_count, small_tasks = count_statements(client, f"/task/list_user_tasks/{small_user}")
+    large_count, large_tasks = count_statements(client, f"/task/list_user_tasks/{large_user}")
+
+    assert len(small_tasks) == 5
+    assert len(large_tasks) == 50
+    assert all(len(task["attendees"]) == 4 for task in large_tasks)
+    assert small_count == large_count
+
+
+def test_list_user_tasks_page_converts_window_offsets_to_utc(client, db):
+    user_id = create_user(db, "ventana_zona")
+    seed_tasks(db, user_id, [], 6)
+
+    response = client.get(f"/task/list_user_tasks_page/{user_id}", params={
+        "from": "2025-01-01T12:00:00+02:00", "to": "2025-01-01T14:00:00+02:00"
+    })
+
+    assert response.status_code == 200
+    assert [task["Title"] for task in response.json()["items"]] == ["Tarea 1", "Tarea 2"]
@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import pytest
+from pydantic import ValidationError
+from app.schemas.task import TaskCreateRequest
+from app.services.recurrence_service import expand_occurrences, iter_series_dates, parse_month_days, parse_weekdays
+
+
+@pytest.mark.parametrize("day_frequency", ["0", "32", "40", "", " , "])
+def test_month_days_without_possible_dates_are_rejected(day_frequency):
+    with pytest.raises(ValueError):
+        parse_month_days(day_frequency)
+
+
+@pytest.mark.parametrize("day_name_frequency", ["", "Xx", "Lu,Zz"])
+def test_invalid_weekdays_are_rejected(day_name_frequency):
+    with pytest.raises(ValueError):
+        parse_weekdays(day_name_frequency)
+
+
+@pytest.mark.parametrize("rule", [{"DayFrequency": "40"}, {"DayNameFrequency": "Xx"}, {"Frequency": "anual"},
+                                  {"Frequency": "diaria", "DayFrequency": "1"}])
+def test_create_task_rejects_invalid_rules(rule):
+    with pytest.raises(ValidationError):
+        TaskCreateRequest(
+            Title="Regla", CreatorID=1, StartTimestamp=datetime(2025, 1, 1, 9), EndTimestamp=datetime(2025, 1, 1, 10),
+            RecurringStart=True, **rule
+        )
+
+
+def test_stored_invalid_rule_yields_no_dates():
+    recurring = SimpleNamespace(StartTimestamp=datetime(2025, 1, 1, 9), Frequency=None, DayNameFrequency=None,
+                                DayFrequency="40", Occurrences=None)
+    assert list(iter_series_dates(recurring)) == []
+
+
+@pytest.mark.parametrize("frequency", ["diaria", "semanal", "mensual"])
+def test_expanding_a_late_window_matches_iterating_from_the_anchor(frequency):
+    recurring = SimpleNamespace(StartTimestamp=datetime(2020, 1, 31, 9, 15, 20), Frequency=frequency, DayNameFrequency=None,
+                                DayFrequency=None, Occurrences=1500, MinutesDuration=30)
+    window_start, window_end = datetime(2023, 2, 10, 12), datetime(2023, 5, 1)
+
+    expected = [date for date in iter_series_dates(recurring) if window_start <= date < window_end]
+    occurrences = expand_occurrences(recurring, [], window_start, window_end)
+
+    assert expected
+    assert [occurrence["StartTimestamp"] for occurrence in occurrences] == expected
+    assert all(occurrence["EndTimestamp"] - occurrence["StartTimestamp"] == timedelta(minutes=30) for occurrence in occurrences)
@@ -0,0 +1,41 @@
+from app.models.recurring_exception import RecurringException
+from tests.test_list_user_tasks import create_user
+
+
+def create_expanded_series(client, creator_id):
+    response = client.post("/task/task/create_task", json={
+        "Title": "Diaria", "CreatorID": creator_id, "StartTimestamp": "2025-01-01T09:00:00",
+        "EndTimestamp": "2025-01-01T09:30:00", "RecurringStart": True, "Frequency": "diaria",
+        "Occurrences": None, "ExpandOnRead": True
+    })
+    assert response.status_code == 200
+    return response.json()["RecurringID"]
+
+
+def test_exception_with_offset_is_stored_in_utc(client, db):
+    recurring_id = create_expanded_series(client, create_user(db, "excepcion_zona"))
+
+    response = client.put(f"/recurring/recurring/exception/{recurring_id}", json={
+        "OccurrenceDate": "2025-03-10T11:00:00+02:00",
+        "NewStartTimestamp": "2025-03-10T12:00:00+02:00",
+        "NewEndTimestamp": "2025-03-10T12:30:00+02:00"
+    })
+
+    assert response.status_code == 200
+    exception = db.query(RecurringException).filter(RecurringException.RecurringID == recurring_id).one()
+    assert (exception.OccurrenceDate.hour, exception.NewStartTimestamp.hour, exception.NewEndTimestamp.minute) == (9, 10, 30)
+
+    occurrences = client.get(
+        f"/recurring/recurring/occurrences/{recurring_id}", params={"from": "2025-03-10T00:00:00Z", "to": "2025-03-11T00:00:00Z"}
+    ).json()
+    assert [(occurrence["StartTimestamp"], occurrence["Modified"]) for occurrence in occurrences] == [("2025-03-10T10:00:00", True)]
+
+
+def test_exception_outside_the_series_is_rejected(client, db):
+    recurring_id = create_expanded_series(client, create_user(db, "excepcion_invalida"))
+
+    for occurrence_date in ("2025-03-10T09:05:00Z", "2024-12-31T09:00:00"):
+        response = client.put(f"/recurring/recurring/exception/{recurring_id}", json={
+            "OccurrenceDate": occurrence_date, "Cancelled": True
+        })
+        assert response.status_code == 400
@@ -0,0 +1,73 @@
+from app.services import view_cache as view_cache_module
+from app.services.view_cache import InMemoryBackend, TaskViewCache, view_cache
+from tests.test_list_user_tasks import create_user, seed_tasks
+
+
+def test_get_or_build_builds_once_per_version():
+    cache = TaskViewCache(InMemoryBackend(10), ttl=60)
+    builds = []
+
+    def build():
+        builds.append(1)
+        return [{"TaskID": len(builds)}]
+
+    assert cache.get_or_build(1, 3, "tasks", build) == b'[{"TaskID":1}]'
+    assert cache.get_or_build(1, 3, "tasks", build) == b'[{"TaskID":1}]'
+    assert cache.get_or_build(1, 4, "tasks", build) == b'[{"TaskID":2}]'
+    assert cache.stats() == {"hits": 1, "misses": 2, "hit_ratio": 1 / 3}
+
+
+def test_in_memory_backend_expires_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(view_cache_module.time, "monotonic", lambda: now[0])
+    backend = InMemoryBackend(10)
+    backend.set("corta", "a", ex=5)
+    backend.set("sin_ttl", "b")
+
+    now[0] += 6
+
+    assert backend.get("corta") is None
+    assert backend.get("sin_ttl") == b"b"
+
+
+def test_in_memory_backend_evicts_least_recently_used():
+    backend = InMemoryBackend(2)
+    backend.set("a", "1")
+    backend.set("b", "2")
+    backend.get("a")
+    backend.set("c", "3")
+
+    assert backend.get("b") is None
+    assert backend.get("a") == b"1"
+    assert backend.get("c") == b"3"
+    assert backend.delete("a", "b") == 1
+
+
+def cached_read(client, user_id):
+    before = view_cache.stats()
+    response = client.get(f"/task/list_user_tasks/{user_id}")
+    after = view_cache.stats()
+    assert response.status_code == 200
+    return after["hits"] - before["hits"], response.json()
+
+
+def test_writes_invalidate_the_views_of_creator_and_guests(client, db):
+    guest_id = create_user(db, "cache_invitado")
+    creator_id = create_user(db, "cache_creador")
+    seed_tasks(db, creator_id, [guest_id], 1)
+
+    for user_id in (creator_id, guest_id):
+        assert cached_read(client, user_id)[0] == 0
+        assert cached_read(client, user_id)[0] == 1
+
+    task_id = cached_read(client, creator_id)[1][0]["TaskID"]
+    response = client.put("/task/update", json={
+        "TaskID": task_id, "Title": "Renombrada", "RecurringStart": False,
+        "StartTimestamp": "2025-01-01T09:00:00", "EndTimestamp": "2025-01-01T09:30:00"
+    })
+    assert response.status_code == 200
+
+    for user_id in (creator_id, guest_id):
+        hits, tasks = cached_read(client, user_id)
+        assert hits == 0
+        assert [task["Title"] for task in tasks] == ["Renombrada"]
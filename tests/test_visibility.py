@@ -0,0 +1,85 @@
+from sqlalchemy import or_, select
+from app.models.invitation import Invitation
+from app.models.task import Task
+from app.services.task_view_service import visible_tasks_filter
+from tests.test_list_user_tasks import create_user
+
+
+def visible(db, user_id):
+    db.expire_all()
+    return {task_id for (task_id,) in db.query(Task.TaskID).filter(visible_tasks_filter(user_id))}
+
+
+def expected(db, user_id):
+    """Lo que debe contener TaskVisibility, calculado directamente desde Task e Invitation."""
+    accepted = select(Invitation.TaskID, Invitation.RecurringID).where(
+        Invitation.GuestID == user_id, Invitation.Status == "Aceptada"
+    ).subquery()
+    return {task_id for (task_id,) in db.query(Task.TaskID).filter(or_(
+        Task.CreatorID == user_id,
+        Task.TaskID.in_(select(accepted.c.TaskID)),
+        Task.RecurringID.in_(select(accepted.c.RecurringID))
+    ))}
+
+
+def assert_consistent(db, *user_ids):
+    for user_id in user_ids:
+        assert visible(db, user_id) == expected(db, user_id)
+
+
+def invitation_id(db, guest_id, **target):
+    return db.query(Invitation.InvitationID).filter(Invitation.GuestID == guest_id).filter_by(**target).scalar()
+
+
+def respond(client, invitation_id, status):
+    assert client.put(f"/invitations/invitation/respond/{invitation_id}", json={"Status": status}).status_code == 200
+
+
+def test_visibility_follows_invitations_guest_sync_series_edits_and_deletes(client, db):
+    creator_id, first_guest, second_guest = (create_user(db, f"visibilidad_{name}") for name in ("creador", "uno", "dos"))
+    users = (creator_id, first_guest, second_guest)
+    task = client.post("/task/task/create_task", json={
+        "Title": "Única", "CreatorID": creator_id, "StartTimestamp": "2026-03-02T10:00:00",
+        "EndTimestamp": "2026-03-02T11:00:00", "GuestIDs": [first_guest, second_guest]
+    }).json()
+    series = client.post("/task/task/create_task", json={
+        "Title": "Semanal", "CreatorID": creator_id, "StartTimestamp": "2026-03-03T10:00:00",
+        "EndTimestamp": "2026-03-03T11:00:00", "RecurringStart": True, "Frequency": "semanal",
+        "Occurrences": 5, "GuestIDs": [first_guest, second_guest]
+    }).json()
+    task_id, recurring_id = task["TaskID"], series["RecurringID"]
+    series_task_ids = {task_id for (task_id,) in db.query(Task.TaskID).filter(Task.RecurringID == recurring_id)}
+    assert_consistent(db, *users)
+    assert visible(db, first_guest) == set()
+
+    respond(client, invitation_id(db, first_guest, TaskID=task_id), "Aceptada")
+    respond(client, invitation_id(db, first_guest, RecurringID=recurring_id), "Aceptada")
+    respond(client, invitation_id(db, second_guest, TaskID=task_id), "Rechazada")
+    assert_consistent(db, *users)
+    assert visible(db, first_guest) == {task_id} | series_task_ids
+    assert visible(db, second_guest) == set()
+
+    response = client.put("/task/update", json={
+        "TaskID": task_id, "Title": "Única", "RecurringStart": False, "StartTimestamp": "2026-03-02T10:00:00",
+        "EndTimestamp": "2026-03-02T11:00:00", "GuestIDs": [second_guest]
+    })
+    assert response.status_code == 200
+    assert_consistent(db, *users)
+    assert visible(db, first_guest) == series_task_ids
+
+    response = client.put(f"/recurring/recurring/update/{recurring_id}", json={
+        "Scope": "siguientes", "OccurrenceDate": "2026-03-17T10:00:00", "ShiftMinutes": 30, "Title": "Movida"
+    })
+    assert response.status_code == 200
+    assert_consistent(db, *users)
+    assert visible(db, first_guest) == series_task_ids
+
+    deleted_task_id = min(series_task_ids)
+    assert client.delete(f"/task/delete/{deleted_task_id}").status_code == 200
+    assert_consistent(db, *users)
+    assert deleted_task_id not in visible(db, creator_id) | visible(db, first_guest)
+
+    assert client.delete(f"/recurring/recurring/delete/{recurring_id}").status_code == 200
+    assert_consistent(db, *users)
+    assert visible(db, first_guest) == set()
+    assert visible(db, creator_id) == {task_id}